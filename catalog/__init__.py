@@ -0,0 +1,24 @@
+import json
+import os
+
+# Offline tooling for the tool catalog (data/tools.json): search index,
+# lookups and the build steps shared by the generator scripts.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS_PATH = os.environ.get("TOOLS_PATH", os.path.join(ROOT, "data", "tools.json"))
+
+
+def load_tools(path=None):
+    with open(path or TOOLS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def next_id_number(ids):
+    """
+    First free N for a new "tool-N" id (ids may have gaps once duplicates are merged).
+    """
+    highest = 0
+    for tool_id in ids:
+        suffix = str(tool_id).rsplit("-", 1)[-1]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest + 1
@@ -0,0 +1,34 @@
+import sys
+
+from catalog import TOOLS_PATH
+from catalog.columnar import to_columnar
+from catalog.export import export_catalog
+from catalog.index import build_sidecar
+from catalog.related import build_related_sidecar
+
+# Rebuilds everything derived from the catalog file. This is an explicit
+# step (python -m catalog.build) rather than part of every generator run:
+# it reads the whole catalog, so running it after each append would make
+# generation O(catalog) again. Until it runs, load_index rebuilds a stale
+# search index on first use; the export, columnar file and related graph
+# keep serving the previous catalog.
+
+
+def build_all(tools_path=None):
+    tools_path = tools_path or TOOLS_PATH
+    index = build_sidecar(tools_path)
+    manifest = export_catalog(tools_path)
+    rows = to_columnar(tools_path)
+    _, related = build_related_sidecar(tools_path)
+    return {
+        "indexed": len(index),
+        "pages": len(manifest["pages"]),
+        "categories": len(manifest["categories"]),
+        "columnar_rows": rows,
+        "related_embedded": related["embedded"],
+    }
+
+
+# Usage: python -m catalog.build [tools_path]
+if __name__ == "__main__":
+    print(build_all(sys.argv[1] if len(sys.argv) > 1 else None))
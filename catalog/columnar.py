@@ -0,0 +1,285 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from catalog import TOOLS_PATH
+from catalog.store import CatalogStore
+
+# Columnar on-disk catalog (data/tools.columns), opened with mmap so loading
+# parses only a small JSON header; column arrays are zero-copy NumPy views
+# over the mapping and a row is decoded only when it is accessed.
+#
+#   "text"   UTF-8 blob + uint64 offsets          (descriptions, urls, dates)
+#   "dict"   interned dictionary + uint32 codes   (company, pricing, badge)
+#   "list"   interned dictionary + uint32 codes + uint64 row offsets
+#   "int"    int64 values                         (launch_year)
+#
+# Every column has a presence bitmap. Fields outside the schema, or values
+# of an unexpected type, go to a per-row JSON "_extras" text column, so the
+# conversion from and back to JSON is lossless.
+MAGIC = b"TOOLCOL1"
+FORMAT_VERSION = 1
+
+SCHEMA = (
+    ("id", "text"),
+    ("name", "text"),
+    ("slug", "text"),
+    ("company", "dict"),
+    ("launch_year", "int"),
+    ("short_description", "text"),
+    ("full_description", "text"),
+    ("categories", "list"),
+    ("use_cases", "list"),
+    ("pricing_model", "dict"),
+    ("badge_color", "dict"),
+    ("website_url", "text"),
+    ("platforms_supported", "list"),
+    ("tags", "list"),
+    ("created_at", "text"),
+    ("updated_at", "text"),
+)
+FIELDS = tuple(name for name, _ in SCHEMA)
+_FIELD_SET = frozenset(FIELDS)
+EXTRAS = "_extras"
+
+
+def columnar_path_for(tools_path):
+    return os.path.splitext(tools_path)[0] + ".columns"
+
+
+def _fits(kind, value):
+    if kind == "text":
+        return isinstance(value, str)
+    if kind == "dict":
+        return isinstance(value, str) or value is None
+    if kind == "int":
+        return isinstance(value, int) and not isinstance(value, bool) and -(1 << 63) <= value < (1 << 63)
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+class _ColumnBuilder:
+    def __init__(self, kind):
+        self.kind = kind
+        self.present = []
+        self.values = []
+        self.dictionary = {}
+
+    def add(self, value, present):
+        self.present.append(present)
+        if self.kind == "text":
+            self.values.append((value if present else "").encode("utf-8"))
+        elif self.kind == "int":
+            self.values.append(value if present else 0)
+        elif self.kind == "dict":
+            self.values.append(self.dictionary.setdefault(value, len(self.dictionary)) if present else 0)
+        else:
+            self.values.append([self.dictionary.setdefault(v, len(self.dictionary)) for v in value] if present else [])
+
+    def sections(self):
+        """
+        Returns (header entries, {section: bytes}).
+        """
+        sections = {"present": np.packbits(np.array(self.present, dtype=bool)).tobytes()}
+        meta = {}
+        if self.kind == "text":
+            lengths = np.fromiter((len(v) for v in self.values), dtype=np.uint64, count=len(self.values))
+            sections["offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.uint64).tobytes()
+            sections["blob"] = b"".join(self.values)
+        elif self.kind == "int":
+            sections["values"] = np.array(self.values, dtype=np.int64).tobytes()
+        elif self.kind == "dict":
+            sections["codes"] = np.array(self.values, dtype=np.uint32).tobytes()
+            meta["dictionary"] = list(self.dictionary)
+        else:
+            lengths = np.fromiter((len(v) for v in self.values), dtype=np.uint64, count=len(self.values))
+            sections["offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.uint64).tobytes()
+            sections["codes"] = np.fromiter((c for v in self.values for c in v), dtype=np.uint32).tobytes()
+            meta["dictionary"] = list(self.dictionary)
+        return meta, sections
+
+
+def write_columnar(records, path):
+    """
+    Converts records (any iterable of tool dicts) to the columnar format.
+    Returns the number of rows written.
+    """
+    builders = {name: _ColumnBuilder(kind) for name, kind in SCHEMA}
+    builders[EXTRAS] = _ColumnBuilder("text")
+    count = 0
+    for record in records:
+        extras = {}
+        for name, kind in SCHEMA:
+            present = name in record and _fits(kind, record[name])
+            builders[name].add(record.get(name), present)
+        for key, value in record.items():
+            if key not in _FIELD_SET or not builders[key].present[-1]:
+                extras[key] = value
+        builders[EXTRAS].add(json.dumps(extras, ensure_ascii=False) if extras else "", bool(extras))
+        count += 1
+
+    columns = []
+    blobs = []
+    position = 0
+    for name, builder in builders.items():
+        meta, sections = builder.sections()
+        entry = {"name": name, "kind": builder.kind, "sections": {}, **meta}
+        for section, data in sections.items():
+            # 8-byte alignment keeps every NumPy view aligned
+            padding = -position % 8
+            blobs.append(b"\0" * padding)
+            position += padding
+            entry["sections"][section] = [position, len(data)]
+            blobs.append(data)
+            position += len(data)
+        columns.append(entry)
+
+    header = json.dumps({"version": FORMAT_VERSION, "count": count, "columns": columns}, ensure_ascii=False).encode("utf-8")
+    # Data offsets are relative to the end of the (padded) header
+    prefix = MAGIC + struct.pack("<Q", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(prefix)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    return count
+
+
+class ToolRecord:
+    """
+    One materialized row. Fields missing from the source record are None.
+    """
+
+    __slots__ = FIELDS + ("extras", "_present")
+
+    def to_dict(self):
+        record = {name: getattr(self, name) for name in FIELDS if name in self._present}
+        record.update(self.extras)
+        return record
+
+    def __repr__(self):
+        return f"ToolRecord(id={self.id!r}, name={self.name!r})"
+
+
+class _Column:
+    def __init__(self, buffer, base, entry):
+        self.kind = entry["kind"]
+        self.dictionary = entry.get("dictionary")
+        self.views = {}
+        for section, (offset, length) in entry["sections"].items():
+            dtype = {"present": np.uint8, "blob": np.uint8, "offsets": np.uint64, "codes": np.uint32, "values": np.int64}[section]
+            self.views[section] = np.frombuffer(buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=base + offset)
+        self.blob = memoryview(buffer)[base + entry["sections"]["blob"][0]:] if "blob" in entry["sections"] else None
+        self.present = self.views["present"]
+
+    def is_present(self, row):
+        return bool(self.present[row >> 3] & (0x80 >> (row & 7)))
+
+    def value(self, row):
+        if self.kind == "text":
+            offsets = self.views["offsets"]
+            return bytes(self.blob[int(offsets[row]):int(offsets[row + 1])]).decode("utf-8")
+        if self.kind == "int":
+            return int(self.views["values"][row])
+        if self.kind == "dict":
+            return self.dictionary[self.views["codes"][row]]
+        offsets = self.views["offsets"]
+        return [self.dictionary[code] for code in self.views["codes"][int(offsets[row]):int(offsets[row + 1])]]
+
+
+class CatalogTable:
+    """
+    Memory-mapped columnar catalog. Indexing materializes a single row.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a columnar catalog")
+        (header_length,) = struct.unpack_from("<Q", self._map, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start:start + header_length].decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError("Unsupported columnar catalog version")
+        base = start + header_length
+        base += -base % 8
+        self.count = header["count"]
+        self.columns = {entry["name"]: _Column(self._map, base, entry) for entry in header["columns"]}
+
+    def __len__(self):
+        return self.count
+
+    def get(self, row, field):
+        """
+        One field of one row, without materializing the rest of it.
+        """
+        column = self.columns[field]
+        return column.value(row) if column.is_present(row) else None
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.count
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        record = ToolRecord()
+        present = set()
+        for name in FIELDS:
+            column = self.columns[name]
+            if column.is_present(row):
+                setattr(record, name, column.value(row))
+                present.add(name)
+            else:
+                setattr(record, name, None)
+        extras = self.columns[EXTRAS]
+        record.extras = json.loads(extras.value(row)) if extras.is_present(row) else {}
+        record._present = present
+        return record
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self[row]
+
+    def iter_dicts(self):
+        for record in self:
+            yield record.to_dict()
+
+    def close(self):
+        # Views into the mapping must be gone before it can be closed
+        self.columns = {}
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def to_columnar(tools_path=None, columnar_path=None):
+    tools_path = tools_path or TOOLS_PATH
+    return write_columnar(CatalogStore(tools_path), columnar_path or columnar_path_for(tools_path))
+
+
+def to_json(columnar_path, tools_path):
+    with CatalogTable(columnar_path) as table:
+        return CatalogStore(tools_path).rewrite(table.iter_dicts())
+
+
+# Usage: python -m catalog.columnar to-columnar [tools_path] [columnar_path]
+#        python -m catalog.columnar to-json <columnar_path> <tools_path>
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "to-columnar"
+    if command == "to-json":
+        print(f"{to_json(sys.argv[2], sys.argv[3])} records -> {sys.argv[3]}")
+    else:
+        tools_path = sys.argv[2] if len(sys.argv) > 2 else TOOLS_PATH
+        out = sys.argv[3] if len(sys.argv) > 3 else columnar_path_for(tools_path)
+        print(f"{to_columnar(tools_path, out)} records -> {out}")
@@ -0,0 +1,268 @@
+import json
+import re
+import sys
+import zlib
+
+import numpy as np
+
+from catalog import TOOLS_PATH, load_tools
+
+# Duplicate detection for the catalog.
+#   Exact: same slug or same compacted name ("DALL·E" == "dall-e" == "Dall E").
+#   Near:  MinHash over name character trigrams, LSH-banded so only names
+#          landing in a shared bucket are compared (sub-quadratic), then
+#          verified by trigram Jaccard. Names that differ in their digits
+#          ("Midjourney V5" / "V6", "DALL-E 2" / "3") or edition words
+#          ("Zoho Projects" / "Zoho Projects Pro") are versions, not dupes.
+# Descriptions are templated by the generators, so they carry no signal and
+# are not compared.
+NEAR_DUP_THRESHOLD = 0.8
+MINHASH_BANDS = 12
+MINHASH_ROWS = 6
+# Fields unioned when records merge; every other field keeps the first record's value
+LIST_FIELDS = ("categories", "use_cases", "platforms_supported", "tags")
+EDITION_WORDS = frozenset(["pro", "premium", "plus", "enterprise", "studio", "max", "lite", "ultra", "mini", "nano", "turbo", "instant", "beta", "xl"])
+
+# Small enough that a * x + b cannot overflow uint64 for a, b, x below it
+_MERSENNE_PRIME = (1 << 31) - 1
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_DIGITS_RE = re.compile(r"\d+")
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def compact_name(name):
+    return _NON_ALNUM_RE.sub("", str(name).lower())
+
+
+def name_trigrams(name):
+    key = " " + _NON_ALNUM_RE.sub(" ", str(name).lower()).strip() + " "
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def version_marks(name):
+    """
+    The parts of a name that distinguish versions/editions of one product.
+    """
+    name = str(name).lower()
+    return _DIGITS_RE.findall(name), sorted(set(_WORD_RE.findall(name)) & EDITION_WORDS)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash_signatures(shingle_sets, num_perm=MINHASH_BANDS * MINHASH_ROWS, seed=1, chunk_rows=4096):
+    """
+    One MinHash signature row per shingle set, from universal hashes of the
+    shingles' CRC32s. Empty sets get the all-max signature.
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    # Hash chunks of rows at once; reduceat takes the per-row minimum
+    for start in range(0, len(shingle_sets), chunk_rows):
+        chunk = shingle_sets[start:start + chunk_rows]
+        sizes = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        if not sizes.sum():
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) % _MERSENNE_PRIME for shingles in chunk for shingle in shingles),
+            dtype=np.uint64,
+            count=int(sizes.sum()),
+        )
+        values = (np.outer(hashes, a) + b) % _MERSENNE_PRIME
+        nonempty = np.flatnonzero(sizes)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))[nonempty]
+        signatures[start + nonempty] = np.minimum.reduceat(values, offsets, axis=0)
+    return signatures
+
+
+def candidate_pairs(signatures, bands=MINHASH_BANDS, rows=MINHASH_ROWS):
+    """
+    Pairs of rows that share at least one LSH band bucket.
+    """
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = signatures[:, band * rows:(band + 1) * rows]
+        for row, key in enumerate(map(bytes, chunk)):
+            buckets.setdefault(key, []).append(row)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]))
+    return pairs
+
+
+def merge_records(kept, duplicate):
+    """
+    Folds a duplicate into the kept record: list fields are unioned in
+    order, missing fields are filled and updated_at takes the latest value.
+    """
+    for field, value in duplicate.items():
+        if field in LIST_FIELDS and isinstance(value, list):
+            merged = list(kept.get(field) or [])
+            merged += [v for v in value if v not in merged]
+            kept[field] = merged
+        elif field not in kept or kept[field] in (None, "", []):
+            kept[field] = value
+    if duplicate.get("updated_at") and str(duplicate["updated_at"]) > str(kept.get("updated_at") or ""):
+        kept["updated_at"] = duplicate["updated_at"]
+    return kept
+
+
+def find_exact_duplicates(tools):
+    """
+    Returns [(kept_row, duplicate_row, reason)] for rows whose slug ("slug")
+    or compacted name ("name") was already seen; kept_row is the first row
+    with that key.
+    """
+    first_by_key = {}
+    duplicates = []
+    for row, tool in enumerate(tools):
+        for reason, key in (("slug", tool.get("slug")), ("name", compact_name(tool.get("name", "")))):
+            if not key:
+                continue
+            seen = first_by_key.setdefault((reason, key), row)
+            if seen != row:
+                duplicates.append((seen, row, reason))
+                break
+    return duplicates
+
+
+def find_near_duplicates(tools, threshold=NEAR_DUP_THRESHOLD):
+    """
+    Returns [(earlier_row, later_row, similarity)] for names whose trigram
+    Jaccard reaches threshold and whose version marks match.
+    """
+    shingles = [name_trigrams(tool.get("name", "")) for tool in tools]
+    marks = [version_marks(tool.get("name", "")) for tool in tools]
+    signatures = minhash_signatures(shingles)
+    # Nameless rows share the empty signature; keep them out of the buckets
+    named = np.array([bool(s) for s in shingles], dtype=bool)
+    rows = np.flatnonzero(named)
+    pairs = []
+    for i, j in sorted(candidate_pairs(signatures[rows])):
+        i, j = int(rows[i]), int(rows[j])
+        if marks[i] != marks[j]:
+            continue
+        similarity = jaccard(shingles[i], shingles[j])
+        if similarity >= threshold:
+            pairs.append((i, j, round(similarity, 3)))
+    return pairs
+
+
+def dedupe(tools, near=False, threshold=NEAR_DUP_THRESHOLD):
+    """
+    Drops duplicate records, merging each into the earliest record with the
+    same key (see merge_records). Exact duplicates are always merged. Near
+    duplicates are then looked for among the survivors and merged only when
+    near=True; otherwise they are reported as "suspected".
+    Returns (tools, report).
+    """
+    merged = [dict(tool) for tool in tools]
+    # Resolve chains (a duplicate of a duplicate) to the first record
+    root = list(range(len(tools)))
+    report = {"merged": [], "suspected": []}
+
+    def fold(kept_row, duplicate_row, reason, **extra):
+        while root[kept_row] != kept_row:
+            kept_row = root[kept_row]
+        if kept_row == duplicate_row or root[duplicate_row] != duplicate_row:
+            return
+        merge_records(merged[kept_row], merged[duplicate_row])
+        root[duplicate_row] = kept_row
+        report["merged"].append({
+            "kept": tools[kept_row].get("id"),
+            "duplicate": tools[duplicate_row].get("id"),
+            "name": tools[duplicate_row].get("name"),
+            "reason": reason,
+            **extra,
+        })
+
+    for kept_row, duplicate_row, reason in find_exact_duplicates(tools):
+        fold(kept_row, duplicate_row, reason)
+
+    survivors = [row for row in range(len(tools)) if root[row] == row]
+    for i, j, similarity in find_near_duplicates([tools[row] for row in survivors], threshold):
+        kept_row, duplicate_row = survivors[i], survivors[j]
+        if near:
+            fold(kept_row, duplicate_row, "near", similarity=similarity)
+        else:
+            report["suspected"].append({
+                "kept": tools[kept_row].get("id"),
+                "duplicate": tools[duplicate_row].get("id"),
+                "name": tools[duplicate_row].get("name"),
+                "similarity": similarity,
+            })
+
+    return [tool for row, tool in enumerate(merged) if root[row] == row], report
+
+
+def key_index(records):
+    """
+    Dedup keys of stored records (any iterable, consumed once, so a
+    streamed catalog is never held in memory): slug -> id, compacted
+    name -> id, every id, and (id, name) pairs for near-duplicate checks.
+    """
+    keys = {"slug": {}, "name": {}, "ids": set(), "names": []}
+    for record in records:
+        tool_id = record.get("id")
+        if record.get("slug"):
+            keys["slug"].setdefault(record["slug"], tool_id)
+        name = record.get("name", "")
+        if compact_name(name):
+            keys["name"].setdefault(compact_name(name), tool_id)
+            keys["names"].append((tool_id, name))
+        keys["ids"].add(tool_id)
+    return keys
+
+
+def dedupe_against(keys, tools, threshold=NEAR_DUP_THRESHOLD):
+    """
+    Incremental dedupe of new records against a catalog's key_index. The
+    new records are deduped among themselves, then any whose slug or name is
+    already stored are dropped (the stored record wins, so nothing already
+    written has to be rewritten). Near duplicates of stored names are
+    reported as "suspected".
+    Returns (new records to store, report).
+    """
+    tools, report = dedupe(tools, threshold=threshold)
+    fresh = []
+    for tool in tools:
+        for reason, key in (("slug", tool.get("slug")), ("name", compact_name(tool.get("name", "")))):
+            kept = keys[reason].get(key) if key else None
+            if kept is not None:
+                report["merged"].append({"kept": kept, "duplicate": tool.get("id"), "name": tool.get("name"), "reason": reason})
+                break
+        else:
+            fresh.append(tool)
+
+    stored = [{"id": tool_id, "name": name} for tool_id, name in keys["names"]]
+    for i, j, similarity in find_near_duplicates(stored + fresh, threshold):
+        if i < len(stored) <= j:
+            report["suspected"].append({
+                "kept": stored[i]["id"],
+                "duplicate": fresh[j - len(stored)].get("id"),
+                "name": fresh[j - len(stored)].get("name"),
+                "similarity": similarity,
+            })
+    return fresh, report
+
+
+# Usage: python -m catalog.dedup [tools_path] [--write] [--near]
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    path = args[0] if args else TOOLS_PATH
+    tools = load_tools(path)
+    deduped, report = dedupe(tools, near="--near" in sys.argv)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"{len(tools)} tools -> {len(deduped)} ({len(report['merged'])} merged, {len(report['suspected'])} suspected)")
+    if "--write" in sys.argv:
+        from catalog.build import build_all
+        from catalog.store import CatalogStore
+
+        # Atomic rewrite, then refresh the index/shard/columnar/related sidecars
+        CatalogStore(path).rewrite(deduped)
+        print(build_all(path))
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+
+from catalog import TOOLS_PATH
+from catalog.store import CatalogStore
+
+# Static export of the catalog for the front end, in an export/ directory
+# next to the catalog (data/export/):
+#   manifest.json                     ids, names, slugs and badge colors of
+#                                     every tool, plus the shard file names
+#   pages/page-0001.<hash>.json       PAGE_SIZE tools per page, catalog order
+#   categories/<slug>.<hash>.json     every tool in one category
+# Shards are content-addressed, so they can be served with immutable cache
+# headers; only the manifest needs revalidation. Every file gets a .gz twin
+# and, when the brotli package is installed, a .br twin.
+EXPORT_DIR = os.environ.get("CATALOG_EXPORT_DIR")
+PAGE_SIZE = int(os.environ.get("CATALOG_PAGE_SIZE", 100))
+HASH_CHARS = 12
+MANIFEST_VERSION = 1
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def category_slug(category):
+    return _SLUG_RE.sub("-", html.unescape(category).lower()).strip("-") or "uncategorized"
+
+
+def encode_shard(records):
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_compressed(path, data):
+    """
+    Writes data plus its precompressed twins; returns the paths written.
+    """
+    written = [path]
+    _write_atomic(path, data)
+    try:
+        import brotli
+        _write_atomic(path + ".br", brotli.compress(data, quality=11))
+        written.append(path + ".br")
+    except ImportError:
+        pass
+    # mtime=0 keeps the gzip bytes (and so re-exports) deterministic
+    _write_atomic(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(path + ".gz")
+    return written
+
+
+def write_shard(export_dir, subdir, stem, records):
+    """
+    Writes one content-addressed shard; returns its path relative to export_dir.
+    """
+    data = encode_shard(records)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_CHARS]
+    relative = f"{subdir}/{stem}.{digest}.json"
+    path = os.path.join(export_dir, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Same name means same bytes: an unchanged shard is not rewritten
+    # (the .gz twin is written last, so its presence means the set is complete)
+    if not os.path.exists(path + ".gz"):
+        write_compressed(path, data)
+    return relative
+
+
+def export_catalog(tools_path=None, export_dir=None, page_size=PAGE_SIZE):
+    """
+    Writes the sharded export for a catalog file and removes shards left
+    over from earlier exports. Returns the manifest.
+    """
+    tools_path = tools_path or TOOLS_PATH
+    export_dir = export_dir or EXPORT_DIR or os.path.join(os.path.dirname(os.path.abspath(tools_path)), "export")
+    os.makedirs(export_dir, exist_ok=True)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "count": 0,
+        "page_size": page_size,
+        "pages": [],
+        "categories": {},
+        # Column-oriented so the manifest stays small
+        "tools": {"id": [], "name": [], "slug": [], "badge_color": []},
+    }
+    page = []
+    by_category = {}
+    for tool in CatalogStore(tools_path):
+        manifest["count"] += 1
+        for column, values in manifest["tools"].items():
+            values.append(tool.get(column))
+        for category in tool.get("categories") or []:
+            by_category.setdefault(category, []).append(tool)
+        page.append(tool)
+        if len(page) == page_size:
+            manifest["pages"].append(write_shard(export_dir, "pages", f"page-{len(manifest['pages']) + 1:04d}", page))
+            page = []
+    if page:
+        manifest["pages"].append(write_shard(export_dir, "pages", f"page-{len(manifest['pages']) + 1:04d}", page))
+
+    for category in sorted(by_category):
+        tools = by_category[category]
+        manifest["categories"][category] = {
+            "file": write_shard(export_dir, "categories", category_slug(category), tools),
+            "count": len(tools),
+        }
+
+    write_compressed(os.path.join(export_dir, "manifest.json"), json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    _remove_stale(export_dir, manifest)
+    return manifest
+
+
+def _remove_stale(export_dir, manifest):
+    live = set(manifest["pages"]) | {entry["file"] for entry in manifest["categories"].values()}
+    for subdir in ("pages", "categories"):
+        directory = os.path.join(export_dir, subdir)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            base = name
+            for suffix in (".gz", ".br"):
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if f"{subdir}/{base}" not in live:
+                os.remove(os.path.join(directory, name))
+
+
+# Usage: python -m catalog.export [tools_path] [export_dir]
+if __name__ == "__main__":
+    manifest = export_catalog(sys.argv[1] if len(sys.argv) > 1 else None, sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Exported {manifest['count']} tools: {len(manifest['pages'])} pages, {len(manifest['categories'])} categories")
@@ -0,0 +1,106 @@
+import re
+import sys
+
+import numpy as np
+
+from catalog import load_tools
+
+# Typo-tolerant name/slug lookup. A character-trigram index shortlists the
+# rows sharing the most trigrams with the query, and only that shortlist is
+# scored by rapidfuzz in one batched process.extract call, so lookups stay
+# in the low milliseconds as the catalog grows.
+SHORTLIST_SIZE = 64
+# Keys are padded at the start so 1-2 character prefixes still have trigrams
+PAD = "  "
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text):
+    return _NON_ALNUM_RE.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(key, prefix=False):
+    padded = PAD + key if prefix else PAD + key + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyMatcher:
+    """
+    Fuzzy lookup over tool names and slugs. Build once, query many times.
+    """
+
+    def __init__(self, tools):
+        self.ids = []
+        self.names = []
+        # One searchable key per distinct normalized name/slug; key_rows maps back to the tool
+        self.keys = []
+        key_rows = []
+        postings = {}
+        for row, tool in enumerate(tools):
+            self.ids.append(tool.get("id", str(row)))
+            self.names.append(tool.get("name", ""))
+            for key in {normalize(tool.get("name", "")), normalize(tool.get("slug", ""))}:
+                if not key:
+                    continue
+                for gram in trigrams(key):
+                    postings.setdefault(gram, []).append(len(self.keys))
+                self.keys.append(key)
+                key_rows.append(row)
+        self.key_rows = np.array(key_rows, dtype=np.int64)
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def shortlist(self, query, prefix=False, size=SHORTLIST_SIZE):
+        """
+        Key indices sharing the most trigrams with the query.
+        """
+        lists = [self.postings[gram] for gram in trigrams(query, prefix) if gram in self.postings]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > size:
+            candidates = candidates[np.argpartition(-counts[candidates], size)[:size]]
+        return candidates
+
+    def lookup(self, query, top_k=5, prefix=False):
+        """
+        Returns [(tool_id, name, score)] best first, score in 0-100.
+        prefix=True scores the query against the start of each key, for
+        autocomplete on partially typed input.
+        """
+        from rapidfuzz import fuzz, process
+
+        query = normalize(query)
+        if not query:
+            return []
+        candidates = self.shortlist(query, prefix)
+        if not len(candidates):
+            return []
+
+        if prefix:
+            choices = [self.keys[i][:len(query)] for i in candidates]
+            scorer = fuzz.ratio
+        else:
+            choices = [self.keys[i] for i in candidates]
+            scorer = fuzz.WRatio
+        # Over-fetch: a tool can match through both its name and its slug
+        matches = process.extract(query, choices, scorer=scorer, limit=top_k * 2)
+
+        best = {}
+        for _, score, position in matches:
+            key = candidates[position]
+            row = int(self.key_rows[key])
+            # Among equal scores prefer the shorter key (closer to a whole-name match)
+            rank = (score, -len(self.keys[key]), -row)
+            if row not in best or rank > best[row]:
+                best[row] = rank
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.ids[row], self.names[row], float(rank[0])) for row, rank in ranked]
+
+
+# Usage: python -m catalog.fuzzy "query" [--prefix]
+if __name__ == "__main__":
+    matcher = FuzzyMatcher(load_tools())
+    for tool_id, name, score in matcher.lookup(sys.argv[1], prefix="--prefix" in sys.argv):
+        print(f"{score:6.1f}  {tool_id:>10}  {name}")
@@ -0,0 +1,342 @@
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from catalog import TOOLS_PATH, load_tools
+
+# Inverted index over the catalog: token -> posting list of row numbers with
+# precomputed BM25 weights, plus one bitmap per facet value. Queries touch
+# only the postings of their own tokens, so cost follows the query, not the
+# catalog size. Saved as a sidecar next to the catalog (data/tools.index.npz).
+#
+# Each posting list also has an impact order (highest weight first). Search
+# scores the documents found in the top `depth` entries of every query
+# term's list, and stops once the k-th best score beats the most any unseen
+# document could still reach (the sum of the weights at that depth); else
+# the depth grows. Common terms ("ai", "tool") then cost O(k), not O(df).
+# Results are identical to scoring the full posting lists.
+INDEX_VERSION = 2
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term-frequency multiplier per field (a name match outranks a description match)
+FIELD_WEIGHTS = {
+    "name": 3,
+    "tags": 2,
+    "categories": 2,
+    "use_cases": 1,
+    "company": 1,
+    "short_description": 1,
+    "full_description": 1,
+}
+FACETS = ("categories", "pricing_model", "platforms_supported")
+# First impact-ordered depth scanned per term, as a multiple of top_k
+PRUNE_DEPTH_FACTOR = 4
+PRUNE_MIN_DEPTH = 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(html.unescape(text).lower())
+
+
+def _field_values(tool, field):
+    value = tool.get(field)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def index_path_for(tools_path):
+    return os.path.splitext(tools_path)[0] + ".index.npz"
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class CatalogIndex:
+    """
+    Read-only search index. Build with build_index(tools) or CatalogIndex.load().
+    """
+
+    def __init__(self, ids, vocabulary, offsets, postings, weights, impact, facets, source_digest="", source_stat=None):
+        self.ids = ids
+        self.offsets = offsets
+        # Rows ascending within each term, with their BM25 weights
+        self.postings = postings
+        self.weights = weights
+        # Per term: positions within its list, highest weight first
+        self.impact = impact
+        # facet name -> {value: bool row mask}
+        self.facets = facets
+        self.source_digest = source_digest
+        # [st_mtime_ns, st_size] of the catalog file the index was built from
+        self.source_stat = source_stat
+        self.terms = {term: i for i, term in enumerate(vocabulary)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def facet_mask(self, facets):
+        """
+        Rows matching every facet; values within one facet are OR-ed.
+        facets: {"categories": "Design" | ["Design", ...], ...}
+        """
+        mask = None
+        for name, values in (facets or {}).items():
+            if name not in self.facets:
+                raise ValueError(f"Unknown facet: {name}")
+            if isinstance(values, str):
+                values = [values]
+            group = np.zeros(len(self.ids), dtype=bool)
+            for value in values:
+                bitmap = self.facets[name].get(value)
+                if bitmap is not None:
+                    group |= bitmap
+            mask = group if mask is None else mask & group
+        return mask
+
+    def search(self, text="", facets=None, top_k=10):
+        """
+        Returns [(tool_id, score)] for the top_k matches, best first. With no
+        text, facet matches are returned in catalog order with score 0.
+        """
+        mask = self.facet_mask(facets)
+        rows = []
+        for term in set(tokenize(text or "")):
+            i = self.terms.get(term)
+            if i is not None:
+                rows.append(i)
+
+        if not rows:
+            if text and tokenize(text):
+                return []
+            matches = np.flatnonzero(mask) if mask is not None else np.arange(len(self.ids))
+            return [(self.ids[row], 0.0) for row in matches[:top_k]]
+
+        docs, scores = self._candidates(rows, mask, top_k)
+        if len(docs) > top_k:
+            # Keep everything tied with the k-th score so the tie-break below
+            # sees them all
+            kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+            keep = scores >= kth
+            docs, scores = docs[keep], scores[keep]
+        # Ties go to the earlier row
+        order = np.lexsort((docs, -scores))[:top_k]
+        return [(self.ids[docs[j]], float(scores[j])) for j in order]
+
+    def _candidates(self, rows, mask, top_k):
+        """
+        Documents (after the facet mask) that include the top_k matches for
+        the given terms, with their exact scores.
+        """
+        lists = [
+            (self.postings[self.offsets[i]:self.offsets[i + 1]], self.weights[self.offsets[i]:self.offsets[i + 1]], self.impact[self.offsets[i]:self.offsets[i + 1]])
+            for i in rows
+        ]
+        longest = max(len(docs) for docs, _, _ in lists)
+        depth = max(top_k * PRUNE_DEPTH_FACTOR, PRUNE_MIN_DEPTH)
+        while True:
+            if depth >= longest:
+                return self._score_all(lists, mask)
+            seen = np.unique(np.concatenate([docs[impact[:depth]] for docs, _, impact in lists]))
+            if mask is not None:
+                seen = seen[mask[seen]]
+            # Exact scores: look each candidate up in every list (rows are sorted)
+            scores = np.zeros(len(seen))
+            for docs, weights, _ in lists:
+                found = np.minimum(np.searchsorted(docs, seen), len(docs) - 1)
+                hit = docs[found] == seen
+                scores[hit] += weights[found[hit]]
+            # Upper bound for every document not seen yet
+            bound = sum(float(weights[impact[depth]]) for docs, weights, impact in lists if depth < len(docs))
+            if len(seen) >= top_k and -np.partition(-scores, top_k - 1)[top_k - 1] > bound:
+                return seen, scores
+            depth *= PRUNE_DEPTH_FACTOR
+
+    @staticmethod
+    def _score_all(lists, mask):
+        # Sum each document's weights across the full posting lists
+        docs = np.concatenate([docs for docs, _, _ in lists])
+        scores = np.concatenate([weights for _, weights, _ in lists])
+        docs, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=scores)
+        if mask is not None:
+            keep = mask[docs]
+            docs, scores = docs[keep], scores[keep]
+        return docs, scores
+
+    def save(self, path):
+        facet_names = []
+        facet_values = []
+        bitmaps = []
+        for name, values in self.facets.items():
+            for value, bitmap in values.items():
+                facet_names.append(name)
+                facet_values.append(value)
+                bitmaps.append(np.packbits(bitmap))
+        header = {
+            "version": INDEX_VERSION,
+            "source_digest": self.source_digest,
+            "source_stat": self.source_stat,
+            "count": len(self.ids),
+            "ids": self.ids,
+            "vocabulary": sorted(self.terms, key=self.terms.get),
+            "facets": [facet_names, facet_values],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+                offsets=self.offsets,
+                postings=self.postings,
+                weights=self.weights,
+                impact=self.impact,
+                bitmaps=np.stack(bitmaps) if bitmaps else np.zeros((0, 0), dtype=np.uint8),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            if header.get("version") != INDEX_VERSION:
+                raise ValueError("Unsupported index version")
+            count = header["count"]
+            facets = {}
+            for name, value, packed in zip(*header["facets"], data["bitmaps"]):
+                facets.setdefault(name, {})[value] = np.unpackbits(packed, count=count).astype(bool)
+            return cls(
+                header["ids"], header["vocabulary"], data["offsets"], data["postings"], data["weights"], data["impact"],
+                facets, header["source_digest"], header.get("source_stat"),
+            )
+
+
+def build_index(tools, source_digest="", source_stat=None):
+    """
+    Builds a CatalogIndex over a list of tool dicts.
+    """
+    ids = []
+    doc_terms = []
+    doc_lengths = np.zeros(len(tools), dtype=np.float64)
+    facets = {name: {} for name in FACETS}
+
+    for row, tool in enumerate(tools):
+        ids.append(tool.get("id", str(row)))
+        counts = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for value in _field_values(tool, field):
+                for token in tokenize(value):
+                    counts[token] = counts.get(token, 0) + weight
+        doc_terms.append(counts)
+        doc_lengths[row] = sum(counts.values())
+        for name in FACETS:
+            for value in _field_values(tool, name):
+                facets[name].setdefault(value, []).append(row)
+
+    postings_by_term = {}
+    for row, counts in enumerate(doc_terms):
+        for term, tf in counts.items():
+            postings_by_term.setdefault(term, []).append((row, tf))
+
+    n = len(tools)
+    avg_length = doc_lengths.mean() if n else 0.0
+    vocabulary = sorted(postings_by_term)
+    offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    postings = []
+    weights = []
+    impact = []
+    for i, term in enumerate(vocabulary):
+        entries = postings_by_term[term]
+        df = len(entries)
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+        rows = np.fromiter((row for row, _ in entries), dtype=np.uint32, count=df)
+        tf = np.fromiter((tf for _, tf in entries), dtype=np.float64, count=df)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[rows] / avg_length)
+        term_weights = (idf * tf * (BM25_K1 + 1) / (tf + norm)).astype(np.float32)
+        postings.append(rows)
+        weights.append(term_weights)
+        # Highest weight first; ties keep the earlier row, as search does
+        impact.append(np.lexsort((rows, -term_weights)).astype(np.uint32))
+        offsets[i + 1] = offsets[i] + df
+
+    bitmaps = {}
+    for name, values in facets.items():
+        bitmaps[name] = {}
+        for value, rows in values.items():
+            bitmap = np.zeros(n, dtype=bool)
+            bitmap[rows] = True
+            bitmaps[name][value] = bitmap
+
+    return CatalogIndex(
+        ids,
+        vocabulary,
+        offsets,
+        np.concatenate(postings) if postings else np.zeros(0, dtype=np.uint32),
+        np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32),
+        np.concatenate(impact) if impact else np.zeros(0, dtype=np.uint32),
+        bitmaps,
+        source_digest,
+        source_stat,
+    )
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def build_sidecar(tools_path=None, index_path=None, tools=None):
+    """
+    Builds the index for a catalog file and writes it next to it.
+    """
+    tools_path = tools_path or TOOLS_PATH
+    index_path = index_path or index_path_for(tools_path)
+    source_stat = file_stat(tools_path)
+    if tools is None:
+        tools = load_tools(tools_path)
+    index = build_index(tools, source_digest=file_digest(tools_path), source_stat=source_stat)
+    index.save(index_path)
+    return index
+
+
+def load_index(tools_path=None, index_path=None):
+    """
+    Loads the sidecar index, rebuilding it if it is missing or older than
+    the catalog it was built from. The catalog is only hashed when its
+    mtime or size changed since the index was built.
+    """
+    tools_path = tools_path or TOOLS_PATH
+    index_path = index_path or index_path_for(tools_path)
+    try:
+        index = CatalogIndex.load(index_path)
+        source_stat = file_stat(tools_path)
+        if index.source_stat == source_stat:
+            return index
+        if index.source_digest == file_digest(tools_path):
+            # Touched but unchanged: record the new stat so the next load skips the hash
+            index.source_stat = source_stat
+            index.save(index_path)
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    return build_sidecar(tools_path, index_path)
+
+
+# Usage: python -m catalog.index [tools_path]
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else TOOLS_PATH
+    index = build_sidecar(path)
+    print(f"Indexed {len(index)} tools, {len(index.terms)} terms -> {index_path_for(path)}")
@@ -0,0 +1,292 @@
+import hashlib
+import html
+import json
+import os
+import sys
+
+import numpy as np
+
+from catalog import ROOT, TOOLS_PATH
+from catalog.store import CatalogStore
+
+# Offline "related tools" graph. Each tool's name, short description and
+# tags are embedded with the sentence model behind shared_utils.get_kw_model,
+# and the top-k most similar tools are stored per tool in a sidecar
+# (data/tools.related.npz), so serving related tools is a dict lookup.
+#
+# Rebuilds are incremental: only tools whose embedded text changed are
+# re-embedded, and only rows that gained, lost or changed a neighbour are
+# re-ranked. Above EXACT_MAX_ROWS, neighbours come from an IVF index
+# (k-means cells, nprobe nearest cells searched) instead of a full scan.
+# Without keybert/sentence-transformers the embeddings fall back to hashed
+# n-grams; the sidecar records which embedder built it, so switching
+# embedders triggers a full rebuild.
+TOP_K = 10
+EMBED_BATCH = 256
+BLOCK_ROWS = 1024
+EXACT_MAX_ROWS = 20000
+IVF_NPROBE = 8
+KMEANS_ITERATIONS = 10
+HASHING_FEATURES = 1024
+RELATED_VERSION = 1
+
+
+def related_path_for(tools_path):
+    return os.path.splitext(tools_path)[0] + ".related.npz"
+
+
+def embedding_text(tool):
+    parts = [tool.get("name", ""), tool.get("short_description", ""), ", ".join(tool.get("tags") or [])]
+    return html.unescape(". ".join(str(part) for part in parts if part))
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def hashing_embedder():
+    """
+    Lexical fallback: hashed word and character n-grams, no model needed.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    words = HashingVectorizer(n_features=HASHING_FEATURES, ngram_range=(1, 2), stop_words="english", norm="l2", alternate_sign=False)
+    chars = HashingVectorizer(n_features=HASHING_FEATURES, analyzer="char_wb", ngram_range=(3, 4), norm="l2", alternate_sign=False)
+    return f"hashing-{HASHING_FEATURES}", lambda texts: (words.transform(texts) + chars.transform(texts)).toarray()
+
+
+def default_embedder():
+    """
+    Returns (model name, embed(texts) -> array) backed by the KeyBERT
+    sentence model, or the hashing embedder if the model can't be loaded.
+    """
+    functions_dir = os.path.join(ROOT, "functions_python")
+    if functions_dir not in sys.path:
+        sys.path.insert(0, functions_dir)
+    try:
+        import shared_utils
+
+        model = shared_utils.get_kw_model()
+        return shared_utils.KEYBERT_MODEL, lambda texts: model.model.embed(texts)
+    except Exception as e:
+        print(f"Error loading the embedding model, using hashed n-grams: {e}")
+        return hashing_embedder()
+
+
+def embed_normalized(embed, texts):
+    chunks = []
+    for start in range(0, len(texts), EMBED_BATCH):
+        chunks.append(np.asarray(embed(texts[start:start + EMBED_BATCH]), dtype=np.float32))
+    vectors = np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _top_k(similarities, k, exclude=None):
+    """
+    Row-wise top-k (indices, scores) of a similarity block, best first.
+    exclude[i] is a column to skip for row i (the row itself).
+    """
+    if exclude is not None:
+        similarities[np.arange(len(exclude)), exclude] = -np.inf
+    k = min(k, similarities.shape[1])
+    if k <= 0:
+        return np.zeros((len(similarities), 0), dtype=np.int32), np.zeros((len(similarities), 0), dtype=np.float32)
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1).astype(np.int32), np.take_along_axis(scores, order, axis=1).astype(np.float32)
+
+
+def exact_neighbors(embeddings, rows, k):
+    """
+    Top-k neighbours of the given rows against every row, in blocks.
+    """
+    neighbors = np.zeros((len(rows), min(k, max(len(embeddings) - 1, 0))), dtype=np.int32)
+    scores = np.zeros(neighbors.shape, dtype=np.float32)
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = rows[start:start + BLOCK_ROWS]
+        similarities = embeddings[block] @ embeddings.T
+        neighbors[start:start + len(block)], scores[start:start + len(block)] = _top_k(similarities, k, exclude=block)
+    return neighbors, scores
+
+
+def kmeans(embeddings, cells, iterations=KMEANS_ITERATIONS, seed=0):
+    """
+    Spherical k-means; returns (centroids, cell of each row).
+    """
+    rng = np.random.RandomState(seed)
+    centroids = embeddings[rng.choice(len(embeddings), cells, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.concatenate([
+            np.argmax(embeddings[start:start + BLOCK_ROWS] @ centroids.T, axis=1)
+            for start in range(0, len(embeddings), BLOCK_ROWS)
+        ])
+        for cell in range(cells):
+            members = embeddings[assignment == cell]
+            if len(members):
+                centroid = members.sum(axis=0)
+                centroids[cell] = centroid / max(np.linalg.norm(centroid), 1e-12)
+    return centroids, assignment
+
+
+def ivf_neighbors(embeddings, rows, k, nprobe=IVF_NPROBE):
+    """
+    Approximate top-k: rows are grouped by k-means cell, and each group is
+    compared in one batch with the members of the nprobe cells nearest to
+    its centroid.
+    """
+    cells = max(1, int(np.sqrt(len(embeddings))))
+    centroids, assignment = kmeans(embeddings, cells)
+    order = np.argsort(assignment, kind="stable")
+    bounds = np.searchsorted(assignment[order], np.arange(cells + 1))
+    probes = np.argsort(-(centroids @ centroids.T), axis=1)[:, :nprobe]
+
+    width = min(k, max(len(embeddings) - 1, 0))
+    neighbors = np.zeros((len(rows), width), dtype=np.int32)
+    scores = np.full((len(rows), width), -np.inf, dtype=np.float32)
+    rows = np.asarray(rows)
+    for cell in np.unique(assignment[rows]):
+        positions = np.flatnonzero(assignment[rows] == cell)
+        candidates = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probes[cell]])
+        similarities = embeddings[rows[positions]] @ embeddings[candidates].T
+        similarities[rows[positions][:, None] == candidates[None, :]] = -np.inf
+        top, top_scores = _top_k(similarities, width)
+        neighbors[positions, :top.shape[1]] = candidates[top]
+        scores[positions, :top.shape[1]] = top_scores
+    return neighbors, scores
+
+
+class RelatedIndex:
+    """
+    Precomputed top-k related tools. related(tool_id) is a dict lookup.
+    """
+
+    def __init__(self, ids, hashes, embeddings, neighbors, scores, model=""):
+        self.ids = list(ids)
+        self.hashes = list(hashes)
+        self.embeddings = embeddings
+        self.neighbors = neighbors
+        self.scores = scores
+        self.model = model
+        self.rows = {tool_id: row for row, tool_id in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def related(self, tool_id, k=None):
+        """
+        Returns [(tool_id, score)] most similar first, [] for unknown ids.
+        """
+        row = self.rows.get(tool_id)
+        if row is None:
+            return []
+        width = self.neighbors.shape[1] if k is None else min(k, self.neighbors.shape[1])
+        return [(self.ids[n], float(s)) for n, s in zip(self.neighbors[row, :width], self.scores[row, :width]) if np.isfinite(s)]
+
+    def save(self, path):
+        header = {"version": RELATED_VERSION, "model": self.model, "ids": self.ids, "hashes": self.hashes}
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+                embeddings=self.embeddings,
+                neighbors=self.neighbors,
+                scores=self.scores,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            if header.get("version") != RELATED_VERSION:
+                raise ValueError("Unsupported related index version")
+            return cls(header["ids"], header["hashes"], data["embeddings"], data["neighbors"], data["scores"], header["model"])
+
+
+def build_related(tools, previous=None, embedder=None, k=TOP_K):
+    """
+    Builds a RelatedIndex, reusing embeddings and neighbour lists from
+    previous for tools whose text is unchanged. Returns (index, stats).
+    """
+    model, embed = embedder or default_embedder()
+    ids = [tool.get("id", str(row)) for row, tool in enumerate(tools)]
+    texts = [embedding_text(tool) for tool in tools]
+    hashes = [text_hash(text) for text in texts]
+    n = len(tools)
+
+    reusable = previous is not None and previous.model == model and previous.neighbors.shape[1] == min(k, max(n - 1, 0))
+    old_rows = previous.rows if reusable else {}
+    kept = [old_rows.get(tool_id) if old_rows.get(tool_id) is not None and previous.hashes[old_rows[tool_id]] == h else None for tool_id, h in zip(ids, hashes)]
+    changed = np.array([row for row in range(n) if kept[row] is None], dtype=np.int64)
+
+    dims = previous.embeddings.shape[1] if reusable and len(previous.embeddings) else None
+    fresh = embed_normalized(embed, [texts[row] for row in changed]) if len(changed) else None
+    if dims is None:
+        dims = fresh.shape[1] if fresh is not None and fresh.size else 0
+    embeddings = np.zeros((n, dims), dtype=np.float32)
+    for row, old in enumerate(kept):
+        if old is not None:
+            embeddings[row] = previous.embeddings[old]
+    if len(changed):
+        embeddings[changed] = fresh
+
+    width = min(k, max(n - 1, 0))
+    neighbors = np.zeros((n, width), dtype=np.int32)
+    scores = np.full((n, width), -np.inf, dtype=np.float32)
+
+    # Unchanged rows keep their lists unless a neighbour changed or vanished
+    old_to_new = {old: row for row, old in enumerate(kept) if old is not None}
+    rerank = set(changed.tolist())
+    for row, old in enumerate(kept):
+        if old is None:
+            continue
+        mapped = [old_to_new.get(int(neighbor)) for neighbor in previous.neighbors[old]]
+        if any(m is None for m in mapped):
+            rerank.add(row)
+        else:
+            neighbors[row] = mapped
+            scores[row] = previous.scores[old]
+    rerank = np.array(sorted(rerank), dtype=np.int64)
+
+    search = exact_neighbors if n <= EXACT_MAX_ROWS else ivf_neighbors
+    if len(rerank) and width:
+        neighbors[rerank], scores[rerank] = search(embeddings, rerank, k)
+
+    # Untouched rows may now rank a changed tool among their top-k
+    untouched = np.setdiff1d(np.arange(n), rerank)
+    if len(changed) and len(untouched) and width:
+        for start in range(0, len(untouched), BLOCK_ROWS):
+            block = untouched[start:start + BLOCK_ROWS]
+            candidate_rows = np.concatenate([neighbors[block], np.broadcast_to(changed, (len(block), len(changed)))], axis=1)
+            candidate_scores = np.concatenate([scores[block], embeddings[block] @ embeddings[changed].T], axis=1)
+            candidate_scores[candidate_rows == block[:, None]] = -np.inf
+            top, top_scores = _top_k(candidate_scores, width)
+            neighbors[block] = np.take_along_axis(candidate_rows, top, axis=1)
+            scores[block] = top_scores
+
+    stats = {"tools": n, "embedded": int(len(changed)), "reranked": int(len(rerank)), "search": search.__name__}
+    return RelatedIndex(ids, hashes, embeddings, neighbors, scores, model), stats
+
+
+def build_related_sidecar(tools_path=None, related_path=None, embedder=None, k=TOP_K):
+    """
+    Incrementally rebuilds the related-tools sidecar for a catalog file.
+    """
+    tools_path = tools_path or TOOLS_PATH
+    related_path = related_path or related_path_for(tools_path)
+    try:
+        previous = RelatedIndex.load(related_path)
+    except (OSError, ValueError, KeyError):
+        previous = None
+    index, stats = build_related(list(CatalogStore(tools_path)), previous, embedder, k)
+    index.save(related_path)
+    return index, stats
+
+
+# Usage: python -m catalog.related [tools_path]
+if __name__ == "__main__":
+    _, stats = build_related_sidecar(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(stats)
@@ -0,0 +1,214 @@
+import itertools
+import json
+import os
+import sys
+
+from catalog import TOOLS_PATH
+
+# Line-oriented storage for the catalog. The file stays a valid JSON array
+# (the front end fetches it as-is), but with one compact record per line:
+#
+#   [
+#   {"id":"tool-1",...},
+#   {"id":"tool-2",...}
+#   ]
+#
+# so records can be streamed in and out one line at a time.
+#   append():  encodes only the new records; the existing bytes are copied
+#              verbatim (no parsing) ahead of them.
+#   upsert(), rewrite(): stream every record through the writer, holding
+#              only the new records in memory.
+# All three write a temp file in the same directory that is fsynced and
+# atomically renamed over the original, so the front end (which serves the
+# file directly) and a crash mid-write only ever see a complete array.
+# Files in any other JSON layout (e.g. the old indent=2 dump) are read with
+# json.load and converted on the first write.
+OPEN = b"[\n"
+CLOSE = b"\n]\n"
+COPY_CHUNK = 1 << 20
+
+
+def encode(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _fsync_dir(path):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class CatalogStore:
+    """
+    Streaming reader/writer for a catalog file (data/tools.json by default).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or TOOLS_PATH
+
+    def is_line_format(self):
+        try:
+            with open(self.path, "rb") as f:
+                if f.readline() != OPEN:
+                    return False
+                second = f.readline()
+        except FileNotFoundError:
+            return False
+        return second.startswith(b"{") or second == b"]\n"
+
+    def __iter__(self):
+        """
+        Yields records one at a time (streamed for line-format files).
+        """
+        if not os.path.exists(self.path):
+            return
+        if not self.is_line_format():
+            with open(self.path, "r", encoding="utf-8") as f:
+                yield from json.load(f)
+            return
+        with open(self.path, "rb") as f:
+            f.readline()
+            for line in f:
+                line = line.rstrip(b"\r\n")
+                if line.endswith(b","):
+                    line = line[:-1]
+                if not line.startswith(b"{"):
+                    # Closing bracket, or a damaged tail
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+
+    def keys(self):
+        """
+        Slugs, names and ids of every stored record, without keeping the records.
+        """
+        slugs, names, ids = set(), set(), set()
+        for record in self:
+            slugs.add(record.get("slug"))
+            names.add(record.get("name"))
+            ids.add(record.get("id"))
+        return {"slug": slugs, "name": names, "id": ids}
+
+    def rewrite(self, records):
+        """
+        Replaces the file with records (any iterable), streamed through a
+        temp file and atomically renamed into place.
+        """
+        tmp = self.path + ".tmp"
+        count = 0
+        with open(tmp, "wb") as f:
+            f.write(OPEN)
+            for record in records:
+                if count:
+                    f.write(b",\n")
+                f.write(encode(record))
+                count += 1
+            f.write(CLOSE if count else b"]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        return count
+
+    def _records_end(self):
+        """
+        Byte offset of the closing bracket in a well-formed line-format file
+        (just past the last record), or None if the file is missing, in
+        another layout, or damaged.
+        """
+        if not self.is_line_format():
+            return None
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == len(OPEN) + 2:
+                return len(OPEN)
+            if size > len(OPEN) + len(CLOSE):
+                f.seek(size - len(CLOSE))
+                if f.read() == CLOSE:
+                    return size - len(CLOSE)
+        return None
+
+    def append(self, records):
+        """
+        Appends records to the end of the file. Returns how many were written.
+        """
+        records = list(records)
+        if not records:
+            return 0
+        end = self._records_end()
+        if end is None:
+            # Missing, old layout or a damaged tail: one streamed rewrite
+            self.rewrite(itertools.chain(iter(self), records))
+            return len(records)
+        tmp = self.path + ".tmp"
+        with open(self.path, "rb") as src, open(tmp, "wb") as f:
+            remaining = end
+            while remaining:
+                chunk = src.read(min(remaining, COPY_CHUNK))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+            if end > len(OPEN):
+                f.write(b",\n")
+            f.write(b",\n".join(encode(record) for record in records))
+            f.write(CLOSE)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        return len(records)
+
+    def upsert(self, records, key="id"):
+        """
+        Replaces stored records whose key matches one of records and appends
+        the rest, in one streamed pass. Returns (updated, inserted).
+        """
+        pending = {record[key]: record for record in records}
+        counts = {"updated": 0, "inserted": 0}
+
+        def merged():
+            for record in self:
+                replacement = pending.pop(record.get(key), None)
+                if replacement is not None:
+                    counts["updated"] += 1
+                    record = replacement
+                yield record
+            counts["inserted"] = len(pending)
+            yield from pending.values()
+
+        if pending:
+            self.rewrite(merged())
+        return counts["updated"], counts["inserted"]
+
+    def write_pretty(self, path):
+        """
+        Writes an indented copy (for reading/diffing) without loading the catalog.
+        """
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("[")
+            for i, record in enumerate(self):
+                f.write(",\n  " if i else "\n  ")
+                f.write(json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            f.write("\n]\n")
+        os.replace(tmp, path)
+
+
+# Usage: python -m catalog.store compact [tools_path]
+#        python -m catalog.store pretty <out_path> [tools_path]
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "compact"
+    if command == "pretty":
+        store = CatalogStore(sys.argv[3] if len(sys.argv) > 3 else None)
+        store.write_pretty(sys.argv[2])
+    else:
+        store = CatalogStore(sys.argv[2] if len(sys.argv) > 2 else None)
+        before = os.path.getsize(store.path)
+        count = store.rewrite(iter(store))
+        print(f"{count} records, {before} -> {os.path.getsize(store.path)} bytes")
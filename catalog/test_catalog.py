@@ -0,0 +1,214 @@
+import gzip
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import columnar, dedup, export, fuzzy, index, next_id_number, related, synthetic
+from catalog.store import CatalogStore
+
+sample_tools = [
+    {"id": "tool-1", "name": "ChatGPT", "company": "OpenAI", "categories": ["Text Generation"], "pricing_model": "FREE_PAID",
+     "platforms_supported": ["Web", "Mobile"], "tags": ["chatbot"], "short_description": "Conversational AI for writing."},
+    {"id": "tool-2", "name": "Canva Pro", "company": "Canva", "categories": ["Design"], "pricing_model": "PAID",
+     "platforms_supported": ["Web"], "tags": ["design"], "short_description": "Graphic design &amp; presentations."},
+    {"id": "tool-3", "name": "Kapwing", "company": "Kapwing", "categories": ["Video Editing"], "pricing_model": "FREE",
+     "platforms_supported": ["Web", "Mobile"], "tags": ["video editing"], "short_description": "Online video editing for creators."},
+]
+
+
+def test_index_search(tmp_path):
+    idx = index.build_index(sample_tools)
+    assert idx.search("video editing")[0][0] == "tool-3"
+    assert idx.search("design presentations", top_k=1) == idx.search("Design Presentations", top_k=1)
+    assert [tool_id for tool_id, _ in idx.search(facets={"platforms_supported": "Mobile"})] == ["tool-1", "tool-3"]
+    assert idx.search("video", facets={"pricing_model": "PAID"}) == []
+    assert idx.search("nonexistent") == []
+
+    path = str(tmp_path / "tools.index.npz")
+    idx.save(path)
+    loaded = index.CatalogIndex.load(path)
+    assert loaded.search("chatbot writing") == idx.search("chatbot writing")
+    assert loaded.search(facets={"categories": ["Design", "Video Editing"]}) == idx.search(facets={"categories": ["Design", "Video Editing"]})
+    print("Catalog index search OK")
+
+
+def test_index_pruning(tmp_path):
+    tools = list(synthetic.synthetic_tools(3000, seed=5))
+    idx = index.build_index(tools)
+    queries = ["ai", "ai tool", "video editing", "free design tool for creators", "writing assistant"]
+    facets = [None, {"pricing_model": "PAID"}, {"categories": tools[0]["categories"][0]}]
+    pruned = [idx.search(q, facets=f, top_k=k) for q in queries for f in facets for k in (1, 10)]
+    # Scoring the full posting lists gives the same results
+    depth = index.PRUNE_MIN_DEPTH
+    index.PRUNE_MIN_DEPTH = len(tools)
+    try:
+        assert pruned == [idx.search(q, facets=f, top_k=k) for q in queries for f in facets for k in (1, 10)]
+    finally:
+        index.PRUNE_MIN_DEPTH = depth
+
+    # An untouched catalog is not hashed again; a touched but identical one is
+    # hashed once and keeps its index
+    path = str(tmp_path / "tools.json")
+    CatalogStore(path).rewrite(sample_tools)
+    built = index.load_index(path)
+    digest = index.file_digest
+    index.file_digest = lambda p: (_ for _ in ()).throw(AssertionError("hashed"))
+    try:
+        assert index.load_index(path).search("video") == built.search("video")
+    finally:
+        index.file_digest = digest
+    os.utime(path, ns=(1, 1))
+    assert index.load_index(path).source_stat == index.file_stat(path)
+    print("Catalog index pruning OK")
+
+
+def test_fuzzy_lookup():
+    matcher = fuzzy.FuzzyMatcher(sample_tools)
+    assert matcher.lookup("chatgtp")[0][0] == "tool-1"
+    assert matcher.lookup("canva-pro")[0][:2] == ("tool-2", "Canva Pro")
+    assert matcher.lookup("kap", prefix=True)[0][0] == "tool-3"
+    assert matcher.lookup("kpw", prefix=True)[0][0] == "tool-3"
+    assert matcher.lookup("") == []
+    print("Catalog fuzzy lookup OK")
+
+
+def test_dedupe():
+    tools = sample_tools + [
+        {"id": "tool-4", "name": "Chat GPT", "slug": "chat-gpt", "tags": ["assistant"], "updated_at": "2030-01-01"},
+        {"id": "tool-5", "name": "Canva Pro", "slug": "canva-pro-2", "platforms_supported": ["Mobile"]},
+        {"id": "tool-6", "name": "Kapwing Editor", "slug": "kapwing-editor"},
+        {"id": "tool-7", "name": "Kapwing Editors", "slug": "kapwing-editors"},
+        {"id": "tool-8", "name": "Kapwing Editor 2", "slug": "kapwing-editor-2"},
+    ]
+    deduped, report = dedup.dedupe(tools)
+    assert [tool["id"] for tool in deduped] == ["tool-1", "tool-2", "tool-3", "tool-6", "tool-7", "tool-8"]
+    assert deduped[0]["tags"] == ["chatbot", "assistant"] and deduped[0]["updated_at"] == "2030-01-01"
+    assert deduped[1]["platforms_supported"] == ["Web", "Mobile"]
+    assert [(e["kept"], e["duplicate"]) for e in report["suspected"]] == [("tool-6", "tool-7")]
+
+    deduped, report = dedup.dedupe(tools, near=True)
+    assert [tool["id"] for tool in deduped] == ["tool-1", "tool-2", "tool-3", "tool-6", "tool-8"]
+    assert next_id_number(tool["id"] for tool in deduped) == 9
+
+    keys = dedup.key_index(deduped)
+    fresh, report = dedup.dedupe_against(keys, [
+        {"id": "tool-9", "name": "ChatGPT", "slug": "chatgpt"},
+        {"id": "tool-10", "name": "Kapwing Editors"},
+        {"id": "tool-11", "name": "Descript"},
+    ])
+    assert [tool["id"] for tool in fresh] == ["tool-10", "tool-11"]
+    assert [(e["kept"], e["duplicate"]) for e in report["merged"]] == [("tool-1", "tool-9")]
+    assert [(e["kept"], e["duplicate"]) for e in report["suspected"]] == [("tool-6", "tool-10")]
+    print("Catalog dedupe OK")
+
+
+def test_store_and_export(tmp_path):
+    path = str(tmp_path / "tools.json")
+    store = CatalogStore(path)
+    store.append(sample_tools[:2])
+    store.append(sample_tools[2:])
+    assert list(store) == sample_tools
+    assert store.upsert([dict(sample_tools[0], name="ChatGPT 5"), {"id": "tool-4", "name": "New"}]) == (1, 1)
+    with open(path, encoding="utf-8") as f:
+        assert [tool["name"] for tool in json.load(f)] == ["ChatGPT 5", "Canva Pro", "Kapwing", "New"]
+
+    export_dir = str(tmp_path / "export")
+    manifest = export.export_catalog(path, export_dir, page_size=3)
+    assert manifest["count"] == 4 and len(manifest["pages"]) == 2
+    assert manifest["tools"]["slug"] == [None, None, None, None]
+    with gzip.open(os.path.join(export_dir, manifest["categories"]["Design"]["file"]) + ".gz") as f:
+        assert [tool["id"] for tool in json.load(f)] == ["tool-2"]
+    # Unchanged shards keep their names; stale ones are removed
+    store.upsert([{"id": "tool-4", "name": "Renamed"}])
+    again = export.export_catalog(path, export_dir, page_size=3)
+    assert again["pages"][0] == manifest["pages"][0] and again["pages"][1] != manifest["pages"][1]
+    assert not os.path.exists(os.path.join(export_dir, manifest["pages"][1]))
+    print("Catalog store and export OK")
+
+
+def test_store_append_crash(tmp_path, monkeypatch):
+    path = str(tmp_path / "tools.json")
+    store = CatalogStore(path)
+    store.append(sample_tools[:2])
+    with open(path, "rb") as f:
+        before = f.read()
+
+    # Crash just before the rename: the live file must still be the old,
+    # complete array at that point and afterwards
+    def crash(src, dst):
+        with open(dst, "rb") as f:
+            assert f.read() == before
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(os, "replace", crash)
+    try:
+        store.append(sample_tools[2:])
+    except OSError:
+        pass
+    else:
+        raise AssertionError("append did not reach the rename")
+    monkeypatch.undo()
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert json.loads(before) == sample_tools[:2]
+
+    # A leftover temp file does not get in the way of the next append
+    assert store.append(sample_tools[2:]) == 1
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == sample_tools
+    print("Catalog store append crash OK")
+
+
+def test_columnar_roundtrip(tmp_path):
+    records = sample_tools + [{"id": "tool-4", "launch_year": "2020", "tags": ["a", 1], "company": None, "extra": {"x": 1}}, {}]
+    path = str(tmp_path / "tools.columns")
+    assert columnar.write_columnar(records, path) == len(records)
+    with columnar.CatalogTable(path) as table:
+        assert len(table) == len(records)
+        assert [record.to_dict() for record in table] == records
+        assert table[1].name == "Canva Pro" and table[-1].name is None
+        assert table.get(2, "platforms_supported") == ["Web", "Mobile"]
+        assert table.get(3, "launch_year") is None and table[3].extras["launch_year"] == "2020"
+    print("Catalog columnar round trip OK")
+
+
+def test_related_incremental():
+    embedder = related.hashing_embedder()
+    tools = [
+        {"id": f"tool-{i}", "name": name, "short_description": description, "tags": tags}
+        for i, (name, description, tags) in enumerate([
+            ("ChatGPT", "Conversational AI assistant for writing", ["chat", "writing"]),
+            ("Jasper", "AI writing assistant for marketing copy", ["writing", "marketing"]),
+            ("Canva", "Online graphic design platform", ["design", "images"]),
+            ("Kapwing", "Online video editor", ["video", "editing"]),
+            ("Descript", "Edit video by editing the transcript", ["video", "podcast"]),
+        ])
+    ]
+    full, stats = related.build_related(tools, embedder=embedder, k=2)
+    assert stats["embedded"] == 5
+    assert full.related("tool-3", 1)[0][0] == "tool-4" and full.related("missing") == []
+
+    changed = tools[1:] + [{"id": "tool-5", "name": "Writesonic", "short_description": "AI writing for marketing", "tags": ["writing"]}]
+    changed[0] = dict(changed[0], short_description="AI copywriting tool")
+    incremental, stats = related.build_related(changed, full, embedder, k=2)
+    assert stats["embedded"] == 2
+    rebuilt, _ = related.build_related(changed, embedder=embedder, k=2)
+    assert incremental.ids == rebuilt.ids
+    assert (incremental.neighbors == rebuilt.neighbors).all()
+    print("Catalog related tools OK")
+
+
+def test_synthetic_tools(tmp_path):
+    pool = len(synthetic.name_pool())
+    tools = list(synthetic.synthetic_tools(pool + 20, seed=7))
+    assert tools == list(synthetic.synthetic_tools(pool + 20, seed=7))
+    assert tools != list(synthetic.synthetic_tools(pool + 20, seed=8))
+    assert len({tool["slug"] for tool in tools}) == len(tools)
+    assert tools[pool]["name"].endswith(" 1") and tools[-1]["id"] == f"tool-{pool + 20}"
+
+    path = str(tmp_path / "tools.json")
+    assert synthetic.write_synthetic(path, 50, seed=7) == 50
+    assert list(CatalogStore(path)) == tools[:50]
+    print("Catalog synthetic generator OK")
@@ -0,0 +1,77 @@
+import html
+import json
+import os
+import sys
+import time
+
+import shared_utils
+
+# Compares the keyword tiers on the tool catalog descriptions.
+# Latency: per-call p50/p95 for each tier (after one warm-up call).
+# Quality: with KeyBERT as the reference, how many of the fast tier's
+# keywords it also picked (exact phrase, and at the word level).
+# Usage: python bench_keywords.py [n_texts] [top_n]
+TOOLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "tools.json")
+
+
+def load_texts(n):
+    with open(TOOLS_PATH, encoding="utf-8") as f:
+        tools = json.load(f)
+    texts = []
+    for tool in tools[:n]:
+        short = html.unescape(tool.get("short_description", ""))
+        full = html.unescape(tool.get("full_description", ""))
+        texts.append(f"{tool.get('name', '')}. {short} {full}".strip())
+    return texts
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def time_tier(texts, mode, top_n):
+    shared_utils.extract_keywords(texts[0], top_n=top_n, mode=mode)
+    timings = []
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(shared_utils.extract_keywords(text, top_n=top_n, mode=mode))
+        timings.append((time.perf_counter() - start) * 1000)
+    return results, {
+        "p50_ms": round(percentile(timings, 0.5), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+    }
+
+
+def agreement(candidate, reference):
+    phrase_hits = word_hits = 0
+    total = 0
+    for got, expected in zip(candidate, reference):
+        if not got or not expected:
+            continue
+        expected_words = {word for phrase in expected for word in phrase.split()}
+        phrase_hits += sum(1 for phrase in got if phrase in expected)
+        word_hits += sum(1 for phrase in got if set(phrase.split()) & expected_words)
+        total += len(got)
+    if not total:
+        return None
+    return {"phrase_precision": round(phrase_hits / total, 3), "word_precision": round(word_hits / total, 3)}
+
+
+if __name__ == "__main__":
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    texts = load_texts(n_texts)
+
+    report = {"texts": len(texts), "top_n": top_n}
+    fast, report["fast"] = time_tier(texts, "fast", top_n)
+    try:
+        semantic, report["semantic"] = time_tier(texts, "semantic", top_n)
+        if not any(semantic):
+            raise RuntimeError("KeyBERT returned no keywords (model unavailable?)")
+        report["fast_vs_semantic"] = agreement(fast, semantic)
+    except Exception as e:
+        report["semantic"] = {"error": str(e)}
+    print(json.dumps(report, indent=2))
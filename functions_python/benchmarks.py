@@ -0,0 +1,480 @@
+import argparse
+import html
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Benchmark harness for the process_text actions and the catalog tools.
+#
+# Every case runs in a fresh interpreter, so one case's caches and memory
+# high-water mark never leak into the next. A case is warmed up once, then
+# timed until it has BENCH_MIN_RUNS runs and BENCH_MIN_SECONDS of samples;
+# this repeats in BENCH_REPEATS processes and the fastest repeat (lowest
+# p50) is kept, which filters out most scheduler noise.
+# The report has p50/p95/p99 latency, throughput in the case's own unit
+# (bytes, items, records, queries) and the child's peak RSS.
+#
+# Inputs are generated from a seed: text corpora are sentences from the
+# catalog descriptions (1 KB -> 1 MB), histories are 10 -> 100k items, and
+# catalogs beyond data/tools.json come from catalog.synthetic (10x, 100x).
+#
+# Results are compared with benchmarks_baseline.json. A case regresses when
+# its p50 or peak RSS exceeds the baseline by more than the threshold (p95
+# and p99 are reported but too noisy to gate on). Any regression, or a case
+# the baseline has no numbers for, makes the run exit 1; a missing baseline
+# file exits 2.
+# Usage: python benchmarks.py [--full] [--filter clean_text] [--save-baseline]
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+TOOLS_PATH = os.path.join(ROOT, "data", "tools.json")
+BASELINE_PATH = os.environ.get("BENCH_BASELINE", os.path.join(HERE, "benchmarks_baseline.json"))
+BENCH_DIR = os.environ.get("BENCH_DIR", os.path.join(tempfile.gettempdir(), "creatoros-bench"))
+BENCH_SEED = int(os.environ.get("BENCH_SEED", 0))
+BENCH_MIN_RUNS = int(os.environ.get("BENCH_MIN_RUNS", 5))
+BENCH_MIN_SECONDS = float(os.environ.get("BENCH_MIN_SECONDS", 1.0))
+BENCH_MAX_RUNS = int(os.environ.get("BENCH_MAX_RUNS", 1000))
+# Fresh processes per case; the one with the lowest p50 is reported
+BENCH_REPEATS = int(os.environ.get("BENCH_REPEATS", 3))
+# Allowed slowdown/growth over the baseline before a case fails (0.25 = 25%)
+BENCH_THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", 0.25))
+# Latencies below this (ms) are too noisy to fail a run on
+BENCH_NOISE_FLOOR_MS = float(os.environ.get("BENCH_NOISE_FLOOR_MS", 0.05))
+
+TEXT_SIZES = {"1KB": 1 << 10, "10KB": 10 << 10, "100KB": 100 << 10, "1MB": 1 << 20}
+HISTORY_SIZES = {"10": 10, "1k": 1000, "10k": 10000, "100k": 100000}
+CATALOG_SCALES = {"1x": 1, "10x": 10, "100x": 100}
+# Sizes left out unless --full is given
+FULL_ONLY = {"1MB", "100k", "100x"}
+
+
+# ---- Inputs -----------------------------------------------------------------
+
+def _sentences():
+    with open(TOOLS_PATH, encoding="utf-8") as f:
+        tools = json.load(f)
+    sentences = []
+    for tool in tools:
+        for field in ("short_description", "full_description"):
+            sentences.extend(s.strip() + "." for s in html.unescape(tool.get(field, "")).split(".") if len(s.split()) > 3)
+    return sentences
+
+
+def corpus_text(size, seed=BENCH_SEED):
+    """
+    About size bytes of prose, in paragraphs of catalog sentences.
+    """
+    rng = random.Random(seed)
+    sentences = _sentences()
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = " ".join(rng.choice(sentences) for _ in range(rng.randint(3, 8)))
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def corpus_html(size, seed=BENCH_SEED):
+    """
+    About size bytes of page markup: headings, paragraphs, links and the
+    script/style blocks clean_text has to drop.
+    """
+    rng = random.Random(seed)
+    sentences = _sentences()
+    parts = ["<html><head><title>Benchmark</title><style>p { margin: 0 }</style></head><body>"]
+    length = len(parts[0])
+    while length < size:
+        kind = rng.random()
+        if kind < 0.1:
+            part = f"<h2>{rng.choice(sentences)}</h2>"
+        elif kind < 0.15:
+            part = "<script>window.dataLayer = window.dataLayer || []; dataLayer.push({event: 'view'});</script>"
+        elif kind < 0.3:
+            part = f"<p>{rng.choice(sentences)} <a href=\"/tools/{rng.randint(1, 1000)}\">{rng.choice(sentences)}</a></p>"
+        else:
+            part = "<p>" + " ".join(rng.choice(sentences) for _ in range(rng.randint(2, 6))) + "</p>"
+        parts.append(part)
+        length += len(part)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def history_items(count, seed=BENCH_SEED):
+    rng = random.Random(seed)
+    sentences = _sentences()
+    return [
+        {
+            "text": " ".join(rng.choice(sentences) for _ in range(rng.randint(1, 4))),
+            "type": rng.choice(("video", "short", "post", "newsletter")),
+            "date": f"{rng.randint(2019, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for _ in range(count)
+    ]
+
+
+def _import_catalog():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+def catalog_path(scale):
+    return os.path.join(BENCH_DIR, f"catalog-{scale}x-{BENCH_SEED}", "tools.json")
+
+
+def prepare_catalog(scale):
+    """
+    Writes the catalog for a scale (a copy of data/tools.json at 1x, a
+    seeded synthetic catalog otherwise) and its index and columnar sidecars.
+    Reused across runs; delete BENCH_DIR to regenerate.
+    """
+    _import_catalog()
+    from catalog.columnar import to_columnar
+    from catalog.index import build_sidecar
+    from catalog.synthetic import write_synthetic
+
+    path = catalog_path(scale)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".part"
+    if scale == 1:
+        shutil.copyfile(TOOLS_PATH, tmp)
+    else:
+        with open(TOOLS_PATH, encoding="utf-8") as f:
+            count = len(json.load(f)) * scale
+        write_synthetic(tmp, count, BENCH_SEED)
+    os.replace(tmp, path)
+    build_sidecar(path)
+    to_columnar(path)
+    return path
+
+
+def _queries(seed=BENCH_SEED):
+    rng = random.Random(seed)
+    words = [w for s in _sentences()[:2000] for w in s.lower().split() if len(w) > 4]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(1, 3))) for _ in range(256)]
+
+
+# ---- Cases ------------------------------------------------------------------
+# Each factory does its (untimed) setup and returns (units, unit name, run),
+# where run() performs one timed operation over `units` units.
+
+def _action_case(action, params=None, make_text=corpus_text):
+    def factory(size):
+        import dispatch
+
+        text = make_text(size)
+        return len(text.encode("utf-8")), "bytes", lambda: dispatch.run_action(action, text, params)
+    return factory
+
+
+def _semantic_keywords_case(size):
+    import importlib.util
+
+    # shared_utils falls back to [] without KeyBERT; don't time the error path
+    if importlib.util.find_spec("keybert") is None:
+        raise RuntimeError("keybert is not installed")
+    return _action_case("extract_keywords", {"mode": "semantic"})(size)
+
+
+def _history_case(count):
+    import dispatch
+
+    items = history_items(count)
+    return count, "items", lambda: dispatch.run_action("analyze_content_history", "", {"items": items})
+
+
+def _topics_case(count):
+    import dispatch
+
+    items = history_items(count)
+    return count, "items", lambda: dispatch.run_action("cluster_topics", "", {"items": items})
+
+
+def _topics_incremental_case(count):
+    # A dashboard load: TOPIC_BATCH_ITEMS new items on top of a fitted history
+    import topics
+
+    items = history_items(count + topics.TOPIC_BATCH_ITEMS)
+    state = topics.cluster_topics(items[:count])["model"]
+    new_items = items[count:]
+    return len(new_items), "items", lambda: topics.cluster_topics(new_items, model=state)
+
+
+def _catalog_json_case(scale):
+    _import_catalog()
+    from catalog.store import CatalogStore
+
+    path = catalog_path(scale)
+    records = sum(1 for _ in CatalogStore(path))
+    return records, "records", lambda: sum(1 for _ in CatalogStore(path))
+
+
+def _catalog_columnar_case(scale):
+    _import_catalog()
+    from catalog.columnar import CatalogTable, columnar_path_for
+
+    path = columnar_path_for(catalog_path(scale))
+
+    def run():
+        with CatalogTable(path) as table:
+            return table.get(len(table) // 2, "name")
+
+    with CatalogTable(path) as table:
+        return len(table), "records", run
+
+
+def _catalog_index_load_case(scale):
+    _import_catalog()
+    from catalog.index import load_index
+
+    path = catalog_path(scale)
+    return len(load_index(path)), "records", lambda: load_index(path)
+
+
+def _catalog_search_case(scale):
+    _import_catalog()
+    from catalog.index import load_index
+
+    index = load_index(catalog_path(scale))
+    queries = iter(_queries() * BENCH_MAX_RUNS)
+    return 1, "queries", lambda: index.search(next(queries), top_k=10)
+
+
+def _catalog_fuzzy_case(scale):
+    _import_catalog()
+    from catalog.fuzzy import FuzzyMatcher
+    from catalog.store import CatalogStore
+
+    matcher = FuzzyMatcher(list(CatalogStore(catalog_path(scale))))
+    rng = random.Random(BENCH_SEED)
+    # Misspelled names: one character dropped
+    typos = []
+    for name in rng.sample(matcher.names, min(len(matcher.names), 5000)):
+        if len(name) < 4:
+            continue
+        cut = rng.randrange(len(name))
+        typos.append(name[:cut] + name[cut + 1:])
+    queries = iter(typos * BENCH_MAX_RUNS)
+    return 1, "queries", lambda: matcher.lookup(next(queries))
+
+
+# group -> (sizes, factory(size value))
+GROUPS = {
+    "clean_text": (TEXT_SIZES, _action_case("clean_text", make_text=corpus_html)),
+    "readability": (TEXT_SIZES, _action_case("readability")),
+    "summarize": (TEXT_SIZES, _action_case("summarize")),
+    "extract_keywords/fast": (TEXT_SIZES, _action_case("extract_keywords", {"mode": "fast"})),
+    "extract_keywords/semantic": (TEXT_SIZES, _semantic_keywords_case),
+    "analyze_content_history": (HISTORY_SIZES, _history_case),
+    "cluster_topics": (HISTORY_SIZES, _topics_case),
+    "cluster_topics/incremental": (HISTORY_SIZES, _topics_incremental_case),
+    "catalog_load/json": (CATALOG_SCALES, _catalog_json_case),
+    "catalog_load/columnar": (CATALOG_SCALES, _catalog_columnar_case),
+    "catalog_load/index": (CATALOG_SCALES, _catalog_index_load_case),
+    "catalog_search/index": (CATALOG_SCALES, _catalog_search_case),
+    "catalog_search/fuzzy": (CATALOG_SCALES, _catalog_fuzzy_case),
+}
+
+
+def case_ids(full=False, pattern=None):
+    ids = []
+    for group, (sizes, _) in GROUPS.items():
+        for label in sizes:
+            case_id = f"{group}@{label}"
+            if (full or label not in FULL_ONLY) and (not pattern or pattern in case_id):
+                ids.append(case_id)
+    return ids
+
+
+def _peak_rss_mb():
+    # VmHWM resets on exec; ru_maxrss on Linux carries over the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def run_case(case_id):
+    """
+    Runs one case in this process and returns its measurements.
+    """
+    from bench_keywords import percentile
+
+    group, label = case_id.split("@")
+    sizes, factory = GROUPS[group]
+    units, unit, run = factory(sizes[label])
+    run()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < BENCH_MAX_RUNS and (len(timings) < BENCH_MIN_RUNS or time.perf_counter() - started < BENCH_MIN_SECONDS):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {
+        "runs": len(timings),
+        "units": units,
+        "unit": unit,
+        "p50_ms": round(percentile(timings, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 0.99) * 1000, 3),
+        "throughput": round(units * len(timings) / sum(timings), 1),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(case_id, repeats=BENCH_REPEATS):
+    best = None
+    for _ in range(max(1, repeats)):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", case_id], cwd=HERE, capture_output=True, text=True)
+        lines = out.stdout.strip().splitlines()
+        if out.returncode or not lines:
+            return {"error": (out.stderr.strip().splitlines() or ["no output"])[-1]}
+        result = json.loads(lines[-1])
+        if best is None or result["p50_ms"] < best["p50_ms"]:
+            best = result
+    return best
+
+
+# ---- Baseline ---------------------------------------------------------------
+
+def environment():
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count()}
+
+
+def compare(results, baseline, threshold=BENCH_THRESHOLD):
+    """
+    Returns [(case_id, metric, baseline, current)] for every regression.
+    """
+    regressions = []
+    for case_id, current in results.items():
+        previous = baseline.get("cases", {}).get(case_id)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in ("p50_ms", "peak_rss_mb"):
+            before, after = previous.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            if metric.endswith("_ms") and after < BENCH_NOISE_FLOOR_MS:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append((case_id, metric, before, after))
+    return regressions
+
+
+def unbaselined(results, baseline):
+    """
+    Measured cases the baseline has no numbers for (they can't regress).
+    """
+    cases = (baseline or {}).get("cases", {})
+    missing = []
+    for case_id, result in results.items():
+        previous = cases.get(case_id)
+        if "error" not in result and (not previous or "error" in previous):
+            missing.append(case_id)
+    return missing
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    baseline = load_baseline(path) or {"cases": {}}
+    baseline["environment"] = environment()
+    baseline["seed"] = BENCH_SEED
+    # Merge, so a filtered run only replaces the cases it measured
+    baseline["cases"].update({case_id: result for case_id, result in results.items() if "error" not in result})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _format_row(case_id, result, previous):
+    if "error" in result:
+        return f"{case_id:<40} ERROR {result['error']}"
+    change = ""
+    if previous and "p50_ms" in previous and previous["p50_ms"]:
+        change = f"{(result['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%"
+    rss = "-" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.0f}"
+    return (
+        f"{case_id:<40} {result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+        f"{result['throughput']:>14,.0f} {result['unit']:<8} {rss:>8} {change:>7}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the process_text actions and catalog tools.")
+    parser.add_argument("--full", action="store_true", help="include the largest sizes (1 MB text, 100k items, 100x catalog)")
+    parser.add_argument("--filter", help="only run cases whose id contains this string")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD, help="allowed regression over the baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--list", action="store_true", help="list case ids and exit")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case)))
+        sys.exit(0)
+
+    selected = case_ids(args.full, args.filter)
+    if args.list:
+        print("\n".join(selected))
+        sys.exit(0)
+
+    for label, scale in CATALOG_SCALES.items():
+        if any(case_id.startswith("catalog_") and case_id.endswith(f"@{label}") for case_id in selected):
+            prepare_catalog(scale)
+
+    baseline = load_baseline()
+    previous_cases = (baseline or {}).get("cases", {})
+    print(f"{'case':<40} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'throughput/s':>14} {'unit':<8} {'rss MB':>8} {'vs base':>7}")
+    results = {}
+    for case_id in selected:
+        results[case_id] = run_isolated(case_id)
+        print(_format_row(case_id, results[case_id], previous_cases.get(case_id)), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "seed": BENCH_SEED, "cases": results}, f, indent=2)
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        sys.exit(0)
+    # Nothing to compare against fails the gate rather than passing it
+    if baseline is None:
+        print(f"\nFAILED: no baseline at {BASELINE_PATH}; record one on the reference machine with --save-baseline.")
+        sys.exit(2)
+    if baseline.get("environment") != environment():
+        print(f"\nWarning: baseline was recorded on {baseline.get('environment')}, this is {environment()}")
+    missing = unbaselined(results, baseline)
+    for case_id in missing:
+        print(f"NO BASELINE {case_id}: not gated; add it with --save-baseline --filter {case_id}")
+    regressions = compare(results, baseline, args.threshold)
+    for case_id, metric, before, after in regressions:
+        print(f"REGRESSION {case_id} {metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%, threshold {args.threshold * 100:.0f}%)")
+    sys.exit(1 if regressions or missing else 0)
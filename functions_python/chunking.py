@@ -0,0 +1,256 @@
+import os
+import re
+
+import instrumentation
+
+# Token-bounded map-reduce for long inputs. A document is split on sentence
+# boundaries into windows of at most CHUNK_MAX_TOKENS tokens (tiktoken),
+# each window is processed independently, and the per-window results are
+# merged:
+#   keywords   reciprocal-rank fusion across windows, each window weighted
+#              by its share of the document's tokens
+#   summaries  hierarchical: each window is summarized, the summaries are
+#              joined and re-chunked until they fit one window, then that
+#              window is summarized
+# Work and memory per window are bounded, so cost grows linearly with the
+# document instead of with its square (TextRank) or the model's context.
+CHUNK_ENCODING = os.environ.get("CHUNK_ENCODING", "cl100k_base")
+# Keyword windows stay inside the sentence model's input limit (256
+# word pieces for all-MiniLM-L6-v2, about 1.3 word pieces per token here);
+# longer inputs used to be truncated by the model without notice
+CHUNK_MAX_TOKENS = int(os.environ.get("CHUNK_MAX_TOKENS", 192))
+# Keyword inputs up to this many tokens are processed in one piece; anything
+# longer would be truncated by the model, so it defaults to the window size
+CHUNK_MIN_TOKENS = int(os.environ.get("CHUNK_MIN_TOKENS", CHUNK_MAX_TOKENS))
+# TextRank handles a few thousand tokens well in one piece, so summaries
+# use larger windows and only chunk much longer inputs
+SUMMARY_WINDOW_TOKENS = int(os.environ.get("SUMMARY_WINDOW_TOKENS", 2048))
+SUMMARY_MIN_TOKENS = int(os.environ.get("SUMMARY_MIN_TOKENS", 8192))
+# Sentences ranked by the final summary pass, however much the levels above
+# managed to reduce (textrank.summarize samples evenly beyond this)
+SUMMARY_FINAL_SENTENCES = int(os.environ.get("SUMMARY_FINAL_SENTENCES", 200))
+# Characters of an item read by excerpt() per token of budget: English runs
+# about 4 characters per token, so the first window always fits
+EXCERPT_CHARS_PER_TOKEN = 8
+# Windows per KeyBERT call (bounds the candidate/embedding matrices)
+CHUNK_BATCH_WINDOWS = int(os.environ.get("CHUNK_BATCH_WINDOWS", 32))
+# Below this many windows a process pool costs more than it saves
+CHUNK_PARALLEL_MIN_WINDOWS = int(os.environ.get("CHUNK_PARALLEL_MIN_WINDOWS", 8))
+CHUNK_JOBS = int(os.environ.get("CHUNK_JOBS", 0)) or None
+# Reciprocal-rank fusion constant: larger values flatten rank differences
+RRF_K = 10
+# Vendored encodings (shared_utils.snapshot_models) are used when present
+TIKTOKEN_DIR = os.environ.get("TIKTOKEN_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "tiktoken"))
+
+# Fallback tokenizer: words and punctuation, close to BPE counts for English
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_encoding = None
+_encoding_failed = False
+
+
+def get_encoding():
+    """
+    The tiktoken encoding, or None if it can't be loaded (no network and
+    nothing vendored); token counts are then approximated.
+    """
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            if os.path.isdir(TIKTOKEN_DIR):
+                os.environ.setdefault("TIKTOKEN_CACHE_DIR", TIKTOKEN_DIR)
+            import tiktoken
+            _encoding = tiktoken.get_encoding(CHUNK_ENCODING)
+        except Exception as e:
+            # Don't retry a missing encoding on every request
+            _encoding_failed = True
+            instrumentation.fallback("chunking.get_encoding", e, "approximating token counts")
+    return _encoding
+
+
+def count_tokens(text):
+    encoding = get_encoding()
+    if encoding is None:
+        return len(_APPROX_TOKEN_RE.findall(text))
+    return len(encoding.encode_ordinary(text))
+
+
+def _count_many(texts):
+    encoding = get_encoding()
+    if encoding is None:
+        return [len(_APPROX_TOKEN_RE.findall(text)) for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+def needs_chunking(text, min_tokens=None):
+    """
+    True if text is over min_tokens (CHUNK_MIN_TOKENS). Short inputs are
+    ruled out by length alone, without tokenizing.
+    """
+    min_tokens = min_tokens or CHUNK_MIN_TOKENS
+    # A token is at least one character
+    if not text or len(text) <= min_tokens:
+        return False
+    return count_tokens(text) > min_tokens
+
+
+def _split_long_sentence(sentence, max_tokens):
+    # A sentence over the budget (e.g. an unpunctuated transcript) is cut
+    # between words
+    words = sentence.split()
+    pieces, current, used = [], [], 0
+    for word, tokens in zip(words, _count_many([" " + word for word in words])):
+        if current and used + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, used = [], 0
+        current.append(word)
+        used += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_windows(text, max_tokens=None):
+    """
+    Splits text into windows of whole sentences, each at most max_tokens
+    tokens. Returns [(window text, token count)] in document order.
+    """
+    import textrank
+
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    # Regex segmentation: linear and model-free, so it scales to any length
+    sentences = textrank.split_sentences(text, segmenter="regex")
+    windows = []
+    current, used = [], 0
+    for sentence, tokens in zip(sentences, _count_many(sentences)):
+        parts = [(sentence, tokens)]
+        if tokens > max_tokens:
+            parts = [(piece, count_tokens(piece)) for piece in _split_long_sentence(sentence, max_tokens)]
+        for part, part_tokens in parts:
+            if current and used + part_tokens > max_tokens:
+                windows.append((" ".join(current), used))
+                current, used = [], 0
+            current.append(part)
+            used += part_tokens
+    if current:
+        windows.append((" ".join(current), used))
+    return windows
+
+
+def parallel_map(fn, items, n_jobs=None):
+    """
+    [fn(item) for item in items], over a joblib process pool when there are
+    enough items and cores. fn must be a module-level function.
+    """
+    items = list(items)
+    if len(items) < CHUNK_PARALLEL_MIN_WINDOWS:
+        return [fn(item) for item in items]
+    try:
+        from joblib import Parallel, delayed, cpu_count
+
+        n_jobs = min(n_jobs or CHUNK_JOBS or cpu_count(), len(items))
+        if n_jobs <= 1:
+            return [fn(item) for item in items]
+        return Parallel(n_jobs=n_jobs, backend="loky")(delayed(fn)(item) for item in items)
+    except Exception as e:
+        instrumentation.fallback("chunking.parallel_map", e, "ran serially", degraded=False)
+        return [fn(item) for item in items]
+
+
+def fuse_keywords(ranked_lists, weights, top_n):
+    """
+    Merges per-window keyword rankings: each keyword scores
+    sum(weight / (RRF_K + rank)) over the windows that ranked it.
+    """
+    scores = {}
+    first_seen = {}
+    for keywords, weight in zip(ranked_lists, weights):
+        for rank, keyword in enumerate(keywords):
+            scores[keyword] = scores.get(keyword, 0.0) + weight / (RRF_K + rank)
+            first_seen.setdefault(keyword, len(first_seen))
+    # Ties keep document order
+    ranked = sorted(scores, key=lambda keyword: (-scores[keyword], first_seen[keyword]))
+    return ranked[:top_n]
+
+
+def _fast_window_keywords(args):
+    text, top_n = args
+    import fast_keywords
+    return fast_keywords.extract(text, top_n=top_n)
+
+
+def chunked_keywords(text, top_n=5, engine="keybert", windows=None):
+    """
+    Keywords for a long text: extracted per window, then fused. engine is
+    "yake" or "keybert" (see shared_utils.keyword_engine).
+    """
+    import shared_utils
+
+    windows = windows or split_windows(text)
+    texts = [window for window, _ in windows]
+    # Over-fetch per window so fusion has candidates beyond each window's top_n
+    per_window = top_n * 2
+    with instrumentation.stage(f"chunking.keywords.{engine}"):
+        if engine == "yake":
+            ranked = parallel_map(_fast_window_keywords, [(window, per_window) for window in texts])
+        else:
+            ranked = []
+            for start in range(0, len(texts), CHUNK_BATCH_WINDOWS):
+                ranked.extend(shared_utils.keybert_keywords_batch(texts[start:start + CHUNK_BATCH_WINDOWS], top_n=per_window))
+    instrumentation.count("chunking.windows", len(windows))
+    total = sum(tokens for _, tokens in windows) or 1
+    return fuse_keywords(ranked, [tokens / total for _, tokens in windows], top_n)
+
+
+def _summarize_window(args):
+    text, sentences_count = args
+    import textrank
+    return textrank.summarize(text, sentences_count=sentences_count, segmenter="regex")
+
+
+def chunked_summary(text, sentences_count=3, max_tokens=None):
+    """
+    Hierarchical extractive summary: summarize each window, join the
+    summaries and repeat until they fit in one window, then summarize that.
+    """
+    import textrank
+
+    max_tokens = max_tokens or SUMMARY_WINDOW_TOKENS
+    windows = split_windows(text, max_tokens)
+    levels = 0
+    with instrumentation.stage("chunking.summarize"):
+        while len(windows) > 1:
+            levels += 1
+            summaries = parallel_map(_summarize_window, [(window, sentences_count) for window, _ in windows])
+            joined = " ".join(summary for summary in summaries if summary)
+            next_windows = split_windows(joined, max_tokens)
+            if len(next_windows) >= len(windows):
+                # Summaries no shorter than their windows: stop reducing
+                windows = next_windows
+                break
+            windows = next_windows
+        # Bounded even when the levels stopped shrinking with several windows left
+        result = textrank.summarize(
+            " ".join(window for window, _ in windows), sentences_count=sentences_count,
+            max_sentences_considered=SUMMARY_FINAL_SENTENCES, segmenter="regex",
+        )
+    instrumentation.count("chunking.summary_levels", levels)
+    return result
+
+
+def excerpt(text, max_tokens):
+    """
+    The leading whole sentences of text that fit in max_tokens (at least
+    one window's worth of words if the first sentence is longer). Only a
+    bounded prefix is segmented, so the cost doesn't grow with the text.
+    """
+    if len(text) <= max_tokens:
+        return text
+    limit = max_tokens * EXCERPT_CHARS_PER_TOKEN
+    prefix = text[:limit]
+    windows = split_windows(prefix, max_tokens)
+    if not windows:
+        return ""
+    if len(windows) == 1 and len(text) > limit:
+        # The prefix ended inside the first window: drop the cut-off word
+        return windows[0][0].rsplit(None, 1)[0] if " " in windows[0][0] else windows[0][0]
+    return windows[0][0]
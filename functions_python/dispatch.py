@@ -0,0 +1,347 @@
+import chunking
+import history
+import instrumentation
+import microbatch
+import result_cache
+import shared_utils
+import topics
+
+# Upper bound on jobs accepted in one batch request
+MAX_BATCH_JOBS = 256
+
+ACTIONS = ("extract_keywords", "extract_keywords_batch", "summarize", "clean_text", "readability", "analyze_content_history", "cluster_topics")
+
+# Actions that take their input from params instead of "text"
+PARAMS_INPUT_ACTIONS = ("extract_keywords_batch", "analyze_content_history", "cluster_topics")
+# Actions whose result depends on state kept between calls (a creator's
+# topic model), so the same input can legitimately give a new result
+UNCACHED_ACTIONS = ("cluster_topics",)
+# Actions that accept an NDJSON stream of items
+STREAM_ACTIONS = ("analyze_content_history", "cluster_topics")
+
+
+def run_action(action, text, params=None):
+    """
+    Runs a single action and returns its result.
+    Raises ValueError for bad input (mapped to HTTP 400 by the caller).
+    """
+    params = params or {}
+    if not action or (not text and action not in PARAMS_INPUT_ACTIONS):
+        raise ValueError("Missing action or text")
+
+    if action == "extract_keywords":
+        # "mode": "fast" | "semantic" | "auto"; "latency_budget_ms" steers "auto"
+        top_n = params.get("top_n", 5)
+        if microbatch.MICROBATCH_ENABLED and shared_utils.keyword_engine(text, params.get("mode"), params.get("latency_budget_ms")) == "keybert" and not chunking.needs_chunking(text):
+            # Shares one KeyBERT pass with concurrent requests on this instance
+            # (long texts are chunked and batched on their own)
+            return microbatch.semantic_keywords(text, top_n=top_n)
+        return shared_utils.extract_keywords(text, top_n=top_n, mode=params.get("mode"), latency_budget_ms=params.get("latency_budget_ms"))
+    elif action == "extract_keywords_batch":
+        # Expects "texts": ["...", "..."]; returns one keyword list per text
+        texts = params.get("texts", [])
+        if not texts:
+            raise ValueError("No texts provided")
+        top_n = params.get("top_n", 5)
+        return shared_utils.extract_keywords_batch(texts, top_n=top_n, mode=params.get("mode"), latency_budget_ms=params.get("latency_budget_ms"))
+    elif action == "summarize":
+        sentences_count = params.get("sentences_count", 3)
+        max_sentences = params.get("max_sentences_considered")
+        return shared_utils.summarize_text(text, sentences_count=sentences_count, max_sentences_considered=max_sentences)
+    elif action == "clean_text":
+        return shared_utils.clean_text(text, max_chars=params.get("max_chars"))
+    elif action == "readability":
+        return shared_utils.score_readability(text)
+    elif action == "analyze_content_history":
+        return _analyze_content_history(_param_items(params), params)
+    elif action == "cluster_topics":
+        return _cluster_topics(_param_items(params), params)
+    raise ValueError("Invalid action")
+
+
+def _param_items(params):
+    items = params.get("items") or []
+    if not isinstance(items, list):
+        raise ValueError("items must be a list")
+    return items
+
+
+def _checked_items(items):
+    """
+    Yields history items, raising ValueError for malformed ones (such as a
+    non-object NDJSON line) so they are rejected with a 400.
+    """
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid item {index}: expected an object")
+        for field in ("text", "date", "type"):
+            if item.get(field) is not None and not isinstance(item[field], str):
+                raise ValueError(f"Invalid item {index}: {field} must be a string")
+        yield item
+
+
+def _analyze_content_history(items, params):
+    # "summary" is a previous result's summary, returned again (updated)
+    # when "include_summary" is set
+    return history.analyze_content_history(
+        _checked_items(items),
+        summary=params.get("summary"),
+        summaries=params.get("summaries"),
+        include_summary=bool(params.get("include_summary")),
+    )
+
+
+def _cluster_topics(items, params):
+    # "creator_id" selects the instance-cached model, "model" is a previous
+    # result's model; "update": false only assigns items to existing topics
+    return topics.cluster_topics(
+        _checked_items(items),
+        creator_id=params.get("creator_id"),
+        model=params.get("model"),
+        update=params.get("update", True),
+        top_n=params.get("top_n", topics.TOPIC_LABEL_TERMS),
+    )
+
+
+def _engine_meta(action, text, params):
+    """
+    Which keyword engine(s) a request resolves to, reported in _meta and part
+    of the cache key (so "auto" results follow policy changes). {} otherwise.
+    """
+    mode = params.get("mode")
+    budget = params.get("latency_budget_ms")
+    if action == "extract_keywords":
+        return {"engine": shared_utils.keyword_engine(text, mode, budget)}
+    if action == "extract_keywords_batch":
+        return {"engines": [shared_utils.keyword_engine(t, mode, budget) for t in params.get("texts") or []]}
+    return {}
+
+
+def _cache_key(action, text, params, engine_meta=None):
+    if engine_meta:
+        params = dict(params, _engine=engine_meta)
+    return result_cache.make_key(action, text, params, shared_utils.model_version(action))
+
+
+def _count_input(action, text, params):
+    if isinstance(text, str):
+        instrumentation.count("input_bytes", len(text.encode("utf-8")))
+    if action in PARAMS_INPUT_ACTIONS:
+        items = params.get("texts") if action == "extract_keywords_batch" else params.get("items")
+        if isinstance(items, list):
+            instrumentation.count("input_items", len(items))
+
+
+def _cache_meta(tier):
+    return {"hit": tier is not None, "tier": tier, "totals": result_cache.stats()}
+
+
+def process(action, text, params=None):
+    """
+    Runs a single action through the result cache.
+    Returns (result, meta) where meta carries the cache outcome.
+    """
+    params = params or {}
+    if not action or (not text and action not in PARAMS_INPUT_ACTIONS):
+        raise ValueError("Missing action or text")
+    if action not in ACTIONS:
+        raise ValueError("Invalid action")
+
+    _count_input(action, text, params)
+    if action in UNCACHED_ACTIONS:
+        with instrumentation.stage(f"action.{action}"):
+            result = run_action(action, text, params)
+        return result, {"cache": _cache_meta(None)}
+
+    with instrumentation.stage("cache_lookup"):
+        engine_meta = _engine_meta(action, text, params)
+        key = _cache_key(action, text, params, engine_meta)
+        hit, result, tier = result_cache.get(key)
+    instrumentation.count(f"cache.{tier or 'miss'}")
+    if not hit:
+        with instrumentation.stage(f"action.{action}"), instrumentation.watch_fallbacks() as fired:
+            result = run_action(action, text, params)
+        if fired:
+            # A fallback value (truncated text, echoed input, 0.0...) is
+            # returned to this caller but never served from the cache
+            instrumentation.count("cache.degraded")
+        else:
+            with instrumentation.stage("cache_store"):
+                result_cache.put(key, result)
+    meta = {"cache": _cache_meta(tier)}
+    if engine_meta:
+        meta["keywords"] = engine_meta
+    return result, meta
+
+
+def process_stream(lines):
+    """
+    Runs a streamed NDJSON request in constant memory. The first line is the
+    header {"action": ..., "params": {...}}; every following line is one item.
+    Only STREAM_ACTIONS support streaming. Returns (action, result, meta).
+    """
+    records = history.iter_ndjson(_counted_lines(lines))
+    header = next(records, None)
+    action = header.get("action") if isinstance(header, dict) else None
+    if action not in STREAM_ACTIONS:
+        raise ValueError(f"Streaming is only supported for {', '.join(STREAM_ACTIONS)}")
+    params = header.get("params") or {}
+    # The stream is parsed while it is processed, so this stage includes parsing
+    with instrumentation.stage(f"action.{action}"):
+        if action == "cluster_topics":
+            result = _cluster_topics(records, params)
+        else:
+            result = _analyze_content_history(records, params)
+    return action, result, {"streamed": True}
+
+
+def _counted_lines(lines):
+    for line in lines:
+        instrumentation.count("input_bytes", len(line))
+        instrumentation.count("input_lines")
+        yield line
+
+
+def _run_keywords_group(jobs, results, errors, degraded):
+    # Each extractor takes a single top_n per call, so sub-group on tier and top_n
+    by_tier = {}
+    for job_id, text, params in jobs:
+        engine = shared_utils.keyword_engine(text, params.get("mode"), params.get("latency_budget_ms"))
+        mode = "fast" if engine == "yake" else "semantic"
+        by_tier.setdefault((mode, params.get("top_n", 5)), []).append((job_id, text))
+
+    for (mode, top_n), group in by_tier.items():
+        texts = [text for _, text in group]
+        with instrumentation.watch_fallbacks() as fired:
+            keywords = shared_utils.extract_keywords_batch(texts, top_n=top_n, mode=mode)
+        for (job_id, _), kws in zip(group, keywords):
+            results[job_id] = kws
+            # One call serves the whole group, so a fallback taints all of it
+            if fired:
+                degraded.add(job_id)
+
+
+def _run_per_job_group(action, jobs, results, errors, degraded):
+    for job_id, text, params in jobs:
+        try:
+            with instrumentation.watch_fallbacks() as fired:
+                results[job_id] = run_action(action, text, params)
+        except Exception as e:
+            errors[job_id] = str(e)
+            continue
+        if fired:
+            degraded.add(job_id)
+
+
+_GROUP_RUNNERS = {
+    "extract_keywords": _run_keywords_group,
+}
+
+
+def run_batch(jobs):
+    """
+    Runs a list of {"id", "action", "text", "params"} jobs in one invocation.
+    Jobs are grouped by action so each model is called once over its group.
+    Returns {"results": {id: result}, "errors": {id: message}, "_meta": {...}};
+    jobs that aren't objects are reported in errors as "#<index>".
+    """
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError("Missing jobs")
+    if len(jobs) > MAX_BATCH_JOBS:
+        raise ValueError(f"Too many jobs (max {MAX_BATCH_JOBS})")
+
+    results = {}
+    errors = {}
+    groups = {}
+    seen_ids = set()
+
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            # "#<index>" can't be mistaken for a caller's id: those are
+            # checked against it below
+            errors[f"#{index}"] = "Invalid job"
+            seen_ids.add(f"#{index}")
+            continue
+        job_id = str(job.get("id", index))
+        action = job.get("action")
+        text = job.get("text")
+        params = job.get("params") or {}
+
+        if job_id in seen_ids:
+            raise ValueError(f"Duplicate job id: {job_id}")
+        seen_ids.add(job_id)
+        if not action or (not text and action not in PARAMS_INPUT_ACTIONS):
+            errors[job_id] = "Missing action or text"
+            continue
+        if action not in ACTIONS:
+            errors[job_id] = "Invalid action"
+            continue
+        groups.setdefault(action, []).append((job_id, text, params))
+
+    instrumentation.count("jobs", len(jobs))
+    for action, group in groups.items():
+        for _, text, params in group:
+            _count_input(action, text, params)
+
+    # Serve what we can from the cache; only misses reach the models
+    keys = {}
+    engines = {}
+    hits = 0
+    for action in list(groups):
+        if action in UNCACHED_ACTIONS:
+            continue
+        pending = []
+        for job_id, text, params in groups[action]:
+            try:
+                engine_meta = _engine_meta(action, text, params)
+            except ValueError as e:
+                errors[job_id] = str(e)
+                continue
+            if engine_meta:
+                engines[job_id] = engine_meta
+            with instrumentation.stage("cache_lookup"):
+                key = _cache_key(action, text, params, engine_meta)
+                hit, value, tier = result_cache.get(key)
+            instrumentation.count(f"cache.{tier or 'miss'}")
+            if hit:
+                results[job_id] = value
+                hits += 1
+            else:
+                keys[job_id] = key
+                pending.append((job_id, text, params))
+        if pending:
+            groups[action] = pending
+        else:
+            del groups[action]
+
+    # Jobs whose result came from a fallback; returned but not cached
+    degraded = set()
+    for action, group in groups.items():
+        runner = _GROUP_RUNNERS.get(action)
+        try:
+            with instrumentation.stage(f"action.{action}"):
+                if runner:
+                    runner(group, results, errors, degraded)
+                else:
+                    _run_per_job_group(action, group, results, errors, degraded)
+        except Exception as e:
+            for job_id, _, _ in group:
+                if job_id not in results:
+                    errors[job_id] = str(e)
+
+    with instrumentation.stage("cache_store"):
+        for job_id, key in keys.items():
+            if job_id in results and job_id not in degraded:
+                result_cache.put(key, results[job_id])
+    if degraded:
+        instrumentation.count("cache.degraded", len(degraded))
+
+    instrumentation.count("job_errors", len(errors))
+    meta = {"cache": {"hits": hits, "misses": len(keys), "totals": result_cache.stats()}}
+    if engines:
+        meta["keywords"] = engines
+    return {
+        "results": results,
+        "errors": errors,
+        "_meta": meta,
+    }
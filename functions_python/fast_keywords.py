@@ -0,0 +1,37 @@
+from functools import lru_cache
+
+# Statistical keyword tier (YAKE). Candidates are scored from in-document
+# features only (position, frequency, casing, spread across sentences), so
+# there is no model to load and short inputs take a few milliseconds.
+# Output is shaped like the KeyBERT tier: lowercased 1-2 word phrases, best first.
+MAX_NGRAM = 2
+# YAKE drops candidates more similar than this to a better-ranked one
+DEDUP_THRESHOLD = 0.9
+LANGUAGE = "en"
+
+
+@lru_cache(maxsize=16)
+def _get_extractor(top_n):
+    import yake
+    # Over-fetch so lowercasing duplicates away still leaves top_n phrases
+    return yake.KeywordExtractor(lan=LANGUAGE, n=MAX_NGRAM, dedupLim=DEDUP_THRESHOLD, top=top_n * 2)
+
+
+def extract(text, top_n=5):
+    """
+    Returns up to top_n keyphrases for one text.
+    """
+    if not text or not text.strip():
+        return []
+    keywords = []
+    for phrase, _ in _get_extractor(top_n).extract_keywords(text):
+        phrase = phrase.lower()
+        if phrase not in keywords:
+            keywords.append(phrase)
+        if len(keywords) == top_n:
+            break
+    return keywords
+
+
+def extract_many(texts, top_n=5):
+    return [extract(text, top_n) for text in texts]
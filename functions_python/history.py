@@ -0,0 +1,247 @@
+import chunking
+import json
+import random
+import re
+import shared_utils
+from collections import Counter
+
+# Max snippets kept for keyword extraction. Histories up to this size are
+# sampled in full, so their keywords match the non-streaming implementation.
+KEYWORD_SAMPLE_SIZE = 500
+# Tokens of each item kept in the keyword sample: its leading whole sentences
+# (the sample is persisted in summaries, so it stays bounded). Term counts
+# use the full text.
+KEYWORD_SNIPPET_TOKENS = 128
+# Items buffered per readability batch (bounds memory while letting
+# shared_utils.score_readability_many use a process pool)
+READABILITY_CHUNK_ITEMS = 4096
+# Max distinct candidate terms tracked (Misra-Gries heavy hitters)
+TERM_CAPACITY = 1000
+
+# Bump when the summary layout changes; older summaries are rejected
+SUMMARY_VERSION = 1
+
+_TERM_RE = re.compile(r"[a-z][a-z0-9']{2,}")
+
+
+class HistoryAggregator:
+    """
+    One-pass, constant-memory aggregation of a creator's content history.
+    Counters and readability sums are exact; keyword extraction runs on a
+    bounded reservoir sample of item snippets.
+    """
+
+    def __init__(self, sample_size=KEYWORD_SAMPLE_SIZE, seed=0):
+        self.total = 0
+        self.type_counts = Counter()
+        self.daily_counts = Counter()
+        self.monthly_counts = Counter()
+        self.yearly_counts = Counter()
+        self.readability_sum = 0.0
+        self.readability_count = 0
+        self.sample_size = sample_size
+        self.sample = []
+        self.sample_seen = 0
+        self.term_counts = Counter()
+        self._rng = random.Random(seed)
+
+    def add(self, item, readability=None):
+        item_text = item.get("text", "")
+        item_type = item.get("type", "unknown")
+        item_date = item.get("date", "")
+
+        self.total += 1
+        self.type_counts[item_type] += 1
+
+        # Date buckets from the ISO prefix: YYYY-MM-DD / YYYY-MM / YYYY
+        if isinstance(item_date, str) and len(item_date) >= 10:
+            self.daily_counts[item_date[:10]] += 1
+            self.monthly_counts[item_date[:7]] += 1
+            self.yearly_counts[item_date[:4]] += 1
+
+        if item_text:
+            if readability is None:
+                readability = shared_utils.score_readability(item_text)
+            self.readability_sum += readability
+            self.readability_count += 1
+            self._sample_snippet(chunking.excerpt(item_text, KEYWORD_SNIPPET_TOKENS))
+            self._count_terms(item_text)
+
+    def add_many(self, items):
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= READABILITY_CHUNK_ITEMS:
+                self._add_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._add_chunk(chunk)
+        return self
+
+    def _add_chunk(self, items):
+        # Score the chunk's texts together, then fold items in order
+        texts = [item.get("text", "") for item in items]
+        scores = iter(shared_utils.score_readability_many([text for text in texts if text]))
+        for item, text in zip(items, texts):
+            self.add(item, readability=next(scores) if text else None)
+
+    def _sample_snippet(self, snippet):
+        # Reservoir sampling (Algorithm R); seeded so results are reproducible
+        self.sample_seen += 1
+        if len(self.sample) < self.sample_size:
+            self.sample.append(snippet)
+        else:
+            slot = self._rng.randrange(self.sample_seen)
+            if slot < self.sample_size:
+                self.sample[slot] = snippet
+
+    def _count_terms(self, text):
+        # Document frequency of candidate terms, bounded with Misra-Gries
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        for term in set(_TERM_RE.findall(text.lower())):
+            if term not in ENGLISH_STOP_WORDS:
+                self.term_counts[term] += 1
+        if len(self.term_counts) > TERM_CAPACITY:
+            self._prune_terms()
+
+    def _prune_terms(self):
+        counts = sorted(self.term_counts.values(), reverse=True)
+        floor = counts[TERM_CAPACITY]
+        self.term_counts = Counter({term: count - floor for term, count in self.term_counts.items() if count > floor})
+
+    def merge(self, other):
+        """
+        Folds another aggregator (or summary dict) into this one, as if its
+        items had been added here. Counts are exact; the keyword sample is a
+        seen-weighted merge of both reservoirs.
+        """
+        if isinstance(other, dict):
+            other = HistoryAggregator.from_summary(other)
+        self.total += other.total
+        self.type_counts.update(other.type_counts)
+        self.daily_counts.update(other.daily_counts)
+        self.monthly_counts.update(other.monthly_counts)
+        self.yearly_counts.update(other.yearly_counts)
+        self.readability_sum += other.readability_sum
+        self.readability_count += other.readability_count
+
+        self.term_counts.update(other.term_counts)
+        if len(self.term_counts) > TERM_CAPACITY:
+            self._prune_terms()
+
+        seen = self.sample_seen + other.sample_seen
+        if len(self.sample) + len(other.sample) <= self.sample_size:
+            # Nothing was dropped on either side; keep every snippet in order
+            self.sample = self.sample + other.sample
+        else:
+            # Draw without replacement, picking each side in proportion to
+            # the number of snippets it stands for
+            mine, theirs = list(self.sample), list(other.sample)
+            self._rng.shuffle(mine)
+            self._rng.shuffle(theirs)
+            weight_mine = self.sample_seen / len(mine) if mine else 0
+            weight_theirs = other.sample_seen / len(theirs) if theirs else 0
+            merged = []
+            while len(merged) < self.sample_size and (mine or theirs):
+                left = len(mine) * weight_mine
+                right = len(theirs) * weight_theirs
+                if theirs and (not mine or self._rng.random() * (left + right) >= left):
+                    merged.append(theirs.pop())
+                else:
+                    merged.append(mine.pop())
+            self.sample = merged
+        self.sample_seen = seen
+        return self
+
+    def to_summary(self):
+        """
+        Serializable state; feed it back with new items via from_summary/merge.
+        """
+        return {
+            "version": SUMMARY_VERSION,
+            "total": self.total,
+            "type_counts": dict(self.type_counts),
+            "daily": dict(self.daily_counts),
+            "monthly": dict(self.monthly_counts),
+            "yearly": dict(self.yearly_counts),
+            "readability_sum": self.readability_sum,
+            "readability_count": self.readability_count,
+            "sample_size": self.sample_size,
+            "sample": list(self.sample),
+            "sample_seen": self.sample_seen,
+            "term_counts": dict(self.term_counts),
+        }
+
+    @classmethod
+    def from_summary(cls, summary):
+        if not isinstance(summary, dict) or summary.get("version") != SUMMARY_VERSION:
+            raise ValueError("Unsupported history summary")
+        aggregator = cls(sample_size=summary.get("sample_size", KEYWORD_SAMPLE_SIZE))
+        aggregator.total = summary["total"]
+        aggregator.type_counts = Counter(summary["type_counts"])
+        aggregator.daily_counts = Counter(summary["daily"])
+        aggregator.monthly_counts = Counter(summary["monthly"])
+        aggregator.yearly_counts = Counter(summary["yearly"])
+        aggregator.readability_sum = summary["readability_sum"]
+        aggregator.readability_count = summary["readability_count"]
+        aggregator.sample = list(summary["sample"])
+        aggregator.sample_seen = summary["sample_seen"]
+        aggregator.term_counts = Counter(summary["term_counts"])
+        # Continue the reservoir deterministically from where it left off
+        aggregator._rng = random.Random(aggregator.sample_seen)
+        return aggregator
+
+    def result(self, top_n=10):
+        avg_readability = self.readability_sum / self.readability_count if self.readability_count else 0
+
+        combined_text = ". ".join(self.sample)
+        top_keywords = shared_utils.extract_keywords(combined_text, top_n=top_n, mode="semantic") if combined_text else []
+
+        return {
+            "total": self.total,
+            "type_breakdown": dict(self.type_counts),
+            "frequency_stats": {
+                "daily": dict(self.daily_counts),
+                "monthly": dict(self.monthly_counts),
+                "yearly": dict(self.yearly_counts)
+            },
+            "avg_readability": round(avg_readability, 2),
+            "top_keywords": top_keywords,
+            # Ties by term, so merged and resumed summaries rank alike
+            "top_terms": [term for term, _ in sorted(self.term_counts.items(), key=lambda entry: (-entry[1], entry[0]))[:top_n]],
+        }
+
+
+def iter_ndjson(lines):
+    """
+    Yields one object per non-blank NDJSON line (bytes or str).
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def analyze_content_history(items, summary=None, summaries=None, include_summary=False):
+    """
+    Aggregates type, date and readability stats over a creator's content history.
+    Expects items: [{"text": "...", "date": "...", "type": "..."}] (any iterable).
+    summary is a previous result's "summary" to extend with only the new
+    items; summaries are partial summaries (e.g. computed in parallel) to merge.
+    With include_summary the result carries the updated "summary" for the
+    caller to persist (it holds the keyword sample, so it can run to
+    hundreds of KB; callers that don't persist it shouldn't ask).
+    """
+    aggregator = HistoryAggregator.from_summary(summary) if summary else HistoryAggregator()
+    for partial in summaries or []:
+        aggregator.merge(partial)
+    aggregator.add_many(items or [])
+    if not aggregator.total:
+        raise ValueError("No items provided")
+    result = aggregator.result()
+    if include_summary:
+        result["summary"] = aggregator.to_summary()
+    return result
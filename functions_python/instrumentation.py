@@ -0,0 +1,253 @@
+import contextvars
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+# Per-request instrumentation. request() opens a context that stage(),
+# count(), event() and fallback() record into (through a ContextVar, so
+# nested helpers need no extra arguments); outside a request they are no-ops,
+# except that fallback() always logs. When the request ends, one structured
+# log line is printed:
+#   {"event": "request", "request_id": ..., "action": ..., "status": ...,
+#    "wall_ms": ..., "cpu_ms": ..., "stages": {name: {"wall_ms", "cpu_ms",
+#    "calls"}}, "counters": {...}, "events": [...]}
+# Stage timings are inclusive, so nested stages also count toward their parent.
+# Standard library only: every process_text instance imports this module.
+
+# "1" adds the timings block to every response; a request can also ask for it
+# with "timings": true
+RESPONSE_TIMINGS = os.environ.get("RESPONSE_TIMINGS", "0") == "1"
+# Fraction of requests run under cProfile, and how many profiles one
+# instance writes at most
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_MAX = int(os.environ.get("PROFILE_MAX", 1))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "process_text_profiles"))
+# Events kept per request (model loads, fallbacks...); the rest are counted only
+MAX_EVENTS = 50
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+# Innermost watch_fallbacks() list, set whether or not a request is open
+_watch = contextvars.ContextVar("fallback_watch", default=None)
+# Profile slots taken, reserved before profiling starts so concurrent
+# sampled requests can't exceed PROFILE_MAX
+_profiles_reserved = 0
+_profile_lock = threading.Lock()
+_active = 0
+_active_lock = threading.Lock()
+
+
+class RequestMetrics:
+    def __init__(self, action=None, request_id=None):
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.action = action
+        self.status = "ok"
+        self.stages = {}
+        self.counters = Counter()
+        self.events = []
+        self.profile_path = None
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self.wall_ms = None
+        self.cpu_ms = None
+
+    def add_stage(self, name, wall, cpu):
+        stage = self.stages.setdefault(name, {"wall_ms": 0.0, "cpu_ms": 0.0, "calls": 0})
+        stage["wall_ms"] += wall * 1000
+        stage["cpu_ms"] += cpu * 1000
+        stage["calls"] += 1
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self._wall) * 1000
+        self.cpu_ms = (time.process_time() - self._cpu) * 1000
+
+    def timings(self):
+        """
+        The response's _timings block (so far, if the request is still running).
+        """
+        wall_ms = self.wall_ms if self.wall_ms is not None else (time.perf_counter() - self._wall) * 1000
+        cpu_ms = self.cpu_ms if self.cpu_ms is not None else (time.process_time() - self._cpu) * 1000
+        return {
+            "request_id": self.request_id,
+            "wall_ms": _round(wall_ms),
+            "cpu_ms": _round(cpu_ms),
+            "stages": {name: {key: _round(value) for key, value in stage.items()} for name, stage in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def log_record(self):
+        record = {"event": "request", "action": self.action, "status": self.status, **self.timings()}
+        if self.events:
+            record["events"] = self.events
+        if self.profile_path:
+            record["profile"] = self.profile_path
+        return record
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def current():
+    return _current.get()
+
+
+def active_requests():
+    """
+    Instrumented requests currently in flight in this process.
+    """
+    return _active
+
+
+def _reserve_profile():
+    """
+    Samples the request and, if picked, takes one of the PROFILE_MAX slots.
+    """
+    global _profiles_reserved
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        return False
+    with _profile_lock:
+        if _profiles_reserved >= PROFILE_MAX:
+            return False
+        _profiles_reserved += 1
+        return True
+
+
+def _release_profile():
+    global _profiles_reserved
+    with _profile_lock:
+        _profiles_reserved -= 1
+
+
+@contextmanager
+def request(action=None, request_id=None, profile=None):
+    """
+    Instruments one request. Yields its RequestMetrics; the log line is
+    printed on exit (status "error" if the block raised).
+    """
+    global _active
+    metrics = RequestMetrics(action, request_id)
+    token = _current.set(metrics)
+    with _active_lock:
+        _active += 1
+    profiler = None
+    # An explicit profile=True doesn't use up a sampling slot
+    reserved = profile is None and _reserve_profile()
+    if profile or reserved:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Only one profiler can be active at a time on newer Pythons
+            profiler = None
+            if reserved:
+                _release_profile()
+            fallback("instrumentation.request", e, "not profiled")
+    try:
+        yield metrics
+    except BaseException:
+        metrics.status = "error"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                # pstats format: snakeviz, `python -m pstats`, or flameprof/gprof2dot
+                metrics.profile_path = os.path.join(PROFILE_DIR, f"{metrics.action or 'request'}-{metrics.request_id}.prof")
+                profiler.dump_stats(metrics.profile_path)
+            except OSError as e:
+                metrics.profile_path = None
+                if reserved:
+                    # Nothing was written; let a later request use the slot
+                    _release_profile()
+                print(f"Error writing profile: {e}")
+        with _active_lock:
+            _active -= 1
+        metrics.finish()
+        _current.reset(token)
+        print(json.dumps(metrics.log_record(), default=str))
+
+
+@contextmanager
+def stage(name):
+    """
+    Times a block (wall and CPU) into the current request's stage name.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+def count(name, value=1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.counters[name] += value
+
+
+def event(name, **fields):
+    """
+    Records an event on the current request (counted, and kept up to MAX_EVENTS).
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.counters[f"event.{name}"] += 1
+    if len(metrics.events) < MAX_EVENTS:
+        metrics.events.append({"event": name, **fields})
+
+
+@contextmanager
+def watch_fallbacks():
+    """
+    Yields a list that collects the function names of degraded fallbacks
+    reported inside the block (nested watches also report to outer ones).
+    """
+    outer = _watch.get()
+    fired = []
+    token = _watch.set(fired)
+    try:
+        yield fired
+    finally:
+        _watch.reset(token)
+        if outer is not None:
+            outer.extend(fired)
+
+
+def fallback(function, error, note="", degraded=True):
+    """
+    Reports an error a function recovered from by returning a fallback value.
+    Always logs; inside a request it is also counted and attached as an event.
+    degraded=False marks fallbacks whose result is still exact (e.g. a pool
+    that ran serially); only degraded ones reach watch_fallbacks().
+    """
+    fired = _watch.get()
+    if degraded and fired is not None:
+        fired.append(function)
+    metrics = _current.get()
+    record = {"event": "fallback", "function": function, "error": f"{type(error).__name__}: {error}"}
+    if note:
+        record["note"] = note
+    if metrics is not None:
+        metrics.counters[f"fallback.{function}"] += 1
+        record["request_id"] = metrics.request_id
+        if len(metrics.events) < MAX_EVENTS:
+            metrics.events.append(record)
+    print(json.dumps(record))
+
+
+def wants_timings(flag=None):
+    return RESPONSE_TIMINGS or bool(flag)
@@ -1,108 +1,96 @@
 from firebase_functions import https_fn
+from firebase_functions.core import init
 from firebase_admin import initialize_app
-import shared_utils
+import dispatch
+import instrumentation
 import json
+import microbatch
+import os
+import result_cache
+import shared_utils
 
 initialize_app()
 
+# Comma-separated models to preload at instance init, e.g. "spacy,keybert,readability".
+# Empty by default so instances that only serve cheap actions start fast.
+WARM_START_MODELS = [m.strip() for m in os.environ.get("WARM_START_MODELS", "").split(",") if m.strip()]
+
+@init
+def warm_start():
+    # Drop cached results written by older model versions on this instance
+    result_cache.invalidate_if_models_changed(shared_utils.model_fingerprint())
+    if WARM_START_MODELS:
+        report = shared_utils.warm_up(WARM_START_MODELS)
+        print(json.dumps({"event": "warm_up", "models": report}))
+
+def _respond(payload, metrics, timings, status=200, headers=None):
+    # Serialization is timed but, as it produces the body, can't be in _timings
+    if timings:
+        payload["_timings"] = metrics.timings()
+    if status >= 500:
+        metrics.status = "error"
+    elif status == 429:
+        metrics.status = "overloaded"
+    elif status >= 400:
+        metrics.status = "bad_request"
+    with instrumentation.stage("serialize"):
+        body = json.dumps(payload)
+    instrumentation.count("output_bytes", len(body))
+    return https_fn.Response(body, status=status, headers=headers, mimetype="application/json")
+
 @https_fn.on_request()
 def process_text(req: https_fn.Request) -> https_fn.Response:
     """
     Unified endpoint for text processing utilities.
     Expects JSON body: {"action": "action_name", "text": "content", "params": {}}
-    Actions: "extract_keywords", "summarize", "clean_text", "readability"
+    or a batch: {"jobs": [{"id": "...", "action": "...", "text": "...", "params": {}}]}
+    or, for analyze_content_history and cluster_topics, an application/x-ndjson
+    stream whose first line is {"action": ..., "params": {}} and whose remaining
+    lines are items.
+    Actions: "extract_keywords", "extract_keywords_batch", "summarize", "clean_text", "readability",
+             "analyze_content_history", "cluster_topics"
+    Add "timings": true (or ?timings=1) for a _timings block with per-stage
+    wall/CPU times and counters; every request also logs them as one JSON line.
     """
-    try:
-        data = req.get_json()
-        action = data.get("action")
-        text = data.get("text")
-        params = data.get("params", {})
-
-        if not action or not text:
-            return https_fn.Response(json.dumps({"error": "Missing action or text"}), status=400, mimetype="application/json")
-
-        result = None
-        if action == "extract_keywords":
-            top_n = params.get("top_n", 5)
-            result = shared_utils.extract_keywords(text, top_n=top_n)
-        elif action == "summarize":
-            sentences_count = params.get("sentences_count", 3)
-            result = shared_utils.summarize_text(text, sentences_count=sentences_count)
-        elif action == "clean_text":
-            result = shared_utils.clean_text(text)
-        elif action == "readability":
-            result = shared_utils.score_readability(text)
-        elif action == "analyze_content_history":
-            # Expects "items": [{"text": "...", "date": "...", "type": "..."}]
-            items = params.get("items", [])
-            if not items:
-                return https_fn.Response(json.dumps({"error": "No items provided"}), status=400, mimetype="application/json")
-            
-            from collections import Counter
-            from datetime import datetime
-
-            total = len(items)
-            type_counts = Counter()
-            dates = []
-            readability_scores = []
-            all_text_for_keywords = []
-
-            for item in items:
-                item_text = item.get("text", "")
-                item_type = item.get("type", "unknown")
-                item_date = item.get("date", "")
-                
-                type_counts[item_type] += 1
-                if item_date:
-                    dates.append(item_date)
-                
-                if item_text:
-                    score = shared_utils.score_readability(item_text)
-                    readability_scores.append(score)
-                    # For keywords, sticking to titles/hooks might be faster than full scripts
-                    all_text_for_keywords.append(item_text[:200]) 
+    with instrumentation.request() as metrics:
+        timings = instrumentation.wants_timings(req.args.get("timings") == "1")
+        try:
+            if req.mimetype == "application/x-ndjson":
+                # Streamed history: header line, then one item per line
+                metrics.action = "stream"
+                try:
+                    metrics.action, result, meta = dispatch.process_stream(req.stream)
+                except ValueError as e:
+                    return _respond({"error": str(e)}, metrics, timings, status=400)
+                return _respond({"result": result, "_meta": meta}, metrics, timings)
 
-            avg_readability = sum(readability_scores) / len(readability_scores) if readability_scores else 0
-            
-            # Frequency Analysis
-            daily_counts = Counter()
-            monthly_counts = Counter()
-            yearly_counts = Counter()
+            with instrumentation.stage("parse"):
+                data = req.get_json()
+            instrumentation.count("request_bytes", req.content_length or 0)
+            timings = timings or instrumentation.wants_timings(data.get("timings"))
 
-            for date_str in dates:
+            if "jobs" in data:
+                metrics.action = "batch"
                 try:
-                    # Simple ISO parsing (take first 10 chars YYYY-MM-DD for safety if full parse fails)
-                    # But proper parsing is better. 
-                    if len(date_str) >= 10:
-                        day_key = date_str[:10] # YYYY-MM-DD
-                        month_key = date_str[:7] # YYYY-MM
-                        year_key = date_str[:4] # YYYY
-                        
-                        daily_counts[day_key] += 1
-                        monthly_counts[month_key] += 1
-                        yearly_counts[year_key] += 1
-                except Exception:
-                    continue
+                    batch = dispatch.run_batch(data.get("jobs"))
+                except ValueError as e:
+                    return _respond({"error": str(e)}, metrics, timings, status=400)
+                return _respond(batch, metrics, timings)
 
-            # Key extraction on combined text (limited sample)
-            combined_text = ". ".join(all_text_for_keywords)
-            top_keywords = shared_utils.extract_keywords(combined_text, top_n=10) if combined_text else []
+            action = data.get("action")
+            text = data.get("text")
+            params = data.get("params", {})
+            metrics.action = action
 
-            result = {
-                "total": total,
-                "type_breakdown": dict(type_counts),
-                "frequency_stats": {
-                    "daily": dict(daily_counts),
-                    "monthly": dict(monthly_counts),
-                    "yearly": dict(yearly_counts)
-                },
-                "avg_readability": round(avg_readability, 2),
-                "top_keywords": top_keywords,
-            }
-        else:
-            return https_fn.Response(json.dumps({"error": "Invalid action"}), status=400, mimetype="application/json")
+            try:
+                result, meta = dispatch.process(action, text, params)
+            except ValueError as e:
+                return _respond({"error": str(e)}, metrics, timings, status=400)
 
-        return https_fn.Response(json.dumps({"result": result}), mimetype="application/json")
+            return _respond({"result": result, "_meta": meta}, metrics, timings)
 
-    except Exception as e:
-        return https_fn.Response(json.dumps({"error": str(e)}), status=500, mimetype="application/json")
+        except microbatch.Overloaded as e:
+            return _respond({"error": str(e)}, metrics, timings, status=429, headers={"Retry-After": str(microbatch.RETRY_AFTER_S)})
+        except Exception as e:
+            instrumentation.count("errors")
+            return _respond({"error": str(e)}, metrics, timings, status=500)
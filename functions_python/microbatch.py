@@ -0,0 +1,139 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import instrumentation
+
+# In-process micro-batching for concurrent requests on one instance (used
+# when the function runs with concurrency > 1). Callers submit one item and
+# block; a worker thread collects items that share a key (e.g. top_n) and
+# runs them as one batch, such as one KeyBERT forward pass, then hands each
+# caller its own result.
+#
+# A batch is dispatched when it reaches MICROBATCH_MAX_SIZE items, when its
+# oldest item has waited MICROBATCH_MAX_WAIT_MS, or as soon as every request
+# in flight on the instance is already queued (nobody else can join, so a
+# lone request never pays the wait). Past MICROBATCH_MAX_QUEUE waiting items,
+# submit() raises Overloaded, which process_text turns into a 429.
+# A batch runs in a copy of its first caller's context, so the model's
+# stages, events and fallbacks are recorded on that caller's request.
+MICROBATCH_ENABLED = os.environ.get("MICROBATCH", "1") != "0"
+MICROBATCH_MAX_SIZE = int(os.environ.get("MICROBATCH_MAX_SIZE", 32))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("MICROBATCH_MAX_WAIT_MS", 10))
+MICROBATCH_MAX_QUEUE = int(os.environ.get("MICROBATCH_MAX_QUEUE", 256))
+# Upper bound on how long a caller waits for its batch to finish
+MICROBATCH_TIMEOUT_S = float(os.environ.get("MICROBATCH_TIMEOUT_S", 60))
+# Suggested client back-off on a 429
+RETRY_AFTER_S = 1
+
+
+class Overloaded(Exception):
+    """
+    The queue is full; the caller should retry later (HTTP 429).
+    """
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submit(key, item) calls into run(key, items) calls.
+    run must return one result per item, in order.
+    """
+
+    def __init__(self, run, max_size=MICROBATCH_MAX_SIZE, max_wait_ms=MICROBATCH_MAX_WAIT_MS, max_queue=MICROBATCH_MAX_QUEUE, waiting_peers=None):
+        self.run = run
+        self.max_size = max_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        # How many callers could still join a batch; defaults to the
+        # number of instrumented requests in flight
+        self.waiting_peers = waiting_peers or instrumentation.active_requests
+        self._pending = []
+        self._condition = threading.Condition()
+        self._worker = None
+        self.stats = {"batches": 0, "items": 0, "rejected": 0}
+
+    def submit(self, key, item):
+        """
+        Blocks until the item's batch has run; returns its result or raises
+        the batch's exception. Raises Overloaded when the queue is full.
+        """
+        future = Future()
+        with self._condition:
+            if len(self._pending) >= self.max_queue:
+                self.stats["rejected"] += 1
+                instrumentation.count("microbatch.rejected")
+                raise Overloaded(f"Too many queued requests (max {self.max_queue})")
+            self._pending.append((time.monotonic(), key, item, future, contextvars.copy_context()))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._loop, name="microbatch", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+        with instrumentation.stage("microbatch"):
+            result, size = future.result(timeout=MICROBATCH_TIMEOUT_S)
+        instrumentation.count("microbatch.batch_size", size)
+        return result
+
+    def _take_batch(self):
+        """
+        Waits until a batch is due and removes it from the queue.
+        Called with the condition held.
+        """
+        while True:
+            while not self._pending:
+                self._condition.wait()
+            arrived, key = self._pending[0][:2]
+            same_key = [entry for entry in self._pending if entry[1] == key]
+            remaining = arrived + self.max_wait - time.monotonic()
+            if len(same_key) >= self.max_size or remaining <= 0 or len(self._pending) >= self.waiting_peers():
+                batch = same_key[:self.max_size]
+                taken = {id(entry) for entry in batch}
+                self._pending = [entry for entry in self._pending if id(entry) not in taken]
+                return key, batch
+            self._condition.wait(remaining)
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                key, batch = self._take_batch()
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            context = batch[0][4]
+            try:
+                results = context.run(self.run, key, [entry[2] for entry in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+                for entry, result in zip(batch, results):
+                    entry[3].set_result((result, len(batch)))
+            except Exception as e:
+                for entry in batch:
+                    if not entry[3].done():
+                        entry[3].set_exception(e)
+
+
+_keyword_batcher = None
+_keyword_batcher_lock = threading.Lock()
+
+
+def _run_keyword_batch(top_n, texts):
+    import shared_utils
+    return shared_utils.keybert_keywords_batch(texts, top_n=top_n)
+
+
+def keyword_batcher():
+    """
+    The instance's batcher for KeyBERT keyword extraction, keyed by top_n.
+    """
+    global _keyword_batcher
+    with _keyword_batcher_lock:
+        if _keyword_batcher is None:
+            _keyword_batcher = MicroBatcher(_run_keyword_batch)
+    return _keyword_batcher
+
+
+def semantic_keywords(text, top_n=5):
+    """
+    KeyBERT keywords for one text, batched with concurrent callers.
+    """
+    return keyword_batcher().submit(top_n, text)
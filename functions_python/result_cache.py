@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import instrumentation
+
+# Two-tier result cache for process_text actions:
+#   1. a small in-process LRU (fast, lost on instance recycle)
+#   2. a size-bounded LRU on local disk via diskcache (survives across requests
+#      on the same instance; /tmp is the only writable path on Cloud Functions)
+CACHE_ENABLED = os.environ.get("RESULT_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "/tmp/process_text_cache")
+CACHE_SIZE_LIMIT = int(os.environ.get("RESULT_CACHE_SIZE_LIMIT", 256 * 1024 * 1024))
+CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", 7 * 24 * 3600))
+MEMORY_CACHE_ITEMS = int(os.environ.get("RESULT_CACHE_MEMORY_ITEMS", 512))
+
+# Bump to drop every entry written by an older key/value layout
+CACHE_SCHEMA = 1
+
+_FINGERPRINT_KEY = "__model_fingerprint__"
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+_disk = None
+_disk_failed = False
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def normalize_text(text):
+    """
+    Normalizes text for keying without changing any action's output:
+    line endings are unified and outer whitespace is dropped.
+    """
+    if not isinstance(text, str):
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def make_key(action, text, params, model_version):
+    """
+    Content-addressed key: sha256 over (schema, action, model version,
+    normalized text, canonical params).
+    """
+    payload = json.dumps(
+        [CACHE_SCHEMA, action, model_version, normalize_text(text), params or {}],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get_disk():
+    global _disk, _disk_failed
+    if _disk is None and not _disk_failed:
+        try:
+            import diskcache
+            _disk = diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT, eviction_policy="least-recently-used")
+        except Exception as e:
+            instrumentation.fallback("result_cache.open", e, f"disk tier disabled ({CACHE_DIR})")
+            _disk_failed = True
+    return _disk
+
+
+def invalidate_if_models_changed(fingerprint):
+    """
+    Clears the disk tier when the model fingerprint differs from the one the
+    cache was written with. Keys already embed the model version, so this only
+    reclaims space held by entries that can never hit again.
+    """
+    disk = _get_disk() if CACHE_ENABLED else None
+    if disk is None:
+        return False
+    try:
+        if disk.get(_FINGERPRINT_KEY) == fingerprint:
+            return False
+        disk.clear()
+        disk.set(_FINGERPRINT_KEY, fingerprint)
+    except Exception as e:
+        instrumentation.fallback("result_cache.invalidate", e)
+        return False
+    with _lock:
+        _memory.clear()
+    return True
+
+
+def get(key):
+    """
+    Returns (hit, value, tier) where tier is "memory", "disk" or None.
+    """
+    if not CACHE_ENABLED:
+        return False, None, None
+
+    now = time.time()
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                _memory.move_to_end(key)
+                _stats["memory_hits"] += 1
+                return True, value, "memory"
+            del _memory[key]
+
+    disk = _get_disk()
+    if disk is not None:
+        try:
+            value, expire_time = disk.get(key, default=None, expire_time=True)
+        except Exception as e:
+            instrumentation.fallback("result_cache.get", e)
+            value, expire_time = None, None
+        if value is not None:
+            _remember(key, value, expire_time or now + CACHE_TTL)
+            with _lock:
+                _stats["disk_hits"] += 1
+            return True, value, "disk"
+
+    with _lock:
+        _stats["misses"] += 1
+    return False, None, None
+
+
+def put(key, value):
+    """
+    Stores a result in both tiers. Empty results are not cached: they are
+    cheap to recompute. Callers must not store fallback values (see
+    instrumentation.watch_fallbacks); dispatch skips put for those.
+    """
+    if not CACHE_ENABLED or value is None or value == [] or value == "":
+        return
+    _remember(key, value, time.time() + CACHE_TTL)
+    disk = _get_disk()
+    if disk is not None:
+        try:
+            disk.set(key, value, expire=CACHE_TTL)
+        except Exception as e:
+            instrumentation.fallback("result_cache.put", e)
+
+
+def _remember(key, value, expires_at):
+    with _lock:
+        _memory[key] = (expires_at, value)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_ITEMS:
+            _memory.popitem(last=False)
+
+
+def stats():
+    """
+    Process-wide hit/miss counters since instance start.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    with _lock:
+        _memory.clear()
+        for name in _stats:
+            _stats[name] = 0
+    disk = _get_disk() if CACHE_ENABLED else None
+    if disk is not None:
+        disk.clear()
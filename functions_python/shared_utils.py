@@ -1,12 +1,14 @@
-import spacy
-import textstat
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.text_rank import TextRankSummarizer
-from keybert import KeyBERT
-from bs4 import BeautifulSoup
+import os
+import time
 import warnings
 
+import instrumentation
+
+# Heavy dependencies are imported inside the function that needs them, so each
+# action only pays for its own stack: clean_text -> lxml, readability ->
+# textstat, summarize -> sklearn/numpy, extract_keywords -> sklearn/numpy/keybert(torch).
+# Keep module-level imports to the standard library (see test_import_budget.py).
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
@@ -14,76 +16,371 @@ warnings.filterwarnings("ignore")
 _nlp = None
 _kw_model = None
 
-def get_nlp():
+# Model locations. When a vendored copy exists under MODELS_DIR it is loaded
+# from disk; otherwise the named package/hub model is used.
+MODELS_DIR = os.environ.get("MODELS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+SPACY_MODEL_PATH = os.environ.get("SPACY_MODEL_PATH", os.path.join(MODELS_DIR, "spacy", SPACY_MODEL))
+KEYBERT_MODEL = os.environ.get("KEYBERT_MODEL", "all-MiniLM-L6-v2")
+KEYBERT_MODEL_PATH = os.environ.get("KEYBERT_MODEL_PATH", os.path.join(MODELS_DIR, "keybert", KEYBERT_MODEL))
+# Whether a request may fetch a missing model from the network. Off by
+# default once vendored models are deployed (MODELS_DIR exists), so a cold
+# request never stalls on a download; ALLOW_MODEL_DOWNLOAD=1 opts back in.
+ALLOW_MODEL_DOWNLOAD = os.environ.get("ALLOW_MODEL_DOWNLOAD", "0" if os.path.isdir(MODELS_DIR) else "1") != "0"
+
+# Keyword tier when a request doesn't pick one: "semantic" (KeyBERT),
+# "fast" (YAKE, fast_keywords.py) or "auto" (see keyword_engine)
+KEYWORD_MODE = os.environ.get("KEYWORD_MODE", "semantic")
+KEYWORD_MODES = ("fast", "semantic", "auto")
+# In "auto", inputs up to this many words go to the fast tier...
+KEYWORD_FAST_MAX_WORDS = int(os.environ.get("KEYWORD_FAST_MAX_WORDS", 40))
+# ...as does any request whose latency budget (ms) is below this
+KEYWORD_SEMANTIC_MIN_BUDGET_MS = float(os.environ.get("KEYWORD_SEMANTIC_MIN_BUDGET_MS", 250))
+
+# "lxml" or "bs4" (html_clean.py)
+CLEAN_TEXT_BACKEND = os.environ.get("CLEAN_TEXT_BACKEND", "lxml")
+
+# "textrank" (textrank.py) or "sumy"
+SUMMARY_ENGINE = os.environ.get("SUMMARY_ENGINE", "textrank")
+
+# "fast" (readability_engines.py) or "textstat"
+READABILITY_ENGINE = os.environ.get("READABILITY_ENGINE", "fast")
+
+# Readability over many texts: below this count a process pool costs more to
+# start than it saves, so scoring stays serial. READABILITY_JOBS caps workers.
+PARALLEL_READABILITY_MIN_ITEMS = int(os.environ.get("PARALLEL_READABILITY_MIN_ITEMS", 1000))
+READABILITY_JOBS = int(os.environ.get("READABILITY_JOBS", 0)) or None
+
+# Model/algorithm identity per action, used to key cached results.
+# Bump the tag whenever an action's output changes for the same input.
+MODEL_VERSIONS = {
+    "extract_keywords": (f"keybert/{KEYBERT_MODEL}@2", ["keybert", "sentence-transformers", "yake", "tiktoken"]),
+    "extract_keywords_batch": (f"keybert/{KEYBERT_MODEL}@2", ["keybert", "sentence-transformers", "yake", "tiktoken"]),
+    "summarize": (f"summarize/{SUMMARY_ENGINE}@2", ["sumy", "scikit-learn", "spacy", "tiktoken"]),
+    "clean_text": (f"clean_text/{CLEAN_TEXT_BACKEND}@2", ["lxml", "beautifulsoup4"]),
+    "readability": (f"readability/{READABILITY_ENGINE}@1", ["textstat", "pyphen"]),
+    "analyze_content_history": (f"history/{KEYBERT_MODEL}/{READABILITY_ENGINE}@2", ["textstat", "pyphen", "keybert", "sentence-transformers", "tiktoken"]),
+    "cluster_topics": ("topics/hashing-minibatch-kmeans@1", ["scikit-learn", "numpy"]),
+}
+_model_version_cache = {}
+
+def model_version(action):
+    """
+    Returns the version string for an action: its tag plus the installed
+    versions of the packages it depends on.
+    """
+    if action not in _model_version_cache:
+        from importlib import metadata
+        tag, packages = MODEL_VERSIONS.get(action, ("unknown@0", []))
+        parts = [tag]
+        for package in packages:
+            try:
+                parts.append(f"{package}=={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                parts.append(f"{package}==missing")
+        _model_version_cache[action] = ";".join(parts)
+    return _model_version_cache[action]
+
+def model_fingerprint():
+    """
+    Combined version of every action, for whole-cache invalidation.
+    """
+    return "|".join(f"{action}={model_version(action)}" for action in sorted(MODEL_VERSIONS))
+
+def get_nlp(allow_download=None):
     global _nlp
     if _nlp is None:
-        try:
-            _nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            from spacy.cli import download
-            download("en_core_web_sm")
-            _nlp = spacy.load("en_core_web_sm")
+        start = time.perf_counter()
+        import spacy
+        if allow_download is None:
+            allow_download = ALLOW_MODEL_DOWNLOAD
+        if os.path.isdir(SPACY_MODEL_PATH):
+            _nlp = spacy.load(SPACY_MODEL_PATH)
+        else:
+            try:
+                _nlp = spacy.load(SPACY_MODEL)
+            except OSError:
+                if not allow_download:
+                    raise
+                from spacy.cli import download
+                download(SPACY_MODEL)
+                _nlp = spacy.load(SPACY_MODEL)
+        instrumentation.event("model_load", model="spacy", ms=round((time.perf_counter() - start) * 1000, 1))
     return _nlp
 
-def get_kw_model():
+def get_kw_model(allow_download=None):
     global _kw_model
     if _kw_model is None:
-        _kw_model = KeyBERT()
+        start = time.perf_counter()
+        from keybert import KeyBERT
+        if allow_download is None:
+            allow_download = ALLOW_MODEL_DOWNLOAD
+        if os.path.isdir(KEYBERT_MODEL_PATH):
+            _kw_model = KeyBERT(model=KEYBERT_MODEL_PATH)
+        elif allow_download:
+            _kw_model = KeyBERT(model=KEYBERT_MODEL)
+        else:
+            raise OSError(f"KeyBERT model not vendored at {KEYBERT_MODEL_PATH}")
+        instrumentation.event("model_load", model="keybert", ms=round((time.perf_counter() - start) * 1000, 1))
     return _kw_model
 
-def extract_keywords(text, top_n=5):
+def warm_up(models=("spacy", "keybert", "readability")):
+    """
+    Loads models from their vendored paths (never downloads) and runs one
+    tiny inference each so lazy init and buffer allocation happen before the
+    first real request. Returns per-model load/inference timings in ms.
+    """
+    report = {}
+    for name in models:
+        entry = {"ok": False}
+        try:
+            start = time.perf_counter()
+            if name == "spacy":
+                nlp = get_nlp(allow_download=False)
+                loaded = time.perf_counter()
+                nlp("Warm up the pipeline.")
+            elif name == "keybert":
+                model = get_kw_model(allow_download=False)
+                loaded = time.perf_counter()
+                model.model.embed(["Warm up the keyword model.", "keyword model"])
+            elif name == "yake":
+                import fast_keywords
+                loaded = time.perf_counter()
+                fast_keywords.extract("Warm up the fast keyword extractor.")
+            elif name in ("readability", "textstat"):
+                import readability_engines
+                loaded = time.perf_counter()
+                # First call loads the syllable dictionary
+                readability_engines.flesch_reading_ease("Warm up the readability scorer.")
+            else:
+                raise ValueError(f"Unknown model: {name}")
+            done = time.perf_counter()
+            entry = {
+                "ok": True,
+                "load_ms": round((loaded - start) * 1000, 1),
+                "inference_ms": round((done - loaded) * 1000, 1),
+            }
+        except Exception as e:
+            entry["error"] = str(e)
+        report[name] = entry
+    return report
+
+def snapshot_models(models_dir=None):
+    """
+    Saves the currently resolvable spaCy and KeyBERT models and the
+    tiktoken encoding under models_dir so deployments can vendor them and
+    load without network access.
+    """
+    import chunking
+    import tiktoken
+
+    models_dir = models_dir or MODELS_DIR
+    spacy_path = os.path.join(models_dir, "spacy", SPACY_MODEL)
+    keybert_path = os.path.join(models_dir, "keybert", KEYBERT_MODEL)
+    tiktoken_path = os.path.join(models_dir, "tiktoken")
+    get_nlp(allow_download=True).to_disk(spacy_path)
+    get_kw_model(allow_download=True).model.embedding_model.save(keybert_path)
+    # tiktoken caches the downloaded encoding in TIKTOKEN_CACHE_DIR
+    os.makedirs(tiktoken_path, exist_ok=True)
+    os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_path
+    tiktoken.get_encoding(chunking.CHUNK_ENCODING)
+    return {"spacy": spacy_path, "keybert": keybert_path, "tiktoken": tiktoken_path}
+
+def keyword_engine(text, mode=None, latency_budget_ms=None):
+    """
+    Resolves a keyword mode to the engine that will run: "yake" or "keybert".
+    "auto" picks yake for short inputs or tight latency budgets.
+    """
+    mode = mode or KEYWORD_MODE
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Invalid keyword mode: {mode}")
+    if mode == "fast":
+        return "yake"
+    if mode == "semantic":
+        return "keybert"
+    if latency_budget_ms is not None and latency_budget_ms < KEYWORD_SEMANTIC_MIN_BUDGET_MS:
+        return "yake"
+    if len(str(text).split()) <= KEYWORD_FAST_MAX_WORDS:
+        return "yake"
+    return "keybert"
+
+def extract_keywords(text, top_n=5, mode=None, latency_budget_ms=None):
+    """
+    Extracts keywords with KeyBERT or, depending on mode, YAKE.
+    """
+    return extract_keywords_batch([text], top_n=top_n, mode=mode, latency_budget_ms=latency_budget_ms)[0]
+
+def extract_keywords_batch(texts, top_n=5, mode=None, latency_budget_ms=None):
+    """
+    Extracts keywords for many documents, routing each to its tier
+    (keyword_engine). The KeyBERT share runs as one batch; texts over
+    chunking.CHUNK_MIN_TOKENS are processed window by window.
     """
-    Extracts keywords using KeyBERT.
+    import chunking
+
+    texts = list(texts)
+    engines = [keyword_engine(text, mode, latency_budget_ms) for text in texts]
+    results = [None] * len(texts)
+
+    # Long texts are split into token-bounded windows and fused (chunking.py)
+    for i, text in enumerate(texts):
+        if chunking.needs_chunking(text):
+            results[i] = chunking.chunked_keywords(text, top_n=top_n, engine=engines[i])
+            engines[i] = "chunked"
+
+    fast = [i for i, engine in enumerate(engines) if engine == "yake"]
+    if fast:
+        try:
+            import fast_keywords
+            with instrumentation.stage("keywords.yake"):
+                extracted = fast_keywords.extract_many([texts[i] for i in fast], top_n=top_n)
+            for i, keywords in zip(fast, extracted):
+                results[i] = keywords
+        except Exception as e:
+            instrumentation.fallback("extract_keywords_batch.yake", e)
+            for i in fast:
+                results[i] = []
+
+    semantic = [i for i, engine in enumerate(engines) if engine == "keybert"]
+    if semantic:
+        with instrumentation.stage("keywords.keybert"):
+            extracted = keybert_keywords_batch([texts[i] for i in semantic], top_n=top_n)
+        for i, keywords in zip(semantic, extracted):
+            results[i] = keywords
+    return results
+
+def keybert_keywords_batch(texts, top_n=5, keyphrase_ngram_range=(1, 2), stop_words='english'):
     """
+    Extracts keywords for many documents with one shared embedding pass.
+    Candidates for all documents come from a single CountVectorizer fit, the
+    documents and the union of candidates are embedded in one call, and each
+    document is scored with one NumPy cosine-similarity product.
+    Returns one keyword list per input text, in order (same ranking as
+    KeyBERT.extract_keywords without MMR/MaxSum).
+    """
+    texts = list(texts)
+    if not texts:
+        return []
     try:
+        from sklearn.feature_extraction.text import CountVectorizer
+        import numpy as np
+
+        try:
+            vectorizer = CountVectorizer(ngram_range=keyphrase_ngram_range, stop_words=stop_words).fit(texts)
+        except ValueError:
+            # Empty vocabulary: every document is blank or stop words only
+            return [[] for _ in texts]
+        candidates = vectorizer.get_feature_names_out().tolist()
+        doc_terms = vectorizer.transform(texts).tocsr()
+
         model = get_kw_model()
-        keywords = model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=top_n)
-        return [kw[0] for kw in keywords]
+        embeddings = np.asarray(model.model.embed(texts + candidates), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+        doc_embeddings = embeddings[:len(texts)]
+        candidate_embeddings = embeddings[len(texts):]
+
+        results = []
+        for i, doc_embedding in enumerate(doc_embeddings):
+            indices = doc_terms.indices[doc_terms.indptr[i]:doc_terms.indptr[i + 1]]
+            if len(indices) == 0:
+                results.append([])
+                continue
+            indices = np.sort(indices)
+            similarities = candidate_embeddings[indices] @ doc_embedding
+            top = similarities.argsort()[-top_n:][::-1]
+            results.append([candidates[indices[j]] for j in top])
+        return results
     except Exception as e:
-        print(f"Error in extract_keywords: {e}")
-        return []
+        instrumentation.fallback("keybert_keywords_batch", e)
+        return [[] for _ in texts]
 
-def summarize_text(text, sentences_count=3):
+def summarize_text(text, sentences_count=3, max_sentences_considered=None, engine=None):
     """
-    Summarizes text using Sumy (TextRank).
+    Summarizes text with TextRank (textrank.py: sparse TF-IDF graph and
+    NumPy power iteration), hierarchically for texts over
+    chunking.SUMMARY_MIN_TOKENS. engine="sumy" keeps the previous Sumy path.
     """
     try:
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        summarizer = TextRankSummarizer()
-        summary = summarizer(parser.document, sentences_count)
-        return " ".join([str(sentence) for sentence in summary])
+        if (engine or SUMMARY_ENGINE) == "sumy":
+            from sumy.parsers.plaintext import PlaintextParser
+            from sumy.nlp.tokenizers import Tokenizer
+            from sumy.summarizers.text_rank import TextRankSummarizer
+
+            parser = PlaintextParser.from_string(text, Tokenizer("english"))
+            summarizer = TextRankSummarizer()
+            summary = summarizer(parser.document, sentences_count)
+            return " ".join([str(sentence) for sentence in summary])
+
+        import chunking
+        import textrank
+        if max_sentences_considered is None and chunking.needs_chunking(text, chunking.SUMMARY_MIN_TOKENS):
+            return chunking.chunked_summary(text, sentences_count=sentences_count)
+        return textrank.summarize(text, sentences_count=sentences_count, max_sentences_considered=max_sentences_considered)
     except Exception as e:
-        print(f"Error in summarize_text: {e}")
+        instrumentation.fallback("summarize_text", e, "returned the first 500 characters")
         return text[:500] + "..." # Fallback
 
 def score_readability(text):
     """
-    Returns textstat reading ease score (Flesch Reading Ease).
+    Returns Flesch Reading Ease from the configured engine (see readability_engines.py).
     Returns float: 0-100 (higher is easier).
     """
     try:
-        return textstat.flesch_reading_ease(text)
+        import readability_engines
+        return readability_engines.flesch_reading_ease(text)
     except Exception as e:
-        print(f"Error in score_readability: {e}")
+        instrumentation.fallback("score_readability", e)
         return 0.0
 
-def clean_text(html_content):
+def readability_stats(text):
+    """
+    Returns Flesch Reading Ease, Flesch-Kincaid grade and word/sentence/
+    syllable counts from one pass of the configured readability engine.
+    """
+    try:
+        import readability_engines
+        return readability_engines.stats(text)
+    except Exception as e:
+        instrumentation.fallback("readability_stats", e)
+        return {"flesch_reading_ease": 0.0, "flesch_kincaid_grade": 0.0, "words": 0, "sentences": 0, "syllables": 0}
+
+def _score_readability_chunk(texts):
+    return [score_readability(text) for text in texts]
+
+def score_readability_many(texts, n_jobs=None):
+    """
+    Scores many texts, spreading chunks over a joblib process pool on
+    multi-core instances. Small inputs and single-core instances run
+    serially. Output order always matches input order.
+    """
+    texts = list(texts)
+    if len(texts) < PARALLEL_READABILITY_MIN_ITEMS:
+        return _score_readability_chunk(texts)
+    try:
+        from joblib import Parallel, delayed, cpu_count
+
+        n_jobs = min(n_jobs or READABILITY_JOBS or cpu_count(), len(texts))
+        if n_jobs <= 1:
+            return _score_readability_chunk(texts)
+        # A few chunks per worker keeps them balanced without per-item IPC
+        chunk_size = -(-len(texts) // (n_jobs * 4))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        scored = Parallel(n_jobs=n_jobs, backend="loky")(delayed(_score_readability_chunk)(chunk) for chunk in chunks)
+        return [score for chunk_scores in scored for score in chunk_scores]
+    except Exception as e:
+        instrumentation.fallback("score_readability_many", e, "scored serially", degraded=False)
+        return _score_readability_chunk(texts)
+
+def clean_text(html_content, max_chars=None, backend=None):
     """
-    Cleans HTML content using BeautifulSoup.
+    Cleans HTML content to visible text (html_clean.py). Script, style,
+    noscript and template subtrees are dropped. max_chars caps how much of
+    a very large page is parsed.
     """
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.extract()
-        text = soup.get_text()
-        # Break into lines and remove leading/trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        import html_clean
+        return html_clean.clean_html(html_content, backend=backend or CLEAN_TEXT_BACKEND, max_chars=max_chars)
     except Exception as e:
-        print(f"Error in clean_text: {e}")
+        instrumentation.fallback("clean_text", e, "returned the input unchanged")
         return html_content
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+# Import-time budget for the modules every process_text instance loads.
+# Cheap actions must not pay for the ML stack they never use.
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 250))
+HEAVY_MODULES = ["spacy", "keybert", "sentence_transformers", "torch", "sumy", "sklearn", "numpy", "textstat"]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import dispatch, result_cache, shared_utils
+imported = time.perf_counter()
+shared_utils.clean_text("<p>Hello</p>")
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({"import_ms": (imported - start) * 1000, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe():
+    # Fresh interpreter so nothing is already in sys.modules
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=HERE, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_import_budget():
+    # Best of three to keep filesystem cache noise out of the measurement
+    runs = [_probe() for _ in range(3)]
+    best = min(run["import_ms"] for run in runs)
+    print(f"Import time: {best:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    assert best <= IMPORT_BUDGET_MS, f"import took {best:.1f} ms, budget is {IMPORT_BUDGET_MS:.0f} ms"
+
+
+def test_cheap_action_skips_ml_stack():
+    heavy = _probe()["heavy"]
+    assert heavy == [], f"clean_text pulled in heavy modules: {heavy}"
+
+
+if __name__ == "__main__":
+    test_import_budget()
+    test_cheap_action_skips_ml_stack()
@@ -33,5 +33,474 @@ def test():
     except Exception as e:
         print(f"KeyBERT failed (likely missing model or dependencies in this env): {e}")
 
+    print("\nTesting extract_keywords_batch (KeyBERT, shared embedding pass)...")
+    try:
+        batch = shared_utils.extract_keywords_batch([sample_text, "Video editing tools for creators."], top_n=3)
+        print(f"Batch keywords: {batch}")
+    except Exception as e:
+        print(f"KeyBERT failed (likely missing model or dependencies in this env): {e}")
+
+golden_html = [
+    sample_html,
+    "<p>Fish &amp; chips &nbsp; &lt;tag&gt; caf&eacute; &#8212; done</p>",
+    "<!DOCTYPE html><!-- comment --><p>Visible<!-- hidden --> text</p>",
+    "<div>Unclosed <b>bold <i>italic</div> after",
+    "<ul>\n  <li>One</li>\n  <li>Two  Three</li>\n</ul>",
+    "<noscript>Enable JS</noscript><template><p>tpl</p></template><p>Body</p>",
+    "Plain text without tags\n\nSecond  paragraph",
+    "<style>p{}</style><p>x<br>y</p><table><tr><td>c1</td><td>c2</td></tr></table>",
+    "<p>NUL\x00byte and <![CDATA[ cdata ]]>sections</p>",
+]
+
+# Malformed input where the backends knowingly differ (see html_clean.py):
+# (html, lxml output, bs4 output)
+golden_divergent = [
+    ("<textarea><b>x</b></textarea>", "<b>x</b>", "x"),
+    ("<p>a &unknown; b</p>", "a &unknown; b", "a &unknown b"),
+    ("<p>before<!-- never closed</p>", "before", "before<!-- never closed</p>"),
+]
+
+# golden_html inputs whose output changed from the original clean_text, with
+# the original output: noscript text, CDATA sections and NULs are now dropped
+# (bs4 already left template contents out)
+baseline_changes = {
+    golden_html[5]: "Enable JSBody",
+    golden_html[8]: "NUL\x00byte and\ncdata sections",
+}
+
+def baseline_clean_text(html_content):
+    # The original BeautifulSoup implementation, verbatim
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+def test_clean_text_backends():
+    # The lxml backend must be byte-identical to the BeautifulSoup one
+    for html in golden_html:
+        fast = shared_utils.clean_text(html, backend="lxml")
+        reference = shared_utils.clean_text(html, backend="bs4")
+        assert fast == reference, (html, fast, reference)
+        # Same as the original implementation, apart from the listed changes
+        assert baseline_clean_text(html) == baseline_changes.get(html, reference), html
+    for html, lxml_text, bs4_text in golden_divergent:
+        assert shared_utils.clean_text(html, backend="lxml") == lxml_text, html
+        assert shared_utils.clean_text(html, backend="bs4") == bs4_text, html
+    print("clean_text backends agree on golden corpus")
+
+def test_keyword_tiers():
+    # "auto" sends short or latency-bound inputs to the fast tier
+    assert shared_utils.keyword_engine("fitness, cooking, travel", mode="auto") == "yake"
+    assert shared_utils.keyword_engine(sample_text * 20, mode="auto") == "keybert"
+    assert shared_utils.keyword_engine(sample_text * 20, mode="auto", latency_budget_ms=50) == "yake"
+    assert shared_utils.keyword_engine("anything", mode="semantic") == "keybert"
+    keywords = shared_utils.extract_keywords(sample_text, top_n=3, mode="fast")
+    print(f"Fast keywords: {keywords}")
+    assert 0 < len(keywords) <= 3
+
+def test_readability_engines():
+    # The fast engine must agree with textstat (see tolerance in readability_engines.py)
+    import readability_engines
+    texts = [sample_text, "Don't stop! We're going to the 'big' show... aren't we?", "", "Go -- now. A b - c. One two -- ... three!"]
+    for text in texts:
+        fast = readability_engines.flesch_reading_ease(text, engine="fast")
+        reference = readability_engines.flesch_reading_ease(text, engine="textstat")
+        assert readability_engines.stats(text, engine="fast")["flesch_reading_ease"] == fast
+        print(f"Readability fast={fast} textstat={reference}")
+        assert abs(fast - reference) < 1e-6
+
+def test_benchmark_baseline():
+    import benchmarks
+    assert "clean_text@1MB" not in benchmarks.case_ids()
+    assert "clean_text@1MB" in benchmarks.case_ids(full=True, pattern="clean_text")
+    baseline = {"cases": {"a@1": {"p50_ms": 10.0, "peak_rss_mb": 100.0}, "b@1": {"p50_ms": 0.01, "peak_rss_mb": 100.0}}}
+    results = {"a@1": {"p50_ms": 13.0, "peak_rss_mb": 101.0}, "b@1": {"p50_ms": 0.04, "peak_rss_mb": 100.0}, "c@1": {"error": "x"}}
+    # b@1 tripled but stays under the noise floor
+    assert benchmarks.compare(results, baseline, threshold=0.25) == [("a@1", "p50_ms", 10.0, 13.0)]
+    assert benchmarks.compare(results, baseline, threshold=0.5) == []
+    # Cases without baseline numbers are reported instead of silently passing
+    assert benchmarks.unbaselined(results, baseline) == []
+    assert benchmarks.unbaselined({"d@1": {"p50_ms": 1.0}}, baseline) == ["d@1"]
+    assert benchmarks.unbaselined({"d@1": {"p50_ms": 1.0}}, None) == ["d@1"]
+    print("Benchmark baseline comparison OK")
+
+def test_instrumentation():
+    import dispatch
+    import instrumentation
+    with instrumentation.request("clean_text") as metrics:
+        dispatch.process("clean_text", sample_html, {})
+        with instrumentation.stage("parse"):
+            pass
+        instrumentation.fallback("example", ValueError("boom"))
+    timings = metrics.timings()
+    print(f"Timings: {timings}")
+    assert {"parse", "cache_lookup"} <= set(timings["stages"])
+    assert timings["counters"]["input_bytes"] == len(sample_html.encode("utf-8"))
+    assert timings["counters"]["fallback.example"] == 1
+    assert metrics.status == "ok" and timings["wall_ms"] >= timings["stages"]["parse"]["wall_ms"]
+    # Outside a request, stages and counters are no-ops
+    with instrumentation.stage("parse"):
+        instrumentation.count("ignored")
+    assert instrumentation.current() is None
+
+def test_microbatch():
+    import threading
+    import time
+    import microbatch
+    sizes = []
+    def run(key, items):
+        sizes.append(len(items))
+        return [f"{key}:{item}" for item in items]
+    # Four concurrent callers with the same key share one batch
+    batcher = microbatch.MicroBatcher(run, max_size=4, max_wait_ms=2000, waiting_peers=lambda: 100)
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(5, i))) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sizes == [4] and results == {i: f"5:{i}" for i in range(4)}
+    # A full queue rejects new work instead of growing
+    batcher = microbatch.MicroBatcher(run, max_size=4, max_wait_ms=200, max_queue=2, waiting_peers=lambda: 100)
+    threads = [threading.Thread(target=batcher.submit, args=(5, i)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    while len(batcher._pending) < 2:
+        time.sleep(0.001)
+    try:
+        batcher.submit(5, "late")
+        assert False, "expected Overloaded"
+    except microbatch.Overloaded:
+        pass
+    for thread in threads:
+        thread.join()
+    assert batcher.stats == {"batches": 1, "items": 2, "rejected": 1}
+    # The batch's own instrumentation lands on the caller's request
+    import instrumentation
+    def instrumented(key, items):
+        with instrumentation.stage("model"):
+            instrumentation.event("model_load", model="test")
+        return items
+    batcher = microbatch.MicroBatcher(instrumented, max_wait_ms=0)
+    with instrumentation.request() as metrics:
+        assert batcher.submit(1, "x") == "x"
+    assert metrics.stages["model"]["calls"] == 1 and metrics.counters["event.model_load"] == 1
+    print("Micro-batching OK")
+
+def test_chunking():
+    import chunking
+    long_text = " ".join(f"Topic {i % 7} covers caching, batching and profiling in part {i}." for i in range(400))
+    windows = chunking.split_windows(long_text, max_tokens=64)
+    assert len(windows) > 1
+    for window, tokens in windows:
+        # Whole sentences only, each window within the budget
+        assert window.endswith(".") and tokens <= 64 and chunking.count_tokens(window) <= 64 + 2
+    assert chunking.excerpt(long_text, 64) == windows[0][0]
+    # Only a bounded prefix is read, so longer documents give the same excerpt
+    assert chunking.excerpt(long_text * 20, 64) == windows[0][0]
+    # Keywords ranked in heavier windows and in more windows come first
+    fused = chunking.fuse_keywords([["a", "b"], ["b", "c"], ["b"]], [0.5, 0.25, 0.25], top_n=3)
+    assert fused == ["b", "a", "c"]
+    summary = chunking.chunked_summary(long_text, sentences_count=2, max_tokens=256)
+    assert summary and len(chunking.split_windows(summary, 10 ** 6)) == 1 and summary.count(".") == 2
+    print("Chunking OK")
+
+def test_topics():
+    import dispatch
+    import random
+    import topics
+    rng = random.Random(0)
+    themes = [
+        "recipe pasta sauce garlic oven bake kitchen dinner",
+        "workout gym squat cardio muscle protein training reps",
+        "laptop review smartphone battery camera chip benchmark keyboard",
+    ]
+    def items(count, month):
+        return [{"text": " ".join(rng.sample(themes[i % 3].split(), 5)), "date": f"2026-{month:02d}-01"} for i in range(count)]
+    first = dispatch.run_action("cluster_topics", "", {"items": items(300, 1)})
+    assert len(first["topics"]) == 3 and sum(topic["size"] for topic in first["topics"]) == 300
+    # Each theme lands in its own topic
+    assert len({first["assignments"][i] for i in range(0, 300, 3)}) == 1
+    assert len(set(first["assignments"][:3])) == 3
+    # New items continue the persisted model instead of refitting
+    second = topics.cluster_topics(items(30, 2), model=first["model"])
+    assert second["assignments"][:3] == first["assignments"][:3]
+    assert sum(topic["size"] for topic in second["topics"]) == 330
+    # Assignment only leaves the model unchanged
+    third = topics.cluster_topics(items(3, 3), model=second["model"], update=False)
+    assert third["assignments"] == first["assignments"][:3] and third["model"] == second["model"]
+    # Once no topic can be added, unrelated items stay unassigned
+    max_topics = topics.TOPIC_MAX
+    topics.TOPIC_MAX = 3
+    try:
+        fourth = topics.cluster_topics([{"text": "zebra quartz violin"}], model=second["model"])
+    finally:
+        topics.TOPIC_MAX = max_topics
+    assert fourth["assignments"] == [-1] and sum(topic["size"] for topic in fourth["topics"]) == 330
+    print("Topic clustering OK")
+
+def test_run_batch():
+    import dispatch
+    import instrumentation
+    import result_cache
+    enabled = result_cache.CACHE_ENABLED
+    result_cache.CACHE_ENABLED = False
+    try:
+        jobs = [
+            {"id": "a", "action": "extract_keywords", "text": sample_text, "params": {"mode": "fast", "top_n": 3}},
+            {"id": "b", "action": "extract_keywords", "text": "Video editing tools for creators.", "params": {"mode": "fast", "top_n": 3}},
+            {"id": "c", "action": "clean_text", "text": sample_html},
+            {"id": "d", "action": "no_such_action", "text": "x"},
+            {"id": "e", "action": "summarize"},
+            "not a job",
+            {"id": 0, "action": "readability", "text": sample_text},
+        ]
+        with instrumentation.request() as metrics:
+            batch = dispatch.run_batch(jobs)
+        # Keyword jobs share one group call; ids are strings in both maps
+        assert metrics.stages["action.extract_keywords"]["calls"] == 1
+        assert set(batch["results"]) == {"a", "b", "c", "0"}
+        assert batch["results"]["a"] == shared_utils.extract_keywords(sample_text, top_n=3, mode="fast")
+        assert batch["results"]["c"] == shared_utils.clean_text(sample_html)
+        assert batch["errors"] == {"d": "Invalid action", "e": "Missing action or text", "#5": "Invalid job"}
+        assert batch["_meta"]["cache"]["misses"] == 4
+        for duplicate in ([{"id": "x", "action": "readability", "text": "a"}] * 2, ["bad", {"id": "#0", "action": "readability", "text": "a"}]):
+            try:
+                dispatch.run_batch(duplicate)
+                assert False, "expected duplicate id error"
+            except ValueError as e:
+                assert "Duplicate job id" in str(e)
+    finally:
+        result_cache.CACHE_ENABLED = enabled
+    print("Batch dispatch OK")
+
+def test_result_cache():
+    import tempfile
+    import time
+    import result_cache
+    saved = (result_cache.CACHE_ENABLED, result_cache.CACHE_DIR, result_cache.CACHE_TTL, result_cache._disk, result_cache._disk_failed)
+    versions = dict(shared_utils.MODEL_VERSIONS)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result_cache.CACHE_ENABLED, result_cache.CACHE_DIR = True, cache_dir
+        result_cache._disk, result_cache._disk_failed = None, False
+        try:
+            result_cache.clear()
+            key = result_cache.make_key("readability", " Text\r\n", {}, shared_utils.model_version("readability"))
+            # Normalized text and canonical params give the same key
+            assert key == result_cache.make_key("readability", "Text", {}, shared_utils.model_version("readability"))
+            assert result_cache.get(key) == (False, None, None)
+            result_cache.put(key, 42.0)
+            assert result_cache.get(key) == (True, 42.0, "memory")
+            # Falls through to disk once the memory tier is gone, then is promoted
+            result_cache._memory.clear()
+            assert result_cache.get(key) == (True, 42.0, "disk")
+            assert result_cache.get(key) == (True, 42.0, "memory")
+            # Empty results are never stored
+            result_cache.put("empty", [])
+            assert result_cache.get("empty")[0] is False
+            assert result_cache.stats() == {"memory_hits": 2, "disk_hits": 1, "misses": 2}
+
+            # Entries expire in both tiers after CACHE_TTL seconds
+            result_cache.CACHE_TTL = 0.2
+            result_cache.put("short", "value")
+            time.sleep(0.3)
+            assert result_cache.get("short")[0] is False
+            result_cache._memory.clear()
+            assert result_cache.get("short")[0] is False
+
+            # A MODEL_VERSIONS bump changes the fingerprint and drops the disk tier
+            assert result_cache.invalidate_if_models_changed(shared_utils.model_fingerprint())
+            assert not result_cache.invalidate_if_models_changed(shared_utils.model_fingerprint())
+            result_cache.CACHE_TTL = saved[2]
+            result_cache.put(key, 42.0)
+            tag, packages = shared_utils.MODEL_VERSIONS["readability"]
+            shared_utils.MODEL_VERSIONS["readability"] = (tag + ".1", packages)
+            shared_utils._model_version_cache.clear()
+            assert result_cache.invalidate_if_models_changed(shared_utils.model_fingerprint())
+            assert result_cache.get(key)[0] is False
+
+            # Fallback values reach the caller but are never stored
+            import dispatch
+            for _ in range(2):
+                result, meta = dispatch.process("summarize", "a. b. c. d. e.", {"sentences_count": "2"})
+                assert result == "a. b. c. d. e...." and meta["cache"]["hit"] is False
+                result, meta = dispatch.process("readability", ["not", "text"])
+                assert result == 0.0 and meta["cache"]["hit"] is False
+            dispatch.process("readability", "A short sentence.")
+            assert dispatch.process("readability", "A short sentence.")[1]["cache"]["hit"]
+            jobs = [{"id": "bad", "action": "readability", "text": ["not", "text"]}, {"id": "ok", "action": "readability", "text": "Another sentence."}]
+            dispatch.run_batch(jobs)
+            assert dispatch.run_batch(jobs)["_meta"]["cache"] == dict(hits=1, misses=1, totals=result_cache.stats())
+        finally:
+            shared_utils.MODEL_VERSIONS.clear()
+            shared_utils.MODEL_VERSIONS.update(versions)
+            shared_utils._model_version_cache.clear()
+            if result_cache._disk is not None:
+                result_cache._disk.close()
+            result_cache.CACHE_ENABLED, result_cache.CACHE_DIR, result_cache.CACHE_TTL, result_cache._disk, result_cache._disk_failed = saved
+            result_cache._memory.clear()
+    print("Result cache OK")
+
+def test_history_incremental():
+    import json
+    import random
+    import dispatch
+    import history
+    rng = random.Random(3)
+    words = "video script hook editing thumbnail audio caption lighting camera story".split()
+    items = [
+        {"text": " ".join(rng.choice(words) for _ in range(12)).capitalize() + ".", "type": rng.choice(["video", "post"]),
+         "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        for _ in range(300)
+    ]
+    def numbers(result):
+        result = dict(result)
+        result.pop("summary", None)
+        return result
+    single = history.analyze_content_history(items, include_summary=True)
+    # The summary (with its keyword sample) is only returned on request
+    assert "summary" not in history.analyze_content_history(items)
+    # Resumed from a persisted summary
+    first = history.analyze_content_history(items[:120], include_summary=True)
+    resumed = history.analyze_content_history(items[120:], summary=json.loads(json.dumps(first["summary"])), include_summary=True)
+    assert numbers(resumed) == numbers(single)
+    assert resumed["summary"]["sample"] == single["summary"]["sample"]
+    # Partial summaries computed separately, then merged
+    parts = [history.analyze_content_history(items[start:start + 100], include_summary=True)["summary"] for start in (100, 200)]
+    merged = history.analyze_content_history(items[:100], summaries=parts, include_summary=True)
+    assert numbers(merged)["total"] == 300
+    assert merged["summary"]["term_counts"] == single["summary"]["term_counts"]
+    for name in ("type_breakdown", "frequency_stats", "avg_readability", "top_terms"):
+        assert merged[name] == single[name], name
+    # The NDJSON stream matches the JSON items path
+    lines = [json.dumps({"action": "analyze_content_history", "params": {}}).encode()] + [json.dumps(item).encode() + b"\n" for item in items]
+    action, streamed, meta = dispatch.process_stream(iter(lines))
+    assert action == "analyze_content_history" and meta == {"streamed": True}
+    assert streamed == dispatch.run_action("analyze_content_history", "", {"items": items})
+    # Malformed items are bad requests (ValueError -> 400), not crashes
+    for bad in ([1, 2], "text", {"text": 3}, {"type": ["video"]}):
+        for action in ("analyze_content_history", "cluster_topics"):
+            try:
+                dispatch.process_stream(iter([lines[0].replace(b"analyze_content_history", action.encode()), json.dumps(bad).encode()]))
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"accepted {bad!r}")
+    try:
+        dispatch.run_action("analyze_content_history", "", {"items": {"text": "a"}})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("accepted items that aren't a list")
+    print("History summaries OK")
+
+def test_readability_pool():
+    import instrumentation
+    # Distinct scores per position, so any reordering shows up
+    texts = [" ".join(["Readable words here."] * (i % 7 + 1) + ["Extraordinarily complicated terminology."] * (i % 5)) for i in range(shared_utils.PARALLEL_READABILITY_MIN_ITEMS + 37)]
+    with instrumentation.request() as metrics:
+        pooled = shared_utils.score_readability_many(texts, n_jobs=2)
+    assert not [name for name in metrics.counters if name.startswith("fallback.")], metrics.counters
+    assert pooled == [shared_utils.score_readability(text) for text in texts]
+    print("Parallel readability OK")
+
+def test_textrank():
+    import instrumentation
+    import textrank
+    sentences = [
+        "Caching shortens video exports.",
+        "Caching video exports and batching audio uploads.",
+        "Batching shortens audio uploads.",
+        "My cat likes sleeping in the sun.",
+    ]
+    # The sentence sharing terms with the others outranks the unrelated one
+    scores = textrank.rank_sentences(sentences)
+    assert abs(scores.sum() - 1) < 1e-6
+    assert scores.argmax() == 1 and scores.argmin() == 3
+    # Top sentences come back in document order (ties keep the earlier one)
+    assert textrank.summarize(" ".join(sentences), sentences_count=2, segmenter="regex") == " ".join(sentences[:2])
+
+    # Past the cap, only an evenly spaced subset of sentences is ranked
+    many = [f"Sentence {i} covers topic {i % 4} in detail." for i in range(100)]
+    summary = textrank.summarize(" ".join(many), sentences_count=3, max_sentences_considered=10, segmenter="regex")
+    considered = {many[i] for i in range(0, 100, 11)}
+    picked = textrank.split_sentences(summary, segmenter="regex")
+    assert len(picked) == 3 and set(picked) <= considered
+
+    # A missing spaCy model falls back to the regex segmenter, once
+    def missing_model(*args, **kwargs):
+        raise OSError("model not installed")
+    get_nlp, failed = shared_utils.get_nlp, textrank._spacy_failed
+    shared_utils.get_nlp, textrank._spacy_failed = missing_model, False
+    try:
+        with instrumentation.request() as metrics:
+            assert textrank.split_sentences(" ".join(sentences), segmenter="spacy") == sentences
+            assert textrank.split_sentences(" ".join(sentences), segmenter="spacy") == sentences
+        assert metrics.counters["fallback.split_sentences.spacy"] == 1
+    finally:
+        shared_utils.get_nlp, textrank._spacy_failed = get_nlp, failed
+    print("TextRank OK")
+
+def test_profile_sampling():
+    import tempfile
+    import threading
+    import instrumentation
+    saved = (instrumentation.PROFILE_SAMPLE_RATE, instrumentation.PROFILE_MAX, instrumentation.PROFILE_DIR, instrumentation._profiles_reserved)
+    with tempfile.TemporaryDirectory() as profile_dir:
+        instrumentation.PROFILE_SAMPLE_RATE, instrumentation.PROFILE_MAX = 1.0, 1
+        instrumentation.PROFILE_DIR, instrumentation._profiles_reserved = profile_dir, 0
+        try:
+            # Concurrent sampled requests share PROFILE_MAX slots
+            inside = threading.Barrier(4)
+            paths = []
+            def run():
+                with instrumentation.request("profiled") as metrics:
+                    inside.wait(timeout=10)
+                paths.append(metrics.profile_path)
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len([path for path in paths if path]) == 1
+        finally:
+            instrumentation.PROFILE_SAMPLE_RATE, instrumentation.PROFILE_MAX, instrumentation.PROFILE_DIR, instrumentation._profiles_reserved = saved
+    print("Profile sampling OK")
+
+def test_model_download_default():
+    import os
+    import subprocess
+    import tempfile
+    def allowed(**env):
+        probe = "import shared_utils; print(shared_utils.ALLOW_MODEL_DOWNLOAD)"
+        env = {key: value for key, value in dict(os.environ, **env).items() if value is not None}
+        out = subprocess.run([sys.executable, "-c", probe], env=env, cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+        return out.stdout.strip() == "True"
+    with tempfile.TemporaryDirectory() as models_dir:
+        # Vendored models present: no downloads unless explicitly allowed
+        assert not allowed(MODELS_DIR=models_dir, ALLOW_MODEL_DOWNLOAD=None)
+        assert allowed(MODELS_DIR=models_dir, ALLOW_MODEL_DOWNLOAD="1")
+        assert allowed(MODELS_DIR=os.path.join(models_dir, "missing"), ALLOW_MODEL_DOWNLOAD=None)
+    print("Model download default OK")
+
 if __name__ == "__main__":
     test()
+    test_clean_text_backends()
+    test_keyword_tiers()
+    test_readability_engines()
+    test_benchmark_baseline()
+    test_instrumentation()
+    test_microbatch()
+    test_chunking()
+    test_topics()
+    test_run_batch()
+    test_result_cache()
+    test_history_incremental()
+    test_readability_pool()
+    test_textrank()
+    test_profile_sampling()
+    test_model_download_default()
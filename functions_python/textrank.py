@@ -0,0 +1,101 @@
+import os
+import re
+
+import instrumentation
+
+# TextRank over a sparse TF-IDF cosine-similarity graph, scored with a
+# NumPy power iteration. Replaces Sumy's pure-Python O(n^2) pairwise loop.
+MAX_SENTENCES_CONSIDERED = int(os.environ.get("SUMMARY_MAX_SENTENCES", 2000))
+# "spacy" reuses shared_utils.get_nlp() for sentence boundaries; "regex" is
+# dependency-free and is also the fallback when the spaCy model is missing
+SEGMENTER = os.environ.get("SUMMARY_SEGMENTER", "spacy")
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|(?=\n)|$)")
+# Components not needed for sentence boundaries
+_SPACY_DISABLE = ("ner", "lemmatizer", "attribute_ruler", "tagger")
+_spacy_failed = False
+
+
+def split_sentences(text, segmenter=None):
+    """
+    Segments text once into a list of sentence strings.
+    """
+    global _spacy_failed
+    if (segmenter or SEGMENTER) == "spacy" and not _spacy_failed:
+        try:
+            import shared_utils
+            nlp = shared_utils.get_nlp()
+            disable = [name for name in _SPACY_DISABLE if name in nlp.pipe_names]
+            with nlp.select_pipes(disable=disable):
+                if len(text) > nlp.max_length:
+                    nlp.max_length = len(text) + 1
+                return [sent.text.strip() for sent in nlp(text).sents if sent.text.strip()]
+        except Exception as e:
+            # Don't retry a missing model on every request
+            _spacy_failed = True
+            instrumentation.fallback("split_sentences.spacy", e, "using regex from now on")
+    return [sentence.strip() for sentence in _SENTENCE_RE.findall(text) if sentence.strip()]
+
+
+def rank_sentences(sentences):
+    """
+    Returns one TextRank score per sentence.
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+    try:
+        tfidf = TfidfVectorizer(stop_words="english").fit_transform(sentences)
+    except ValueError:
+        # Nothing but stop words: no graph to rank
+        return np.full(n, 1.0 / n)
+
+    # Rows are l2-normalized, so X @ X.T is cosine similarity; stays sparse
+    similarity = (tfidf @ tfidf.T).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    # Column-stochastic transition matrix; dangling sentences jump uniformly
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_weight = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition = similarity.T.multiply(inv_weight).tocsr()
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition @ scores + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def summarize(text, sentences_count=3, max_sentences_considered=None, segmenter=None):
+    """
+    Extractive summary: the top sentences_count sentences by TextRank, in
+    their original order. Inputs with more than max_sentences_considered
+    sentences are ranked over an evenly spaced subset covering the whole text.
+    """
+    import numpy as np
+
+    sentences = split_sentences(text, segmenter)
+    if len(sentences) <= sentences_count:
+        return " ".join(sentences)
+
+    cap = max_sentences_considered or MAX_SENTENCES_CONSIDERED
+    if len(sentences) > cap:
+        keep = np.linspace(0, len(sentences) - 1, cap).round().astype(int)
+        sentences = [sentences[i] for i in np.unique(keep)]
+
+    scores = rank_sentences(sentences)
+    # Stable sort so ties keep document order
+    top = np.argsort(-scores, kind="stable")[:sentences_count]
+    return " ".join(sentences[i] for i in sorted(top))
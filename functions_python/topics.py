@@ -0,0 +1,357 @@
+import math
+import os
+from collections import Counter
+
+import instrumentation
+import result_cache
+import shared_utils
+
+# Online topic clustering for a creator's content history. Items are hashed
+# into TF vectors (HashingVectorizer: stateless, so new items never require
+# refitting a vocabulary) and grouped with mini-batch spherical k-means:
+#   - each batch is assigned to the nearest centroid (cosine similarity)
+#   - an item further than TOPIC_NEW_SIMILARITY from every centroid opens a
+#     new topic, up to TOPIC_MAX topics
+#   - each centroid moves toward the mean of its new members with learning
+#     rate members / total members (Sculley's mini-batch update), then keeps
+#     only its TOPIC_CENTER_TERMS largest weights
+#   - topics whose centroids converge past TOPIC_MERGE_SIMILARITY are merged
+#     into the older one; the merged id stays resolvable through "aliases"
+# The fitted model is a small JSON state: the caller can persist it (like the
+# history summary) and it is also cached per creator on the instance, so
+# later calls only pay for the new items.
+TOPIC_FEATURES = int(os.environ.get("TOPIC_FEATURES", 2 ** 18))
+TOPIC_MAX = int(os.environ.get("TOPIC_MAX", 12))
+TOPIC_NEW_SIMILARITY = float(os.environ.get("TOPIC_NEW_SIMILARITY", 0.2))
+TOPIC_MERGE_SIMILARITY = float(os.environ.get("TOPIC_MERGE_SIMILARITY", 0.6))
+# Nonzero weights kept per centroid (bounds the persisted state)
+TOPIC_CENTER_TERMS = int(os.environ.get("TOPIC_CENTER_TERMS", 1024))
+# Items per mini-batch step; later batches see the earlier updates
+TOPIC_BATCH_ITEMS = int(os.environ.get("TOPIC_BATCH_ITEMS", 256))
+# Distinct label candidates tracked per topic (Misra-Gries, as in history.py)
+TOPIC_TERM_CAPACITY = 200
+TOPIC_LABEL_TERMS = 3
+# Months compared with the whole history for a topic's trend
+TOPIC_RECENT_MONTHS = 3
+# Recent share over overall share beyond which a topic is rising (or, below
+# its inverse, falling)
+TOPIC_TREND_RATIO = 1.25
+
+# Bump when the model state layout changes; older states are rejected
+MODEL_STATE_VERSION = 1
+
+# Same candidate terms as history.py: a letter, then 2+ word characters
+_TOKEN_PATTERN = r"(?u)\b[a-zA-Z][a-zA-Z0-9']{2,}\b"
+_vectorizer = None
+
+
+def get_vectorizer():
+    global _vectorizer
+    if _vectorizer is None:
+        import numpy as np
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        _vectorizer = HashingVectorizer(
+            n_features=TOPIC_FEATURES, token_pattern=_TOKEN_PATTERN, stop_words="english",
+            alternate_sign=False, norm="l2", dtype=np.float32,
+        )
+    return _vectorizer
+
+
+class TopicModel:
+    """
+    Incrementally fitted topics with per-topic label terms and date buckets.
+    """
+
+    def __init__(self):
+        import numpy as np
+
+        self.centers = np.zeros((0, TOPIC_FEATURES), dtype=np.float32)
+        self.counts = []
+        self.term_counts = []
+        self.daily_counts = []
+        self.monthly_counts = []
+        # Merged topic id -> the topic it was merged into
+        self.aliases = {}
+
+    def live_topics(self):
+        return [topic for topic in range(len(self.counts)) if topic not in self.aliases]
+
+    def resolve(self, topic):
+        while topic in self.aliases:
+            topic = self.aliases[topic]
+        return topic
+
+    def _add_topic(self, center):
+        import numpy as np
+
+        self.centers = np.vstack([self.centers, center[None, :]])
+        self.counts.append(0)
+        self.term_counts.append(Counter())
+        self.daily_counts.append(Counter())
+        self.monthly_counts.append(Counter())
+        instrumentation.count("topics.created")
+
+    def _assign(self, X, grow):
+        """
+        Nearest topic per row of X (-1 for rows without terms or sharing
+        none with any topic). With grow, rows far from every topic open new
+        ones, farthest first.
+        """
+        import numpy as np
+
+        has_terms = np.diff(X.indptr) > 0
+        similarities = np.asarray(X @ self.centers.T)
+        if grow:
+            best = similarities.max(axis=1) if len(self.counts) else np.zeros(X.shape[0], dtype=np.float32)
+            while len(self.live_topics()) < TOPIC_MAX:
+                # Farthest-first: the item least like any topic seeds the next
+                farthest = int(np.argmin(np.where(has_terms, best, np.inf)))
+                if not has_terms[farthest] or best[farthest] >= TOPIC_NEW_SIMILARITY:
+                    break
+                seed = X[farthest].toarray()[0]
+                self._add_topic(seed)
+                column = np.asarray(X @ seed).ravel()
+                similarities = np.column_stack([similarities, column])
+                best = np.maximum(best, column)
+        if not len(self.counts):
+            return np.full(X.shape[0], -1)
+        # Items sharing no term with any topic (possible once TOPIC_MAX is
+        # reached) stay unassigned rather than landing in topic 0
+        related = has_terms & (similarities.max(axis=1) > 0)
+        return np.where(related, similarities.argmax(axis=1), -1)
+
+    def _update_centers(self, X, labels):
+        import numpy as np
+
+        for topic in np.unique(labels[labels >= 0]):
+            members = X[labels == topic]
+            self.counts[topic] += members.shape[0]
+            rate = members.shape[0] / self.counts[topic]
+            center = (1 - rate) * self.centers[topic] + rate * np.asarray(members.mean(axis=0)).ravel()
+            self.centers[topic] = self._prune_center(center)
+
+    def _prune_center(self, center):
+        import numpy as np
+
+        if len(center) > TOPIC_CENTER_TERMS:
+            cutoff = np.partition(center, -TOPIC_CENTER_TERMS)[-TOPIC_CENTER_TERMS]
+            center[center < cutoff] = 0
+        norm = np.linalg.norm(center)
+        return center / norm if norm else center
+
+    def _merge_close(self):
+        """
+        Merges topics whose centroids are more similar than
+        TOPIC_MERGE_SIMILARITY (a topic seeded twice, or two that converged).
+        """
+        import numpy as np
+
+        live = [topic for topic in self.live_topics() if self.counts[topic]]
+        if len(live) < 2:
+            return
+        similarities = self.centers[live] @ self.centers[live].T
+        np.fill_diagonal(similarities, 0)
+        for a, b in zip(*np.nonzero(np.triu(similarities) > TOPIC_MERGE_SIMILARITY)):
+            keep, drop = self.resolve(live[a]), self.resolve(live[b])
+            if keep == drop:
+                continue
+            keep, drop = min(keep, drop), max(keep, drop)
+            total = self.counts[keep] + self.counts[drop]
+            center = (self.counts[keep] * self.centers[keep] + self.counts[drop] * self.centers[drop]) / total
+            self.centers[keep] = self._prune_center(center)
+            self.centers[drop] = 0
+            self.counts[keep], self.counts[drop] = total, 0
+            for buckets in (self.term_counts, self.daily_counts, self.monthly_counts):
+                buckets[keep].update(buckets[drop])
+                buckets[drop] = Counter()
+            self._prune_terms(keep)
+            self.aliases[drop] = keep
+            instrumentation.count("topics.merged")
+
+    def _prune_terms(self, topic):
+        terms = self.term_counts[topic]
+        if len(terms) > TOPIC_TERM_CAPACITY:
+            counts = sorted(terms.values(), reverse=True)
+            floor = counts[TOPIC_TERM_CAPACITY]
+            self.term_counts[topic] = Counter({term: count - floor for term, count in terms.items() if count > floor})
+
+    def _record(self, texts, dates, labels):
+        analyzer = get_vectorizer().build_analyzer()
+        for text, date, topic in zip(texts, dates, labels):
+            if topic < 0:
+                continue
+            self.term_counts[topic].update(set(analyzer(text)))
+            self._prune_terms(topic)
+            # Same ISO-prefix buckets as history.py
+            if isinstance(date, str) and len(date) >= 10:
+                self.daily_counts[topic][date[:10]] += 1
+                self.monthly_counts[topic][date[:7]] += 1
+
+    def add_many(self, items, update=True):
+        """
+        Assigns items ({"text", "date"}) to topics, one mini-batch at a time.
+        With update, topics are created and moved and the items are counted;
+        otherwise the model is left unchanged. Returns one topic id per item
+        (-1 for items without usable text).
+        """
+        assignments = []
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= TOPIC_BATCH_ITEMS:
+                assignments.extend(self._add_batch(batch, update))
+                batch = []
+        if batch:
+            assignments.extend(self._add_batch(batch, update))
+        # Earlier batches may point at topics merged since
+        return [self.resolve(topic) if topic >= 0 else topic for topic in assignments]
+
+    def _add_batch(self, items, update):
+        texts = [item.get("text") or "" for item in items]
+        with instrumentation.stage("topics.vectorize"):
+            X = get_vectorizer().transform(texts)
+        with instrumentation.stage("topics.assign"):
+            labels = self._assign(X, grow=update)
+        if update:
+            with instrumentation.stage("topics.update"):
+                self._update_centers(X, labels)
+                self._record(texts, [item.get("date", "") for item in items], labels)
+                self._merge_close()
+        return [int(label) for label in labels]
+
+    def labels(self, top_n=TOPIC_LABEL_TERMS):
+        """
+        Label terms per topic by class-based TF-IDF: a term's frequency in the
+        topic, discounted by how common it is across topics.
+        """
+        frequency = Counter()
+        for terms in self.term_counts:
+            frequency.update(terms)
+        average = sum(frequency.values()) / max(len(self.term_counts), 1)
+        labels = []
+        for terms in self.term_counts:
+            total = sum(terms.values()) or 1
+            scores = {term: count / total * math.log(1 + average / frequency[term]) for term, count in terms.items()}
+            labels.append(sorted(scores, key=lambda term: (-scores[term], term))[:top_n])
+        return labels
+
+    def topics(self, top_n=TOPIC_LABEL_TERMS):
+        """
+        Topics by size, each with its label, share of items and trend
+        (share over the latest TOPIC_RECENT_MONTHS months against overall).
+        """
+        total = sum(self.counts)
+        all_months = Counter()
+        for months in self.monthly_counts:
+            all_months.update(months)
+        recent = sorted(all_months)[-TOPIC_RECENT_MONTHS:]
+        recent_total = sum(all_months[month] for month in recent)
+
+        topics = []
+        for topic, terms in enumerate(self.labels(top_n)):
+            if not self.counts[topic]:
+                continue
+            share = self.counts[topic] / total
+            recent_share = sum(self.monthly_counts[topic][month] for month in recent) / recent_total if recent_total else None
+            trend = "steady"
+            if recent_share is not None and recent_share > share * TOPIC_TREND_RATIO:
+                trend = "rising"
+            elif recent_share is not None and recent_share < share / TOPIC_TREND_RATIO:
+                trend = "falling"
+            topics.append({
+                "id": topic,
+                "label": ", ".join(terms),
+                "terms": terms,
+                "size": self.counts[topic],
+                "share": round(share, 4),
+                "recent_share": None if recent_share is None else round(recent_share, 4),
+                "trend": trend,
+                "frequency_stats": {
+                    "daily": dict(self.daily_counts[topic]),
+                    "monthly": dict(self.monthly_counts[topic]),
+                },
+            })
+        topics.sort(key=lambda entry: (-entry["size"], entry["id"]))
+        return topics
+
+    def to_state(self):
+        """
+        Serializable state; centroids are stored sparse.
+        """
+        import numpy as np
+
+        centers = []
+        for center in self.centers:
+            indices = np.flatnonzero(center)
+            centers.append({"indices": indices.tolist(), "values": [round(float(value), 6) for value in center[indices]]})
+        return {
+            "version": MODEL_STATE_VERSION,
+            "features": TOPIC_FEATURES,
+            "counts": list(self.counts),
+            "centers": centers,
+            "terms": [dict(terms) for terms in self.term_counts],
+            "daily": [dict(days) for days in self.daily_counts],
+            "monthly": [dict(months) for months in self.monthly_counts],
+            "aliases": {str(topic): target for topic, target in self.aliases.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        if not isinstance(state, dict) or state.get("version") != MODEL_STATE_VERSION or state.get("features") != TOPIC_FEATURES:
+            raise ValueError("Unsupported topic model")
+        import numpy as np
+
+        model = cls()
+        model.centers = np.zeros((len(state["centers"]), TOPIC_FEATURES), dtype=np.float32)
+        for row, center in zip(model.centers, state["centers"]):
+            row[center["indices"]] = center["values"]
+        model.counts = list(state["counts"])
+        model.term_counts = [Counter(terms) for terms in state["terms"]]
+        model.daily_counts = [Counter(days) for days in state["daily"]]
+        model.monthly_counts = [Counter(months) for months in state["monthly"]]
+        model.aliases = {int(topic): target for topic, target in state["aliases"].items()}
+        return model
+
+
+def _model_key(creator_id):
+    return result_cache.make_key("cluster_topics.model", str(creator_id), {}, shared_utils.model_version("cluster_topics"))
+
+
+def load_model(creator_id=None, state=None):
+    """
+    The model to continue from: the given state, else the one cached for
+    creator_id on this instance, else a new one.
+    """
+    if state:
+        return TopicModel.from_state(state)
+    if creator_id:
+        hit, cached, _ = result_cache.get(_model_key(creator_id))
+        instrumentation.count(f"topics.model_cache.{'hit' if hit else 'miss'}")
+        if hit:
+            return TopicModel.from_state(cached)
+    return TopicModel()
+
+
+def cluster_topics(items, creator_id=None, model=None, update=True, top_n=TOPIC_LABEL_TERMS):
+    """
+    Groups a creator's history items ({"text", "date", ...}, any iterable)
+    into topics. model is a previous result's "model" to extend with only the
+    new items; without it, the model cached for creator_id is used. With
+    update=False items are only assigned to the existing topics.
+    Returns the topics, one topic id per item ("assignments"), the ids of
+    merged topics ("aliases") and the updated "model" for the caller to persist.
+    """
+    topic_model = load_model(creator_id, model)
+    assignments = topic_model.add_many(items or [], update=update)
+    if not sum(topic_model.counts):
+        raise ValueError("No items provided")
+    state = topic_model.to_state()
+    if update and creator_id:
+        result_cache.put(_model_key(creator_id), state)
+    return {
+        "topics": topic_model.topics(top_n),
+        "assignments": assignments,
+        "aliases": state["aliases"],
+        "model": state,
+    }
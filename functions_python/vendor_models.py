@@ -0,0 +1,13 @@
+import json
+import sys
+
+import shared_utils
+
+# Build step: vendor the spaCy and KeyBERT models next to the function source
+# so instances load them from disk at init (see shared_utils.warm_up).
+# Usage: python vendor_models.py [models_dir]
+if __name__ == "__main__":
+    models_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    paths = shared_utils.snapshot_models(models_dir)
+    print(json.dumps(paths, indent=2))
+    print(json.dumps(shared_utils.warm_up(), indent=2))
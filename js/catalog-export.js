@@ -0,0 +1,77 @@
+// Catalog reader for the static export written by catalog/export.py.
+// Instead of the whole data/tools.json, clients fetch data/export/manifest.json
+// (every tool's id, name and slug plus the shard file names) and then only the
+// shards they need: PAGE_SIZE-tool pages in catalog order, or one category.
+// Shard names carry a content hash, so unchanged shards stay in the browser
+// cache across catalog updates; only the manifest is revalidated. The .gz/.br
+// twins are picked by the host via Accept-Encoding.
+// Falls back to data/tools.json when no export has been published.
+const CATALOG_EXPORT_URL = 'data/export/';
+const CATALOG_MANIFEST_VERSION = 1;
+
+class CatalogExport {
+    constructor(baseUrl = CATALOG_EXPORT_URL) {
+        this.baseUrl = baseUrl;
+        this.manifest = null;
+        this.shards = new Map();
+        this.legacyTools = null;
+    }
+
+    // Resolves to the manifest, or null when there is no (compatible) export
+    getManifest() {
+        if (!this.manifest) {
+            this.manifest = fetch(this.baseUrl + 'manifest.json', { cache: 'no-cache' })
+                .then(response => response.ok ? response.json() : null)
+                .then(manifest => manifest && manifest.version === CATALOG_MANIFEST_VERSION ? manifest : null)
+                .catch(() => null);
+        }
+        return this.manifest;
+    }
+
+    getShard(file) {
+        if (!this.shards.has(file)) {
+            this.shards.set(file, fetch(this.baseUrl + file).then(response => {
+                if (!response.ok) throw new Error(`Failed to load ${file}: ${response.status}`);
+                return response.json();
+            }));
+        }
+        return this.shards.get(file);
+    }
+
+    getLegacyTools() {
+        if (!this.legacyTools) {
+            this.legacyTools = fetch('data/tools.json').then(response => response.json());
+        }
+        return this.legacyTools;
+    }
+
+    async getAllTools() {
+        const manifest = await this.getManifest();
+        if (!manifest) return this.getLegacyTools();
+        const pages = await Promise.all(manifest.pages.map(file => this.getShard(file)));
+        return pages.flat();
+    }
+
+    async getToolsByCategory(category) {
+        const manifest = await this.getManifest();
+        if (!manifest) {
+            return (await this.getLegacyTools()).filter(tool => (tool.categories || []).includes(category));
+        }
+        const entry = manifest.categories[category];
+        return entry ? this.getShard(entry.file) : [];
+    }
+
+    // Looks a tool up by "id", "slug" or "name", fetching only its page
+    async getToolBy(column, value) {
+        const manifest = await this.getManifest();
+        if (!manifest) {
+            return (await this.getLegacyTools()).find(tool => tool[column] === value) || null;
+        }
+        const index = manifest.tools[column].indexOf(value);
+        if (index < 0) return null;
+        const page = await this.getShard(manifest.pages[Math.floor(index / manifest.page_size)]);
+        return page[index % manifest.page_size] || null;
+    }
+}
+
+window.catalogExport = new CatalogExport();
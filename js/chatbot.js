@@ -41,9 +41,11 @@ class AIChatbot {
                 this.toolsData = await window.dataService.getAllTools();
                 console.log(`✅ Loaded ${this.toolsData.length} tools from Firestore`);
             } else {
-                // Fallback to JSON if data service not available
-                const response = await fetch('data/tools.json');
-                this.toolsData = await response.json();
+                // Fallback to the static catalog export (or the whole JSON on
+                // pages without js/catalog-export.js) if data service not available
+                this.toolsData = window.catalogExport
+                    ? await window.catalogExport.getAllTools()
+                    : await (await fetch('data/tools.json')).json();
                 console.log(`✅ Loaded ${this.toolsData.length} tools from JSON`);
             }
         } catch (error) {
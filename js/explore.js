@@ -72,14 +72,12 @@ async function initExplore() {
             if (dataService) {
                 allTools = await dataService.getAllTools();
             } else {
-                // Fallback to JSON if data service not available
-                const response = await fetch('data/tools.json');
-                allTools = await response.json();
+                // Fallback to the static catalog export if data service not available
+                allTools = await window.catalogExport.getAllTools();
             }
         } catch (firestoreError) {
-            console.warn('Firestore not available, falling back to JSON:', firestoreError);
-            const response = await fetch('data/tools.json');
-            allTools = await response.json();
+            console.warn('Firestore not available, falling back to the static catalog:', firestoreError);
+            allTools = await window.catalogExport.getAllTools();
         }
 
         // Fetch total count if using Firestore
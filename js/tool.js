@@ -9,9 +9,8 @@ async function initToolDetail() {
     }
 
     try {
-        const response = await fetch('data/tools.json');
-        const tools = await response.json();
-        const tool = tools.find(t => t.slug === slug);
+        // Fetches only the export page holding this tool (js/catalog-export.js)
+        const tool = await window.catalogExport.getToolBy('slug', slug);
 
         if (!tool) {
             container.innerHTML = `
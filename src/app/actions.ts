@@ -21,12 +21,28 @@ export async function generateNichesAction(interests: string[], language: string
     }
 }
 
-export async function getHistoryAnalyticsAction(items: any[]) {
+// Pass the previous result's `summary` to send only items added since then;
+// the returned result carries the updated `summary` to store for next time
+// (see loadHistoryAnalytics in lib/history-analytics.ts).
+export async function getHistoryAnalyticsAction(items: any[], summary?: any) {
     try {
         // Text argument is required by the endpoint but ignored for this action
-        return await processText("analyze_content_history", "batch_analysis", { items });
+        const params = summary ? { items, summary, include_summary: true } : { items, include_summary: true };
+        return await processText("analyze_content_history", "batch_analysis", params);
     } catch (e) {
         console.error("Analytics Action Error:", e);
         return null;
     }
 }
+
+// Groups history items into topics. Send only items added since the last call:
+// the creator's fitted model is cached on the instance, and passing the previous
+// result's `model` continues it on any instance.
+export async function getTopicClustersAction(creatorId: string, items: any[], model?: any) {
+    try {
+        return await processText("cluster_topics", "batch_analysis", model ? { creator_id: creatorId, items, model } : { creator_id: creatorId, items });
+    } catch (e) {
+        console.error("Topic Clustering Action Error:", e);
+        return null;
+    }
+}
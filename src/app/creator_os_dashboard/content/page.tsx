@@ -3,7 +3,7 @@
 import { useState, useEffect } from "react";
 import { useAuth } from "@/context/AuthContext";
 import { dbService, ContentHistoryItem } from "@/lib/firestore";
-import { getHistoryAnalyticsAction } from "@/app/actions";
+import { loadHistoryAnalytics } from "@/lib/history-analytics";
 import { Button } from "@/components/ui/Button";
 import { Card } from "@/components/ui/Card";
 import { Input } from "@/components/ui/Input";
@@ -52,17 +52,9 @@ export default function ContentDashboardPage() {
                 const items = await dbService.getContentHistory(user.uid);
                 setHistory(items);
 
-                // 2. Fetch analytics (Python)
-                const payloadItems = items.map(i => ({
-                    text: i.type === 'script' ? (i.content.script?.hook + " " + i.content.script?.body) : i.title,
-                    date: i.createdAt?.toDate ? i.createdAt.toDate().toISOString() : new Date().toISOString(),
-                    type: i.type
-                }));
-
-                if (payloadItems.length > 0) {
-                    const analyticsData = await getHistoryAnalyticsAction(payloadItems);
-                    if (analyticsData) setStats(analyticsData);
-                }
+                // 2. Fetch analytics (Python), sending only items added since the last load
+                const analyticsData = await loadHistoryAnalytics(user.uid, items);
+                if (analyticsData) setStats(analyticsData);
 
             } catch (e) {
                 console.error("Failed to load history data", e);
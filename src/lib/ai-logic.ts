@@ -3,7 +3,7 @@
 const OPENAI_API_URL = "https://api.openai.com/v1/chat/completions";
 const MODEL = process.env.AI_MODEL || "gpt-4o-mini";
 
-import { processText } from "./python-tools";
+import { processBatch, processText } from "./python-tools";
 import { NicheSuggestion, DailyContent } from "./ai-types";
 
 /**
@@ -65,7 +65,7 @@ export async function generateNiches(interests: string[], language: string): Pro
     try {
         // Enhance inputs with Library Intelligence
         const combinedInterests = interests.join(". ");
-        const keywords = await processText("extract_keywords", combinedInterests, { top_n: 5 });
+        const keywords = await processText("extract_keywords", combinedInterests, { top_n: 5, mode: "auto" });
 
         // Use refined keywords if available, otherwise fall back to raw inputs
         const contextTerms = Array.isArray(keywords) && keywords.length > 0 ? keywords.join(", ") : interests.join(", ");
@@ -105,11 +105,15 @@ No intro. No outro. Only JSON.`;
         // Extract keywords from the generated script body
         const scriptText = `${data.script.hook} ${data.script.body}`;
 
-        // Parallelize Python calls for speed
-        const [keywords, readabilityScore] = await Promise.all([
-            processText("extract_keywords", scriptText, { top_n: 10 }),
-            processText("readability", scriptText)
+        // Single batched Python call for both analyses
+        const pythonResults = await processBatch([
+            { id: "keywords", action: "extract_keywords", text: scriptText, params: { top_n: 10 } },
+            { id: "readability", action: "readability", text: scriptText }
         ]);
+        // Failed jobs are missing from the results; keep null (not undefined)
+        // as before, so stored records keep the same shape
+        const keywords = pythonResults.keywords ?? null;
+        const readabilityScore = pythonResults.readability ?? null;
 
         // 3. Construct derived data
         // Use real extracted keywords for SEO and Research
@@ -204,7 +208,7 @@ No intro. No outro. Only JSON.`;
         // Enhance with Python Library
         // Extract keywords from the generated description
         const description = data.branding?.description || `${name} - ${niche} channel`;
-        const keywords = await processText("extract_keywords", description, { top_n: 8 });
+        const keywords = await processText("extract_keywords", description, { top_n: 8, mode: "auto" });
 
         // Construct hashtags from keywords
         const validKeywords = Array.isArray(keywords) && keywords.length > 0 ? keywords : [niche, platform, context.style, "viral"];
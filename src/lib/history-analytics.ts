@@ -0,0 +1,72 @@
+import { getHistoryAnalyticsAction } from "@/app/actions";
+import { ContentHistoryItem } from "@/lib/firestore";
+
+// Content-history analytics are incremental: analyze_content_history returns
+// a `summary` of every item it has seen, and a later call with that summary
+// plus only the new items gives the same stats as sending the whole history.
+// The summary, the ids of the items it covers and the last stats are kept in
+// localStorage per user, so a refresh only sends items added since.
+const STORAGE_PREFIX = "historyAnalytics:";
+// Bump when the stored shape changes; older entries are ignored
+const STORAGE_VERSION = 1;
+
+interface StoredAnalytics {
+    version: number;
+    ids: string[];
+    summary: any;
+    stats: any;
+}
+
+// The lightweight shape the Python action expects for one item
+export const toAnalyticsItem = (i: ContentHistoryItem) => ({
+    text: i.type === 'script' ? (i.content.script?.hook + " " + i.content.script?.body) : i.title,
+    date: i.createdAt?.toDate ? i.createdAt.toDate().toISOString() : new Date().toISOString(),
+    type: i.type
+});
+
+const readStored = (userId: string): StoredAnalytics | null => {
+    if (typeof window === 'undefined') return null;
+    try {
+        const stored = JSON.parse(localStorage.getItem(STORAGE_PREFIX + userId) || "null");
+        return stored && stored.version === STORAGE_VERSION ? stored : null;
+    } catch {
+        return null;
+    }
+};
+
+const writeStored = (userId: string, stored: StoredAnalytics) => {
+    if (typeof window === 'undefined') return;
+    try {
+        localStorage.setItem(STORAGE_PREFIX + userId, JSON.stringify(stored));
+    } catch (e) {
+        // Over quota: the next load sends the whole history again
+        console.warn("Could not store history analytics summary", e);
+        localStorage.removeItem(STORAGE_PREFIX + userId);
+    }
+};
+
+// Returns the stats for items (without the summary), sending only the items
+// the stored summary doesn't cover yet. Returns null when there is nothing to
+// analyze or the call failed without earlier stats to fall back on.
+export async function loadHistoryAnalytics(userId: string, items: ContentHistoryItem[]): Promise<any | null> {
+    const currentIds = new Set(items.map(i => i.id));
+    let stored = readStored(userId);
+    // A deleted item can't be taken back out of a summary: start over
+    if (stored && !stored.ids.every(id => currentIds.has(id))) stored = null;
+
+    const seen = new Set(stored?.ids ?? []);
+    const fresh = items.filter(i => !seen.has(i.id));
+    if (fresh.length === 0) return stored?.stats ?? null;
+
+    const result = await getHistoryAnalyticsAction(fresh.map(toAnalyticsItem), stored?.summary);
+    if (!result) return stored?.stats ?? null;
+
+    const { summary, ...stats } = result;
+    writeStored(userId, {
+        version: STORAGE_VERSION,
+        ids: [...seen, ...fresh.map(i => i.id)],
+        summary,
+        stats
+    });
+    return stats;
+}
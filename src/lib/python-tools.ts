@@ -7,35 +7,99 @@ interface PythonResponse {
     error?: string;
 }
 
-export async function processText(action: "extract_keywords" | "summarize" | "clean_text" | "readability" | "analyze_content_history", text: string, params: any = {}): Promise<any> {
+type PythonAction = "extract_keywords" | "extract_keywords_batch" | "summarize" | "clean_text" | "readability" | "analyze_content_history" | "cluster_topics";
+
+export interface PythonJob {
+    id: string;
+    action: PythonAction;
+    text: string;
+    params?: any;
+}
+
+interface PythonBatchResponse {
+    results?: Record<string, any>;
+    errors?: Record<string, string>;
+    error?: string;
+}
+
+// Retries after a 429 (the instance's keyword queue is full), honoring Retry-After
+const MAX_OVERLOAD_RETRIES = 2;
+
+export async function processText(action: PythonAction, text: string, params: any = {}): Promise<any> {
     try {
         console.log(`[Python-Lib] Calling ${action}...`);
+        let response: Response;
+        for (let attempt = 0; ; attempt++) {
+            response = await fetch(PYTHON_API_URL, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                },
+                body: JSON.stringify({ action, text, params }),
+                cache: "no-store"
+            });
+            if (response.status !== 429 || attempt >= MAX_OVERLOAD_RETRIES) break;
+            const retryAfter = Number(response.headers.get("Retry-After")) || 1;
+            console.warn(`[Python-Lib] ${action} overloaded, retrying in ${retryAfter}s`);
+            await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+        }
+
+        if (!response.ok) {
+            const errorText = await response.text();
+            console.error(`[Python-Lib] HTTP Error: ${response.status} ${errorText}`);
+            return null; // Fail safe
+        }
+
+        const data: PythonResponse = await response.json();
+
+        if (data.error) {
+            console.error(`[Python-Lib] API Error: ${data.error}`);
+            return null;
+        }
+
+        return data.result;
+
+    } catch (error) {
+        console.error(`[Python-Lib] Network Error:`, error);
+        return null;
+    }
+}
+
+// Runs several actions in one request. Returns results keyed by job id;
+// jobs that failed are missing from the map (fail safe, like processText).
+export async function processBatch(jobs: PythonJob[]): Promise<Record<string, any>> {
+    try {
+        console.log(`[Python-Lib] Calling batch of ${jobs.length} jobs...`);
         const response = await fetch(PYTHON_API_URL, {
             method: "POST",
             headers: {
                 "Content-Type": "application/json",
             },
-            body: JSON.stringify({ action, text, params }),
+            body: JSON.stringify({ jobs }),
             cache: "no-store"
         });
 
         if (!response.ok) {
             const errorText = await response.text();
             console.error(`[Python-Lib] HTTP Error: ${response.status} ${errorText}`);
-            return null; // Fail safe
+            return {};
         }
 
-        const data: PythonResponse = await response.json();
+        const data: PythonBatchResponse = await response.json();
 
         if (data.error) {
             console.error(`[Python-Lib] API Error: ${data.error}`);
-            return null;
+            return {};
         }
 
-        return data.result;
+        for (const [id, message] of Object.entries(data.errors || {})) {
+            console.error(`[Python-Lib] Job ${id} Error: ${message}`);
+        }
+
+        return data.results || {};
 
     } catch (error) {
         console.error(`[Python-Lib] Network Error:`, error);
-        return null;
+        return {};
     }
 }